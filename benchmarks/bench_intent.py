@@ -0,0 +1,98 @@
+"""
+Intent Routing Benchmark for MediMind AI
+Compares keyword routing with the local intent classifier on a labeled set
+
+Usage:
+    python benchmarks/bench_intent.py [eval_set] [model_path]
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+import numpy as np
+from src.config import Config
+from src.agents.orchestrator import OrchestratorAgent
+from src.utils.intent_classifier import IntentClassifier, load_corpus
+
+def timed(func, texts, repeats):
+    """Predictions and mean per-message latency in microseconds"""
+    predictions = [func(text) for text in texts]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            func(text)
+    return predictions, (time.perf_counter() - start) / (repeats * len(texts)) * 1e6
+
+def expected_calibration_error(confidences, correct, bins=10):
+    """Weighted gap between confidence and accuracy over confidence bins"""
+    confidences = np.asarray(confidences)
+    correct = np.asarray(correct, dtype=float)
+    error = 0.0
+    edges = np.linspace(0, 1, bins + 1)
+    for low, high in zip(edges[:-1], edges[1:]):
+        mask = (confidences > low) & (confidences <= high)
+        if mask.any():
+            error += mask.mean() * abs(confidences[mask].mean() - correct[mask].mean())
+    return error
+
+def report(label, predictions, labels, latency):
+    """Print accuracy and latency for one router"""
+    accuracy = np.mean([p == l for p, l in zip(predictions, labels)])
+    print(f"{label:<30} accuracy {accuracy:>6.1%}   {latency:>8.1f} us/message")
+
+def main():
+    """Run intent routing benchmark"""
+    eval_path = sys.argv[1] if len(sys.argv) > 1 else "data/intent_eval.jsonl"
+    model_path = sys.argv[2] if len(sys.argv) > 2 else Config.INTENT_MODEL_PATH
+    repeats = 50
+
+    texts, labels = load_corpus(eval_path)
+    orchestrator = OrchestratorAgent()
+    classifier = IntentClassifier.load(model_path)
+
+    def hybrid(text):
+        """Classifier with keyword fallback below the confidence floor"""
+        prediction = classifier.classify(text)
+        if prediction["confidence"] >= Config.INTENT_MIN_CONFIDENCE:
+            return prediction["intent"]
+        return orchestrator._classify_by_keywords(text)
+
+    print(f"Evaluation set: {eval_path} ({len(texts)} messages)")
+    print("-" * 72)
+
+    keyword_predictions, keyword_latency = timed(orchestrator._classify_by_keywords, texts, repeats)
+    report("keyword rules (previous)*", keyword_predictions, labels, keyword_latency)
+
+    results, classifier_latency = timed(classifier.classify, texts, repeats)
+    report("classifier", [r["intent"] for r in results], labels, classifier_latency)
+
+    hybrid_predictions, hybrid_latency = timed(hybrid, texts, repeats)
+    report("classifier + keyword fallback", hybrid_predictions, labels, hybrid_latency)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        classifier.classify_batch(texts)
+    batch_latency = (time.perf_counter() - start) / (repeats * len(texts)) * 1e6
+    print(f"{'classify_batch':<30} {'':>15}   {batch_latency:>8.1f} us/message")
+
+    print("* keyword scans are memoized per message, so repeats hit the scan cache")
+
+    print("-" * 72)
+    confidences = [r["confidence"] for r in results]
+    correct = [r["intent"] == label for r, label in zip(results, labels)]
+    print(f"Mean confidence: {np.mean(confidences):.3f}   "
+          f"Expected calibration error: {expected_calibration_error(confidences, correct):.3f}   "
+          f"Fallback rate: {np.mean([c < Config.INTENT_MIN_CONFIDENCE for c in confidences]):.1%}")
+
+    print("-" * 72)
+    for text, label, keyword, routed in zip(texts, labels, keyword_predictions, hybrid_predictions):
+        if routed != label:
+            print(f"misrouted ({label} -> {routed}, keywords: {keyword}): {text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Drug Interaction Lookup Benchmark for MediMind AI
+Compares the linear scan of the interaction list with the pair index on
+synthetic interaction databases, and a full re-check per turn with the
+incremental session state
+
+Usage:
+    python benchmarks/bench_interactions.py [medications_per_check]
+"""
+
+import sys
+import os
+import time
+import random
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.utils.interactions import InteractionIndex, InteractionState, pair_key
+
+SEVERITIES = ("minor", "moderate", "severe")
+
+def synthetic_database(pairs, drugs, rng):
+    """Random interaction records over a pool of drug names"""
+    records = []
+    for _ in range(pairs):
+        drug1, drug2 = rng.sample(drugs, 2)
+        records.append({
+            "drug1": drug1.capitalize() if rng.random() < 0.5 else drug1,
+            "drug2": drug2,
+            "severity": rng.choice(SEVERITIES),
+            "description": "synthetic",
+            "recommendation": "synthetic"
+        })
+    return records
+
+def linear_check(records, medications):
+    """Previous behaviour: scan every record for every pair"""
+    found = []
+    for i, med1 in enumerate(medications):
+        for med2 in medications[i + 1:]:
+            for interaction in records:
+                if (interaction["drug1"].lower() == med1.lower() and
+                    interaction["drug2"].lower() == med2.lower()) or \
+                   (interaction["drug2"].lower() == med1.lower() and
+                    interaction["drug1"].lower() == med2.lower()):
+                    found.append(interaction)
+                    break
+    return found
+
+def measure(func, repeats):
+    """Mean latency of func in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def main():
+    """Run interaction lookup benchmark"""
+    medications = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rng = random.Random(42)
+
+    print(f"{medications} medications per check ({medications * (medications - 1) // 2} pairs)")
+    print("-" * 78)
+    print(f"{'pairs':>8} {'build ms':>10} {'linear us':>12} {'index us':>10} {'filtered us':>12} {'speedup':>9}")
+
+    for size in (1000, 10000, 100000):
+        drugs = [f"drug{n}" for n in range(max(200, int(size ** 0.5) * 4))]
+        records = synthetic_database(size, drugs, rng)
+        patient = rng.sample(drugs, medications)
+
+        start = time.perf_counter()
+        index = InteractionIndex(records)
+        build = (time.perf_counter() - start) * 1000
+
+        repeats = max(1, 200000 // size)
+        linear = measure(lambda: linear_check(records, patient), repeats)
+        indexed = measure(lambda: index.check(patient), 2000)
+        filtered = measure(lambda: index.check(patient, "severe"), 2000)
+
+        # Same interacting pairs either way (the index also returns every record per pair)
+        assert {pair_key(r["drug1"], r["drug2"]) for r in linear_check(records, patient)} == \
+            {pair_key(r["drug1"], r["drug2"]) for r in index.check(patient)}
+
+        print(f"{size:>8} {build:>10.1f} {linear:>12.1f} {indexed:>10.1f} {filtered:>12.1f} {linear / indexed:>8.0f}x")
+
+    # One new drug per turn for a patient already on many medications
+    print("-" * 78)
+    print(f"{'known meds':>10} {'full re-check us':>18} {'incremental us':>16}")
+    for known in (5, 15, 40):
+        patient = rng.sample(drugs, known + 1)
+        full = measure(lambda: index.check(patient), 2000)
+
+        def incremental():
+            state.remove(patient[-1:])
+            state.add(patient[-1:])
+        state = InteractionState(patient, index)
+        update = measure(incremental, 2000)
+
+        print(f"{known:>10} {full:>18.1f} {update:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Knowledge Base Benchmark for MediMind AI
+Compares parsing the JSON databases and building their indexes with
+opening the compiled, memory-mapped knowledge base
+
+Usage:
+    python benchmarks/bench_kb.py [medications] [interactions]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import string
+import tempfile
+import tracemalloc
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.config import Config
+from src.utils.helpers import load_json
+from src.utils.interactions import InteractionIndex
+from src.utils.knowledge_base import KnowledgeBase, compile_knowledge_base
+from src.utils.medication_extractor import MedicationExtractor
+
+MESSAGE = "I've been on ibuprofin and coumadin, can I take Advil with Tylenol?"
+MEDICATIONS = ["aspirin", "ibuprofen", "warfarin", "acetaminophen"]
+
+def synthetic_sources(directory, n_medications, n_interactions, rng):
+    """Real databases padded with random drugs and interactions"""
+    medications = load_json(Config.MEDICATIONS_DB).get("common_medications", [])
+    interactions = load_json(Config.INTERACTIONS_DB).get("drug_interactions", [])
+
+    for _ in range(n_medications - len(medications)):
+        name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(7, 12)))
+        brand = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))).capitalize()
+        medications.append({"name": name, "brand_names": [brand], "synonyms": [], "uses": ["synthetic"]})
+
+    names = [medication["name"] for medication in medications]
+    for _ in range(n_interactions - len(interactions)):
+        drug1, drug2 = rng.sample(names, 2)
+        interactions.append({
+            "drug1": drug1,
+            "drug2": drug2,
+            "severity": rng.choice(["minor", "moderate", "severe"]),
+            "description": "Synthetic interaction",
+            "recommendation": "Consult your doctor."
+        })
+
+    paths = {"symptoms": Config.SYMPTOMS_DB}
+    for name, key, records in (("medications", "common_medications", medications),
+                               ("interactions", "drug_interactions", interactions)):
+        paths[name] = os.path.join(directory, f"{name}.json")
+        with open(paths[name], 'w', encoding='utf-8') as f:
+            json.dump({key: records}, f)
+    return paths
+
+def from_json(paths):
+    """Old behaviour: parse every database and build the indexes"""
+    symptoms_db = load_json(paths["symptoms"])
+    medications = load_json(paths["medications"]).get("common_medications", [])
+    index = InteractionIndex(load_json(paths["interactions"]).get("drug_interactions", []))
+    extractor = MedicationExtractor(medications)
+    return symptoms_db, index, extractor
+
+def from_kb(path):
+    """New behaviour: map the compiled file"""
+    kb = KnowledgeBase(path)
+    return kb.symptoms_db(), kb.interaction_index(), MedicationExtractor(index=kb.medication_names())
+
+def measure(label, factory):
+    """Time and traced memory to load, then the first queries"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    _, index, extractor = factory()
+    loaded = time.perf_counter()
+    mentions = extractor.extract(MESSAGE)
+    found = index.check(MEDICATIONS)
+    first = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<8} {(loaded - start) * 1000:>10.1f} {(first - loaded) * 1000:>14.2f} {peak / 2 ** 20:>12.1f}")
+    return mentions, len(found)
+
+def main():
+    """Run knowledge base benchmark"""
+    n_medications = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_interactions = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = synthetic_sources(directory, n_medications, n_interactions, rng)
+        kb_path = os.path.join(directory, "medimind.kb")
+
+        start = time.perf_counter()
+        compile_knowledge_base(kb_path, paths["symptoms"], paths["medications"], paths["interactions"])
+        print(f"{n_medications} medications, {n_interactions} interactions")
+        print(f"Compiled in {time.perf_counter() - start:.2f}s: "
+              f"{os.path.getsize(kb_path) / 2 ** 20:.1f} MiB (JSON "
+              f"{sum(os.path.getsize(path) for path in paths.values()) / 2 ** 20:.1f} MiB)")
+
+        print(f"{'source':<8} {'load ms':>10} {'first query ms':>14} {'peak MiB':>12}")
+        print("-" * 48)
+        json_result = measure("json", lambda: from_json(paths))
+        kb_result = measure("kb", lambda: from_kb(kb_path))
+        print("-" * 48)
+        print(f"Same answers: {json_result == kb_result} {kb_result}")
+
+if __name__ == "__main__":
+    main()
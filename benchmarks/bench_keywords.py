@@ -0,0 +1,117 @@
+"""
+Keyword Matching Benchmark for MediMind AI
+Compares the per-list substring scans with the compiled keyword matcher,
+and times the typo-tolerant emergency screen
+
+Usage:
+    python benchmarks/bench_keywords.py [iterations]
+"""
+
+import sys
+import os
+import time
+import random
+import string
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.config import Config
+from src.utils.helpers import load_json
+from src.utils.keyword_matcher import KeywordMatcher, build_default_matcher
+from src.utils.safety import build_emergency_screen
+
+MESSAGES = [
+    "I have a severe headache since this morning",
+    "I take aspirin daily. Can I also take ibuprofen for pain?",
+    "Help me prepare for my doctor appointment tomorrow",
+    "What is a healthy diet for someone my age?",
+    "I've been feeling tired and dizzy for a week and I think it was a mistake to skip my medicine",
+    "My father has chest pain and can't breathe properly, what should we do right now?",
+]
+
+SYMPTOMS = load_json(Config.SYMPTOMS_DB).get("common_symptoms", [])
+MEDICATIONS = load_json(Config.MEDICATIONS_DB).get("common_medications", [])
+
+def substring_scans(text):
+    """Previous behaviour: one lowercase + substring scan per consumer"""
+    text_lower = text.lower()
+    scores = {
+        intent: sum(1 for kw in keywords if kw in text_lower)
+        for intent, keywords in Config.INTENT_KEYWORDS.items()
+    }
+    emergency_orchestrator = any(kw in text.lower() for kw in Config.EMERGENCY_KEYWORDS)
+    emergency_symptom_agent = any(kw in text.lower() for kw in Config.EMERGENCY_KEYWORDS)
+    emergency_cache_bypass = any(kw in text.lower() for kw in Config.EMERGENCY_KEYWORDS)
+    symptoms = [s["name"] for s in SYMPTOMS if s["name"].lower() in text.lower()]
+    medications = [m["name"] for m in MEDICATIONS if m["name"].lower() in text.lower()]
+    return scores, emergency_orchestrator or emergency_symptom_agent or emergency_cache_bypass, symptoms, medications
+
+def matcher_scan(matcher, text):
+    """New behaviour: one pass, every consumer reads the same hits"""
+    hits = matcher._scan(text)
+    scores = {intent: 0 for intent in Config.INTENT_KEYWORDS}
+    seen = set()
+    emergency = False
+    symptoms = []
+    medications = []
+    for hit in hits:
+        if hit.category == "emergency":
+            emergency = True
+        elif hit.category == "symptom":
+            symptoms.append(hit.keyword)
+        elif hit.category == "medication":
+            medications.append(hit.keyword)
+        elif (hit.keyword, hit.category) not in seen:
+            seen.add((hit.keyword, hit.category))
+            scores[hit.category.split(":", 1)[1]] += 1
+    return scores, emergency, symptoms, medications
+
+def measure(label, func, iterations):
+    """Time func over all messages"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in MESSAGES:
+            func(message)
+    elapsed = time.perf_counter() - start
+    per_message = elapsed / (iterations * len(MESSAGES)) * 1e6
+    print(f"{label:<34} {per_message:>8.2f} us/message")
+
+def main():
+    """Run keyword matching benchmark"""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    start = time.perf_counter()
+    matcher = build_default_matcher()
+    print(f"Matcher build: {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(f"{iterations} x {len(MESSAGES)} messages")
+    print("-" * 64)
+
+    measure("substring scans (previous)", substring_scans, iterations)
+    measure("compiled matcher (uncached scan)", lambda m: matcher_scan(matcher, m), iterations)
+    measure("compiled matcher (memoized)", matcher.find_all, iterations)
+
+    screen = build_emergency_screen()
+    measure("emergency screen (typo tolerant)", screen.check, iterations)
+
+    # The substring scans grow with the vocabulary; the matcher does not
+    print("-" * 64)
+    rng = random.Random(42)
+    for size in (100, 1000, 10000):
+        names = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12))) for _ in range(size)]
+        scaled = KeywordMatcher()
+        scaled.add_many(names, "medication")
+        scaled.build()
+        measure(f"drug names x{size}: substring", lambda m: (lambda t: [n for n in names if n in t])(m.lower()), max(1, iterations // 100))
+        measure(f"drug names x{size}: matcher", scaled._scan, max(1, iterations // 100))
+
+    print("-" * 64)
+    for message in MESSAGES:
+        old_scores = substring_scans(message)[0]
+        new_scores = matcher_scan(matcher, message)[0]
+        if old_scores != new_scores:
+            print(f"Routing differs for {message!r}: {old_scores} -> {new_scores}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Load Benchmark for MediMind AI
+Drives many concurrent conversations through the orchestrator on the fake backend
+
+Usage:
+    python benchmarks/bench_load.py [conversations] [turns] [latency_mean] [latency_p99] [error_rate]
+"""
+
+import sys
+import os
+import time
+import asyncio
+import random
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ["MODEL_BACKEND"] = "fake"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+os.environ["SEMANTIC_CACHE_ENABLED"] = "false"
+
+from src.agents.orchestrator import OrchestratorAgent
+from src.backends import set_backend
+from src.backends.fake import FakeBackend
+
+MESSAGES = [
+    "I have a severe headache since this morning",
+    "I take aspirin daily. Can I also take ibuprofen for pain?",
+    "Help me prepare for my doctor appointment tomorrow",
+    "What is a healthy diet for someone my age?",
+    "I've been feeling tired and dizzy for a week",
+    "What dosage of acetaminophen is safe?",
+]
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+async def conversation(orchestrator, turns, rng, latencies):
+    """Run one conversation, recording per-turn latency"""
+    context = {"conversation_history": [], "user_medications": []}
+    for _ in range(turns):
+        start = time.perf_counter()
+        await orchestrator.aprocess(rng.choice(MESSAGES), context)
+        latencies.append(time.perf_counter() - start)
+
+async def run(conversations, turns):
+    """Run all conversations concurrently"""
+    orchestrator = OrchestratorAgent()
+    rng = random.Random(42)
+    latencies = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        conversation(orchestrator, turns, rng, latencies)
+        for _ in range(conversations)
+    ])
+    elapsed = time.perf_counter() - start
+
+    return latencies, elapsed
+
+def main():
+    """Run load benchmark"""
+    args = sys.argv[1:]
+    conversations = int(args[0]) if len(args) > 0 else 200
+    turns = int(args[1]) if len(args) > 1 else 3
+    latency_mean = float(args[2]) if len(args) > 2 else 0.5
+    latency_p99 = float(args[3]) if len(args) > 3 else 2.0
+    error_rate = float(args[4]) if len(args) > 4 else 0.0
+
+    set_backend(FakeBackend(latency_mean, latency_p99, error_rate, seed=42))
+
+    latencies, elapsed = asyncio.run(run(conversations, turns))
+
+    print(f"Conversations: {conversations} x {turns} turns "
+          f"(fake latency mean={latency_mean}s p99={latency_p99}s errors={error_rate:.0%})")
+    print("-" * 64)
+    print(f"Throughput: {len(latencies) / elapsed:.1f} turns/s over {elapsed:.2f}s")
+    print(f"Latency p50: {percentile(latencies, 50):.3f}s  "
+          f"p95: {percentile(latencies, 95):.3f}s  p99: {percentile(latencies, 99):.3f}s  "
+          f"max: {max(latencies):.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Medication Extraction Benchmark for MediMind AI
+Compares the per-entry substring scan with the medication extractor as
+the formulary grows
+
+Usage:
+    python benchmarks/bench_medications.py [iterations]
+"""
+
+import sys
+import os
+import time
+import random
+import string
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.config import Config
+from src.utils.helpers import load_json
+from src.utils.medication_extractor import MedicationExtractor
+
+MESSAGES = [
+    "I take aspirin daily. Can I also take ibuprofen for pain?",
+    "Can I take Advil with Tylenol?",
+    "I've been on ibuprofin and coumadin since my surgery",
+    "What is a healthy diet for someone my age?",
+]
+
+FORMULARY = load_json(Config.MEDICATIONS_DB).get("common_medications", [])
+
+def substring_scan(medications, text):
+    """Previous behaviour: one substring test per formulary entry"""
+    text_lower = text.lower()
+    return [med["name"] for med in medications if med["name"].lower() in text_lower]
+
+def synthetic_formulary(size, rng):
+    """Real entries plus random drugs, each with a brand name"""
+    medications = list(FORMULARY)
+    for _ in range(size - len(medications)):
+        name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(7, 12)))
+        brand = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))).capitalize()
+        medications.append({"name": name, "brand_names": [brand], "synonyms": []})
+    return medications
+
+def measure(func, iterations):
+    """Mean latency per message in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in MESSAGES:
+            func(message)
+    return (time.perf_counter() - start) / (iterations * len(MESSAGES)) * 1e6
+
+def main():
+    """Run medication extraction benchmark"""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(42)
+
+    print(f"{'formulary':>10} {'build ms':>10} {'substring us':>14} {'extractor us':>14} {'cold us':>10}")
+    print("-" * 64)
+    for size in (10, 1000, 10000, 50000):
+        medications = synthetic_formulary(size, rng)
+
+        start = time.perf_counter()
+        extractor = MedicationExtractor(medications)
+        build = (time.perf_counter() - start) * 1000
+
+        substring = measure(lambda m: substring_scan(medications, m), max(1, iterations * 10 // size))
+        warm = measure(extractor.extract, iterations)
+
+        # Without the per-word candidate cache (every word seen for the first time)
+        def cold(message):
+            extractor._index._candidate_cache.clear()
+            extractor.extract(message)
+        uncached = measure(cold, max(1, iterations // 10))
+
+        print(f"{size:>10} {build:>10.1f} {substring:>14.1f} {warm:>14.1f} {uncached:>10.1f}")
+
+    print("-" * 64)
+    extractor = MedicationExtractor(FORMULARY)
+    for message in MESSAGES:
+        print(f"{message!r}: substring {substring_scan(FORMULARY, message)}, extractor {extractor.extract(message)}")
+
+if __name__ == "__main__":
+    main()
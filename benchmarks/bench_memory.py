@@ -0,0 +1,114 @@
+"""
+Memory Store Benchmark for MediMind AI
+Compares loading and saving one user in the JSON memory bank, the
+SQLite store and the sharded store as the number of stored users grows, and the save latency
+of long-lived stores, including the journal
+
+Usage:
+    python benchmarks/bench_memory.py [sessions]
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.memory.memory_bank import MemoryBank
+from src.memory.storage import open_memory_store
+from src.memory.storage.journal_store import JournalMemoryStore
+from src.memory.storage.migrate import migrate
+
+def synthetic_bank(users):
+    """Memory bank with a short history per user"""
+    return {
+        f"user{n}": {
+            "medications": ["aspirin", "lisinopril", f"drug{n % 500}"],
+            "chronic_conditions": ["hypertension"],
+            "symptom_history": [
+                {"symptom": symptom, "timestamp": f"2024-01-{day:02d}T09:00:00"}
+                for day, symptom in enumerate(["headache", "fatigue", "fever", "headache"], 1)
+            ],
+            "doctor_visits": [],
+            "created_at": "2023-12-31T00:00:00"
+        }
+        for n in range(users)
+    }
+
+def measure(path, sessions):
+    """Mean ms to open one user's memory bank and to save a session"""
+    load = save = 0.0
+    for n in range(sessions):
+        start = time.perf_counter()
+        bank = MemoryBank(f"user{n * 7}", store=open_memory_store(path))
+        loaded = time.perf_counter()
+        bank.save_session({"user_medications": ["ibuprofen"], "symptoms_discussed": ["fever"]})
+        load += loaded - start
+        save += time.perf_counter() - loaded
+    return load * 1000 / sessions, save * 1000 / sessions
+
+def measure_saves(store, users, saves):
+    """Mean and worst ms per save on an open store"""
+    latencies = []
+    for n in range(saves):
+        start = time.perf_counter()
+        store.append(f"user{n * 7 % users}", {"medications": ["ibuprofen"], "symptom_history": [
+            {"symptom": "fever", "timestamp": "2024-02-01T09:00:00"}
+        ]})
+        latencies.append(time.perf_counter() - start)
+    return sum(latencies) * 1000 / saves, max(latencies) * 1000
+
+def main():
+    """Run memory store benchmark"""
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'users':>8} {'json load ms':>13} {'json save ms':>13} {'sqlite load ms':>15} {'sqlite save ms':>15} "
+          f"{'sharded load ms':>16} {'sharded save ms':>16}")
+    print("-" * 104)
+    for users in (100, 1000, 10000):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "memory_bank.json")
+            db_path = os.path.join(directory, "memory_bank.db")
+            shard_path = os.path.join(directory, "memory_bank.shards")
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(synthetic_bank(users), f, indent=2)
+            migrate(open_memory_store(json_path), open_memory_store(db_path))
+            migrate(open_memory_store(json_path), open_memory_store(shard_path))
+
+            json_load, json_save = measure(json_path, sessions)
+            sqlite_load, sqlite_save = measure(db_path, sessions)
+            shard_load, shard_save = measure(shard_path, sessions)
+            print(f"{users:>8} {json_load:>13.2f} {json_save:>13.2f} {sqlite_load:>15.2f} {sqlite_save:>15.2f} "
+                  f"{shard_load:>16.2f} {shard_save:>16.2f}")
+
+    print()
+    print(f"Open stores, {sessions * 10} saves: mean / worst ms")
+    print(f"{'users':>8} {'json':>16} {'sqlite':>16} {'journal always':>16} {'journal interval':>18}")
+    print("-" * 80)
+    for users in (100, 1000, 10000):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "memory_bank.json")
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(synthetic_bank(users), f, indent=2)
+
+            row = []
+            for target, options in (("memory_bank.db", {}),
+                                    ("always.journal", {"fsync": "always"}),
+                                    ("interval.journal", {"fsync": "interval"})):
+                path = os.path.join(directory, target)
+                store = JournalMemoryStore(path, **options) if options else open_memory_store(path)
+                migrate(open_memory_store(json_path), store)
+                row.append(measure_saves(store, users, sessions * 10))
+                store.close()
+            row.insert(0, measure_saves(open_memory_store(json_path), users, sessions * 10))
+
+            print(f"{users:>8} " + " ".join(
+                f"{mean:>{width - 7}.2f} / {worst:<4.1f}" for (mean, worst), width in zip(row, (16, 16, 16, 18))
+            ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Knowledge Reload Benchmark for MediMind AI
+Measures request latency while the knowledge base is reloaded over and
+over, and checks that every request saw one consistent version
+
+Usage:
+    python benchmarks/bench_reload.py [seconds] [readers]
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.utils.knowledge_service import get_knowledge_service, pinned_snapshot
+from src.utils.interactions import get_interaction_index
+from src.utils.medication_extractor import get_medication_extractor
+
+MESSAGE = "I take aspirin with warfarin, can I add Advil?"
+
+def request():
+    """One request: extract medications and check them on a pinned snapshot"""
+    with pinned_snapshot() as snapshot:
+        medications = get_medication_extractor().extract(MESSAGE)
+        time.sleep(0)  # Let a reload run mid-request
+        found = get_interaction_index().check(medications)
+        consistent = get_interaction_index() is snapshot.interaction_index
+    return snapshot.generation, len(found), consistent
+
+def percentile(values, fraction):
+    """Value at a fraction of the sorted values"""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run_readers(seconds, readers, reload):
+    """Latencies, generations seen and consistency of concurrent readers"""
+    service = get_knowledge_service()
+    latencies, generations, answers = [], set(), set()
+    inconsistent = 0
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def read():
+        nonlocal inconsistent
+        local = []
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            generation, found, consistent = request()
+            local.append(time.perf_counter() - start)
+            with lock:
+                generations.add(generation)
+                answers.add(found)
+                inconsistent += not consistent
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    reloads = 0
+    while reload and time.perf_counter() < stop:
+        service.reload(force=True)
+        reloads += 1
+    for thread in threads:
+        thread.join()
+    return latencies, reloads, generations, answers, inconsistent
+
+def main():
+    """Run reload benchmark"""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    get_knowledge_service().snapshot
+
+    print(f"{'mode':<16} {'requests':>9} {'p50 us':>8} {'p99 us':>8} {'max ms':>8} {'reloads':>8} {'torn':>5}")
+    print("-" * 68)
+    for label, reload in (("steady", False), ("reloading", True)):
+        latencies, reloads, generations, answers, inconsistent = run_readers(seconds, readers, reload)
+        print(
+            f"{label:<16} {len(latencies):>9} {percentile(latencies, 0.5) * 1e6:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1e6:>8.1f} {max(latencies) * 1000:>8.2f} "
+            f"{reloads:>8} {inconsistent:>5}"
+        )
+        served = len(generations)
+    print("-" * 68)
+    print(f"Versions served while reloading: {served}; interactions found per request: {sorted(answers)}")
+
+if __name__ == "__main__":
+    main()
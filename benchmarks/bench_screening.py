@@ -0,0 +1,74 @@
+"""
+Bulk Interaction Screening Benchmark for MediMind AI
+Compares a per-patient interaction check with the vectorized screener
+
+Usage:
+    python benchmarks/bench_screening.py [patients] [pairs]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.utils.interactions import InteractionIndex
+from src.utils.screening import InteractionScreener, screen_to_jsonl
+
+SEVERITIES = ("minor", "moderate", "severe")
+
+def main():
+    """Run bulk screening benchmark"""
+    n_patients = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_pairs = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    rng = random.Random(42)
+
+    drugs = [f"drug{n}" for n in range(2000)]
+    records = []
+    for _ in range(n_pairs):
+        drug1, drug2 = rng.sample(drugs, 2)
+        records.append({"drug1": drug1, "drug2": drug2, "severity": rng.choice(SEVERITIES)})
+    patients = [(f"patient{n}", rng.sample(drugs, rng.randint(2, 25))) for n in range(n_patients)]
+
+    index = InteractionIndex(records)
+    start = time.perf_counter()
+    screener = InteractionScreener(index)
+    print(f"{n_patients} patients (2-25 medications), {len(index)} interactions")
+    print(f"Screener build: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print("-" * 64)
+
+    start = time.perf_counter()
+    expected = [index.check(medications) for _, medications in patients]
+    loop = time.perf_counter() - start
+    print(f"{'per-patient pair loop':<32} {loop:>8.2f} s  {n_patients / loop:>10.0f} patients/s")
+
+    start = time.perf_counter()
+    results = list(screener.screen(patients))
+    vectorized = time.perf_counter() - start
+    print(f"{'vectorized screener':<32} {vectorized:>8.2f} s  {n_patients / vectorized:>10.0f} patients/s")
+
+    assert [len(r["interactions"]) for r in results] == [len(e) for e in expected]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "interactions.json")
+        with open(path, 'w') as f:
+            json.dump({"drug_interactions": records}, f)
+
+        # Worker processes only pay off with spare cores
+        print(f"CPU cores: {os.cpu_count()}")
+        for workers in (0, 4):
+            with open(os.devnull, 'w') as output:
+                start = time.perf_counter()
+                summary = screen_to_jsonl(patients, output, path, workers=workers)
+                elapsed = time.perf_counter() - start
+            label = f"JSONL report, {workers} workers"
+            print(f"{label:<32} {elapsed:>8.2f} s  {n_patients / elapsed:>10.0f} patients/s"
+                  f"  ({summary['flagged']} flagged)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Startup Benchmark for MediMind AI
+Compares per-agent clients with the shared client pool and lazy sub-agents
+
+Usage:
+    python benchmarks/bench_startup.py [sessions]
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+os.environ["MODEL_BACKEND"] = "gemini"
+
+from google import genai
+from src.config import Config
+from src.agents.orchestrator import OrchestratorAgent
+from src.agents.symptom_analyzer import SymptomAnalyzerAgent
+from src.agents.medication_manager import MedicationManagerAgent
+from src.agents.doctor_prep import DoctorPrepAgent
+from src.backends import get_backend
+
+def build_eager_session():
+    """Old behaviour: four agents, each with its own client"""
+    agents = [OrchestratorAgent(), SymptomAnalyzerAgent(), MedicationManagerAgent(), DoctorPrepAgent()]
+    clients = [genai.Client(api_key=Config.GOOGLE_API_KEY) for _ in agents]
+    return agents, clients
+
+def build_pooled_session():
+    """New behaviour: shared client, sub-agents built on first use"""
+    return OrchestratorAgent()
+
+def measure(label, factory, sessions):
+    """Build `sessions` sessions and report time and memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    kept = [factory() for _ in range(sessions)]
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<28} {elapsed * 1000 / sessions:>10.2f} ms/session {peak / sessions / 1024:>10.1f} KiB/session")
+    return kept
+
+def main():
+    """Run startup benchmark"""
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    print(f"Building {sessions} sessions")
+    print("-" * 64)
+
+    # Warm the shared backend so both runs exclude one-time imports
+    get_backend()
+
+    measure("per-agent clients (eager)", build_eager_session, sessions)
+    measure("shared pool (lazy agents)", build_pooled_session, sessions)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Symptom Matching Benchmark for MediMind AI
+Compares the linear first-match scan of the symptom catalogue with the
+inverted-index symptom matcher as the catalogue grows
+
+Usage:
+    python benchmarks/bench_symptoms.py [iterations]
+"""
+
+import sys
+import os
+import time
+import random
+import string
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from src.config import Config
+from src.utils.helpers import load_json
+from src.utils.symptom_matcher import SymptomMatcher, merge_questions
+
+MESSAGES = [
+    "I have a terrible headache and a fever since yesterday",
+    "Feeling really tired and exhausted, and my head pain is back",
+    "I've had a headahce for two days",
+    "What is a healthy diet for someone my age?",
+]
+
+CATALOGUE = load_json(Config.SYMPTOMS_DB).get("common_symptoms", [])
+
+def linear_scan(symptoms, text):
+    """Previous behaviour: first catalogue entry whose name is in the text"""
+    text_lower = text.lower()
+    for symptom in symptoms:
+        if symptom["name"] in text_lower:
+            return symptom.get("questions", [])[:5]
+    return []
+
+def synthetic_catalogue(size, rng):
+    """Real entries plus random symptoms with synonyms, questions and red flags"""
+    def word():
+        return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10)))
+
+    symptoms = list(CATALOGUE)
+    for _ in range(size - len(symptoms)):
+        symptoms.append({
+            "name": word(),
+            "synonyms": [f"{word()} {word()}"],
+            "questions": [f"How long have you had {word()}?", "Does rest help?"],
+            "red_flags": [f"with {word()}", f"sudden {word()}"]
+        })
+    return symptoms
+
+def measure(func, iterations):
+    """Mean latency per message in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in MESSAGES:
+            func(message)
+    return (time.perf_counter() - start) / (iterations * len(MESSAGES)) * 1e6
+
+def main():
+    """Run symptom matching benchmark"""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(42)
+
+    print(f"{'catalogue':>10} {'build ms':>10} {'linear us':>11} {'index us':>10} {'cold us':>10}")
+    print("-" * 56)
+    for size in (3, 1000, 5000, 20000):
+        symptoms = synthetic_catalogue(size, rng)
+
+        start = time.perf_counter()
+        matcher = SymptomMatcher(symptoms)
+        build = (time.perf_counter() - start) * 1000
+
+        linear = measure(lambda m: linear_scan(symptoms, m), max(1, iterations * 10 // size))
+        warm = measure(lambda m: merge_questions(matcher.match(m)), iterations)
+
+        # Without the per-word candidate cache (every word seen for the first time)
+        def cold(message):
+            matcher._index._candidate_cache.clear()
+            merge_questions(matcher.match(message))
+        uncached = measure(cold, max(1, iterations // 10))
+
+        print(f"{size:>10} {build:>10.1f} {linear:>11.1f} {warm:>10.1f} {uncached:>10.1f}")
+
+    print("-" * 56)
+    matcher = SymptomMatcher(CATALOGUE)
+    for message in MESSAGES:
+        found = [(match.name, match.score) for match in matcher.match(message)]
+        print(f"{message!r}: linear {len(linear_scan(CATALOGUE, message))} questions, index {found}")
+
+if __name__ == "__main__":
+    main()
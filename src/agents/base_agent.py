@@ -4,97 +4,270 @@ Provides common functionality for all specialized agents
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from google import genai
+from typing import Dict, Any, List, Optional, Callable, Sequence
 from src.config import Config
+from src.utils.async_runner import run_sync
+from src.backends import ModelBackend, get_backend
+from src.utils.keyword_matcher import get_keyword_matcher
+from src.utils.metrics import metrics_tracker
+from src.utils.prompt_budget import get_assembler
+from src.utils.resilience import Deadline, DeadlineExceeded, CircuitOpenError, get_executor
+from src.utils.response_cache import response_cache, make_cache_key
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Callback receiving each streamed text chunk as it arrives
+ChunkCallback = Callable[[str], None]
+
 class BaseAgent(ABC):
     """
     Abstract base class for all agents
     
     Provides common functionality:
-    - Gemini client management
+    - Pluggable model backend (Gemini, fake or record/replay)
     - System instruction handling
-    - Response generation
+    - Response generation (async, with sync wrappers)
+    - Token-budgeted prompt assembly
+    - Response caching
+    - Deadlines, retries, hedging and circuit breaking around model calls
     - Logging and tracing
     """
     
-    def __init__(self, name: str, system_instruction: str):
+    ERROR_RESPONSE = "I apologize, but I encountered an error. Please try again."
+    
+    FALLBACK_RESPONSE = (
+        "I'm sorry, MediMind's AI service is temporarily unavailable, so I can't "
+        "give a detailed answer right now. Please try again in a few minutes.\n\n"
+        "If this is urgent or you feel unwell, contact your doctor or pharmacist, "
+        "and for emergencies call 911 or go to the nearest emergency room."
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        system_instruction: str,
+        backend: Optional[ModelBackend] = None
+    ):
         """
         Initialize base agent
         
         Args:
             name: Agent name
             system_instruction: System instruction for this agent
+            backend: Model backend (defaults to the process-wide backend)
         """
         self.name = name
         self.system_instruction = system_instruction
-        self.client = genai.Client(api_key=Config.GOOGLE_API_KEY)
+        self.backend = backend or get_backend()
         
         logger.info(f"Initialized agent: {name}")
     
-    def generate_response(
+    async def agenerate_response(
         self,
         prompt: str,
-        context: Optional[List[Dict[str, Any]]] = None
+        context: Optional[Sequence[Dict[str, Any]]] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+        use_cache: bool = True,
+        deadline: Optional[Deadline] = None,
+        memory: Optional[str] = None,
+        summary: Optional[str] = None
     ) -> str:
         """
-        Generate response using Gemini
+        Generate response from the model without blocking the event loop
+        
+        The request is fitted into the agent's token budget first: the
+        oldest history is dropped (and summarized) before anything else.
+        
+        Retryable errors are retried with jittered backoff and slow calls
+        may be hedged, all within the request deadline. While the circuit
+        breaker is open a local fallback response is returned instead.
         
         Args:
             prompt: User prompt
             context: Optional conversation context
+            on_chunk: Optional callback; when given the response is
+                streamed and each chunk is passed to it as it arrives
+            use_cache: Whether the response cache may be used
+            deadline: Request deadline (defaults to Config.REQUEST_TIMEOUT from now)
+            memory: Optional retrieved long-term memory to include
+            summary: Optional rolling summary of earlier conversation
             
         Returns:
             Generated response text
         """
+        # Fit system instruction, memory, history and prompt into the budget
+        assembled = get_assembler(self.name).assemble(
+            self.system_instruction,
+            context or [],
+            prompt,
+            memory,
+            summary
+        )
+        messages = assembled["contents"]
+        
+        # Emergency prompts always go to the model, never to the cache
+        cache_key = None
+        if use_cache and Config.RESPONSE_CACHE_ENABLED and \
+                not get_keyword_matcher().contains(prompt, "emergency"):
+            cache_key = make_cache_key(
+                Config.GEMINI_MODEL,
+                self.system_instruction,
+                Config.TEMPERATURE,
+                Config.TOP_P,
+                messages[:-1],
+                prompt
+            )
+            cached = response_cache.get(cache_key)
+            metrics_tracker.track_cache(self.name, cached is not None)
+            
+            if cached is not None:
+                logger.debug(f"{self.name} cache hit for: {prompt[:50]}...")
+                if on_chunk is not None:
+                    on_chunk(cached)
+                return cached
+        
+        emitted = []
+        
+        def emit(text: str) -> None:
+            emitted.append(text)
+            on_chunk(text)
+        
+        def fail_with(message: str) -> str:
+            if on_chunk is not None:
+                on_chunk(f"\n\n{message}" if emitted else message)
+            return message
+        
+        deadline = deadline or Deadline(Config.REQUEST_TIMEOUT)
+        executor = get_executor(self.backend.name, self.name)
+        
+        metrics_tracker.track_tokens(self.name, assembled["tokens_used"], assembled["tokens_saved"])
+        
         try:
             logger.debug(f"{self.name} generating response for: {prompt[:50]}...")
             
-            # Prepare messages
-            messages = context or []
-            messages.append({
-                "role": "user",
-                "parts": [{"text": prompt}]
-            })
-            
-            # Generate response
-            response = self.client.models.generate_content(
-                model=Config.GEMINI_MODEL,
-                contents=messages,
-                config=genai.types.GenerateContentConfig(
-                    system_instruction=self.system_instruction,
-                    temperature=Config.TEMPERATURE,
-                    top_p=Config.TOP_P,
+            if on_chunk is None:
+                result = await executor.call(lambda: self._call_model(messages), deadline)
+            else:
+                # Streams are never hedged and only retried before the first chunk
+                result = await executor.call(
+                    lambda: self._call_model(messages, emit),
+                    deadline,
+                    hedge=False,
+                    can_retry=lambda: not emitted
                 )
-            )
-            
-            result = response.text
             logger.debug(f"{self.name} generated response: {result[:100]}...")
             
-            return result
-            
+        except CircuitOpenError:
+            logger.warning(f"{self.name} serving fallback response: model backend unavailable")
+            metrics_tracker.track_resilience("fallbacks")
+            return fail_with(self.FALLBACK_RESPONSE)
+        except DeadlineExceeded:
+            logger.error(f"{self.name} response timed out")
+            return fail_with(self.ERROR_RESPONSE)
         except Exception as e:
             logger.error(f"{self.name} error generating response: {str(e)}")
-            return f"I apologize, but I encountered an error. Please try again."
+            return fail_with(self.ERROR_RESPONSE)
+        
+        if cache_key is not None and result:
+            response_cache.set(cache_key, result)
+        
+        return result
+    
+    async def _call_model(
+        self,
+        messages: List[Dict[str, Any]],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> str:
+        """
+        Call the model backend (raises on failure)
+        
+        Args:
+            messages: Full conversation contents to send
+            on_chunk: Optional streaming chunk callback
+            
+        Returns:
+            Generated response text
+        """
+        request = dict(
+            model=Config.GEMINI_MODEL,
+            system_instruction=self.system_instruction,
+            contents=messages,
+            temperature=Config.TEMPERATURE,
+            top_p=Config.TOP_P
+        )
+        
+        if on_chunk is None:
+            return await self.backend.generate(**request)
+        
+        # Stream response chunks to the caller as they arrive
+        chunks = []
+        async for chunk in self.backend.stream(**request):
+            chunks.append(chunk)
+            on_chunk(chunk)
+        return "".join(chunks)
+    
+    def generate_response(
+        self,
+        prompt: str,
+        context: Optional[Sequence[Dict[str, Any]]] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+        deadline: Optional[Deadline] = None
+    ) -> str:
+        """
+        Generate response from the model (sync wrapper)
+        
+        Args:
+            prompt: User prompt
+            context: Optional conversation context
+            on_chunk: Optional streaming chunk callback
+            deadline: Optional request deadline
+            
+        Returns:
+            Generated response text
+        """
+        return run_sync(self.agenerate_response(prompt, context, on_chunk, deadline=deadline))
     
     @abstractmethod
-    def process(self, user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def aprocess(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
         """
         Process user input and return agent-specific response
         
         Args:
             user_input: User's message
             context: Conversation context and state
+            on_chunk: Optional callback receiving response chunks as
+                they are generated (enables streaming)
             
         Returns:
             Dict containing response and updated context
         """
         pass
     
+    def process(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Process user input (sync wrapper around aprocess)
+        
+        Args:
+            user_input: User's message
+            context: Conversation context and state
+            on_chunk: Optional streaming chunk callback
+            
+        Returns:
+            Dict containing response and updated context
+        """
+        return run_sync(self.aprocess(user_input, context, on_chunk))
+    
     def get_info(self) -> Dict[str, str]:
         """
         Get agent information
@@ -3,8 +3,8 @@ Doctor Prep Agent
 Specialized agent for preparing doctor visit summaries and questions
 """
 
-from typing import Dict, Any, List
-from src.agents.base_agent import BaseAgent
+from typing import Dict, Any, List, Optional
+from src.agents.base_agent import BaseAgent, ChunkCallback
 from src.utils.helpers import get_timestamp
 from src.utils.logger import get_logger
 
@@ -61,13 +61,19 @@ Be thorough but concise. Focus on medically relevant information."""
         )
         logger.info("Doctor Prep Agent initialized")
     
-    def process(self, user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def aprocess(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
         """
         Process doctor preparation request
         
         Args:
             user_input: User's request for doctor prep
             context: Conversation context with history
+            on_chunk: Optional streaming chunk callback
             
         Returns:
             Formatted doctor visit preparation
@@ -81,9 +87,13 @@ Be thorough but concise. Focus on medically relevant information."""
         enhanced_prompt = self._build_prompt(user_input, summary)
         
         # Generate response
-        response = self.generate_response(
+        response = await self.agenerate_response(
             enhanced_prompt,
-            context.get("conversation_history", [])
+            context.get("conversation_history", []),
+            on_chunk,
+            deadline=context.get("deadline"),
+            memory=context.get("long_term_memory"),
+            summary=context.get("conversation_summary")
         )
         
         return {
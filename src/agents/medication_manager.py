@@ -3,14 +3,21 @@ Medication Manager Agent
 Specialized agent for medication management and interaction checking
 """
 
-from typing import Dict, Any, List
-from src.agents.base_agent import BaseAgent
-from src.utils.helpers import load_json
+import re
+from typing import Dict, Any, List, Optional, Sequence
+from src.agents.base_agent import BaseAgent, ChunkCallback
 from src.config import Config
+from src.utils.interactions import InteractionIndex, InteractionState, get_interaction_index
+from src.utils.keyword_matcher import compile_keywords
+from src.utils.knowledge_service import get_medications_db
+from src.utils.medication_extractor import MedicationExtractor, get_medication_extractor
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Clause boundaries, so "I stopped warfarin but take aspirin" only stops warfarin
+_CLAUSE = re.compile(r"[.,;:!?]|\b(?:and|but|while|though|although)\b", re.IGNORECASE)
+
 class MedicationManagerAgent(BaseAgent):
     """
     Agent specialized in medication management
@@ -59,94 +66,126 @@ Format responses with:
             system_instruction=self.SYSTEM_INSTRUCTION
         )
         
-        # Load medication databases
-        self.medications_db = load_json(Config.MEDICATIONS_DB)
-        self.interactions_db = load_json(Config.INTERACTIONS_DB)
         logger.info("Medication Manager Agent initialized")
     
-    def process(self, user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    # Databases come from the current knowledge snapshot on every request,
+    # so a reload takes effect without rebuilding the agent
+    
+    @property
+    def medications_db(self) -> Dict[str, Any]:
+        """Medications database"""
+        return get_medications_db()
+    
+    @property
+    def interaction_index(self) -> InteractionIndex:
+        """Drug interaction index"""
+        return get_interaction_index()
+    
+    @property
+    def medication_extractor(self) -> MedicationExtractor:
+        """Medication name extractor"""
+        return get_medication_extractor()
+    
+    async def aprocess(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
         """
         Process medication-related queries
         
         Args:
             user_input: User's medication query
             context: Conversation context
+            on_chunk: Optional streaming chunk callback
             
         Returns:
             Response with medication information and warnings
         """
         logger.info(f"Processing medication query: {user_input[:50]}...")
         
-        # Extract mentioned medications
-        mentioned_meds = self._extract_medications(user_input)
+        # Extract mentioned medications, and the ones the user stopped taking
+        stopped_meds = self._extract_stopped_medications(user_input)
+        mentioned_meds = [
+            med for med in self._extract_medications(user_input)
+            if med not in stopped_meds
+        ]
         
         # Check for interactions
-        interactions = self._check_interactions(mentioned_meds, context)
+        interactions = self._check_interactions(mentioned_meds, context, stopped_meds)
         
         # Build enhanced prompt
-        enhanced_prompt = self._build_prompt(user_input, mentioned_meds, interactions)
+        enhanced_prompt = self._build_prompt(user_input, mentioned_meds, interactions, stopped_meds)
         
         # Generate response
-        response = self.generate_response(
+        response = await self.agenerate_response(
             enhanced_prompt,
-            context.get("conversation_history", [])
+            context.get("conversation_history", []),
+            on_chunk,
+            deadline=context.get("deadline"),
+            memory=context.get("long_term_memory"),
+            summary=context.get("conversation_summary")
         )
         
         return {
             "response": response,
             "agent": self.name,
             "medications_mentioned": mentioned_meds,
+            "medications_stopped": stopped_meds,
             "interactions_found": interactions
         }
     
     def _extract_medications(self, text: str) -> List[str]:
-        """Extract medication names from text"""
-        medications = []
-        text_lower = text.lower()
+        """Extract medication names (generic, brand or misspelled) from text"""
+        return self.medication_extractor.extract(text)
+    
+    def _extract_stopped_medications(self, text: str) -> List[str]:
+        """Extract medications the user says they no longer take"""
+        stop_phrases = compile_keywords(tuple(Config.MEDICATION_STOP_KEYWORDS), "stop")
         
-        # Check against known medications
-        for med in self.medications_db.get("common_medications", []):
-            if med["name"].lower() in text_lower:
-                medications.append(med["name"])
+        stopped = []
+        for clause in _CLAUSE.split(text):
+            if stop_phrases.contains(clause, "stop"):
+                stopped.extend(med for med in self._extract_medications(clause) if med not in stopped)
         
-        return medications
+        return stopped
     
     def _check_interactions(
         self,
         medications: List[str],
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        stopped: Sequence[str] = ()
     ) -> List[Dict[str, Any]]:
-        """Check for drug interactions"""
-        interactions = []
+        """
+        Check for drug interactions
         
-        # Get medications from context (previously mentioned)
-        context_meds = context.get("user_medications", [])
-        all_meds = list(set(medications + context_meds))
+        Uses the session's interaction state when there is one, so only
+        pairs involving newly mentioned drugs are looked up; otherwise
+        all pairs with the medications in the context are checked.
+        """
+        state = context.get("interaction_state")
+        if state is None:
+            state = InteractionState(context.get("user_medications", []), self.interaction_index)
+        else:
+            state.rebind(self.interaction_index)  # No-op unless the database was reloaded
         
-        # Check each pair
-        for i, med1 in enumerate(all_meds):
-            for med2 in all_meds[i+1:]:
-                interaction = self._find_interaction(med1, med2)
-                if interaction:
-                    interactions.append(interaction)
+        state.remove(stopped)
+        state.add(medications)
         
-        return interactions
+        return state.interactions(Config.INTERACTION_MIN_SEVERITY)
     
-    def _find_interaction(self, drug1: str, drug2: str) -> Dict[str, Any]:
-        """Find interaction between two drugs"""
-        for interaction in self.interactions_db.get("drug_interactions", []):
-            if (interaction["drug1"].lower() == drug1.lower() and 
-                interaction["drug2"].lower() == drug2.lower()) or \
-               (interaction["drug2"].lower() == drug1.lower() and 
-                interaction["drug1"].lower() == drug2.lower()):
-                return interaction
-        return None
+    def _find_interaction(self, drug1: str, drug2: str) -> Optional[Dict[str, Any]]:
+        """Find the most severe interaction between two drugs"""
+        interactions = self.interaction_index.lookup(drug1, drug2, Config.INTERACTION_MIN_SEVERITY)
+        return interactions[0] if interactions else None
     
     def _build_prompt(
         self,
         user_input: str,
         medications: List[str],
-        interactions: List[Dict[str, Any]]
+        interactions: List[Dict[str, Any]],
+        stopped: Sequence[str] = ()
     ) -> str:
         """Build enhanced prompt with medication context"""
         
@@ -155,6 +194,9 @@ Format responses with:
         if medications:
             prompt += f"Medications mentioned: {', '.join(medications)}\n\n"
         
+        if stopped:
+            prompt += f"Medications the user has stopped taking: {', '.join(stopped)}\n\n"
+        
         if interactions:
             prompt += "⚠️ POTENTIAL INTERACTIONS FOUND:\n"
             for interaction in interactions:
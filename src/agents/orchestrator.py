@@ -4,12 +4,23 @@ Main coordinator for the multi-agent system
 Routes requests to specialized agents and manages workflow
 """
 
-from typing import Dict, Any, Optional
-from src.agents.base_agent import BaseAgent
+import asyncio
+import hashlib
+import json
+from typing import Dict, Any, List, Optional
+from src.agents.base_agent import BaseAgent, ChunkCallback
 from src.agents.symptom_analyzer import SymptomAnalyzerAgent
 from src.agents.medication_manager import MedicationManagerAgent
 from src.agents.doctor_prep import DoctorPrepAgent
+from src.config import Config
+from src.utils.intent_classifier import get_intent_classifier
+from src.utils.keyword_matcher import get_keyword_matcher
+from src.utils.knowledge_service import current_snapshot, pinned_snapshot
 from src.utils.logger import get_logger
+from src.utils.metrics import metrics_tracker
+from src.utils.safety import EMERGENCY_RESPONSE, get_emergency_screen
+from src.utils.semantic_cache import canonicalize, semantic_cache
+from src.utils.symptom_matcher import get_symptom_matcher
 
 logger = get_logger(__name__)
 
@@ -49,47 +60,112 @@ IMPORTANT SAFETY RULES:
 Respond naturally and conversationally while being professional and helpful."""
     
     def __init__(self):
-        """Initialize Orchestrator and all specialized agents"""
+        """Initialize Orchestrator (specialized agents are built lazily)"""
         super().__init__(
             name="Orchestrator",
             system_instruction=self.SYSTEM_INSTRUCTION
         )
         
-        # Initialize specialized agents
-        self.symptom_agent = SymptomAnalyzerAgent()
-        self.medication_agent = MedicationManagerAgent()
-        self.doctor_prep_agent = DoctorPrepAgent()
+        # Specialized agents are created on the first request routed to them
+        self._symptom_agent: Optional[SymptomAnalyzerAgent] = None
+        self._medication_agent: Optional[MedicationManagerAgent] = None
+        self._doctor_prep_agent: Optional[DoctorPrepAgent] = None
         
-        logger.info("Orchestrator Agent initialized with all sub-agents")
+        logger.info("Orchestrator Agent initialized")
     
-    def process(self, user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    @property
+    def symptom_agent(self) -> SymptomAnalyzerAgent:
+        """Symptom Analyzer agent (built on first use)"""
+        if self._symptom_agent is None:
+            self._symptom_agent = SymptomAnalyzerAgent()
+        return self._symptom_agent
+    
+    @property
+    def medication_agent(self) -> MedicationManagerAgent:
+        """Medication Manager agent (built on first use)"""
+        if self._medication_agent is None:
+            self._medication_agent = MedicationManagerAgent()
+        return self._medication_agent
+    
+    @property
+    def doctor_prep_agent(self) -> DoctorPrepAgent:
+        """Doctor Prep agent (built on first use)"""
+        if self._doctor_prep_agent is None:
+            self._doctor_prep_agent = DoctorPrepAgent()
+        return self._doctor_prep_agent
+    
+    async def aprocess(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
         """
         Process user input and route to appropriate agent(s)
         
         Args:
             user_input: User's message
             context: Conversation context
+            on_chunk: Optional streaming chunk callback
             
         Returns:
-            Response from appropriate agent(s)
+            Response from appropriate agent(s), with the knowledge
+            version that served it (kb_version)
         """
+        # The whole request (including fanned-out agents) reads one
+        # knowledge snapshot, even if a reload swaps in a newer one meanwhile
+        with pinned_snapshot() as snapshot:
+            result = await self._aprocess(user_input, context, on_chunk)
+        
+        result["kb_version"] = snapshot.version
+        return result
+    
+    async def _aprocess(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
+        """Route user input on the pinned knowledge snapshot"""
         logger.info(f"Orchestrator processing: {user_input[:50]}...")
         
-        # Determine intent and route to appropriate agent
-        intent = self._classify_intent(user_input)
+        # Safety screen runs before routing, caches and any model call
+        emergency = get_emergency_screen().check(user_input)
+        if emergency is not None:
+            return self._emergency_result(emergency, on_chunk)
+        
+        # Determine intent(s) and route to appropriate agent(s)
+        intents = self._select_intents(user_input)
+        intent = "+".join(intents)
         
         logger.info(f"Classified intent: {intent}")
         
-        # Route to appropriate agent
-        if intent == "symptom":
-            result = self.symptom_agent.process(user_input, context)
-        elif intent == "medication":
-            result = self.medication_agent.process(user_input, context)
-        elif intent == "doctor_prep":
-            result = self.doctor_prep_agent.process(user_input, context)
+        # Answer near-duplicate first-turn questions from the semantic cache
+        cache_guard = None
+        if self._semantic_cache_eligible(user_input, context):
+            cache_guard = self._semantic_cache_guard(user_input, intents, context)
+            cached = semantic_cache.lookup(user_input, intent, cache_guard)
+            metrics_tracker.track_cache("SemanticCache", cached is not None)
+            
+            if cached is not None:
+                if on_chunk is not None:
+                    on_chunk(cached["response"])
+                cached["intent"] = intent
+                cached["orchestrator"] = self.name
+                cached["cached"] = True
+                return cached
+        
+        # Route to appropriate agent(s)
+        if len(intents) > 1:
+            result = await self._fan_out(intents, user_input, context, on_chunk)
         else:
-            # General health query - orchestrator handles it
-            result = self._handle_general_query(user_input, context)
+            result = await self._route(intent, user_input, context, on_chunk)
+        
+        if result.get("is_emergency"):
+            metrics_tracker.track_emergency()
+        
+        if cache_guard is not None and self._is_cacheable(result):
+            semantic_cache.add(user_input, intent, result, cache_guard)
         
         # Update context with agent information
         result["intent"] = intent
@@ -97,70 +173,305 @@ Respond naturally and conversationally while being professional and helpful."""
         
         return result
     
-    def _classify_intent(self, user_input: str) -> str:
+    def _emergency_result(
+        self,
+        emergency: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
         """
-        Classify user intent to route to correct agent
+        Answer an emergency with the canned alert, without a model call
+        
+        Args:
+            emergency: Match reported by the emergency screen
+            on_chunk: Optional streaming chunk callback
+            
+        Returns:
+            Emergency response
+        """
+        logger.warning(f"Emergency screen matched: {emergency['phrase']}")
+        metrics_tracker.track_emergency()
+        
+        if on_chunk is not None:
+            on_chunk(EMERGENCY_RESPONSE)
+        
+        return {
+            "response": EMERGENCY_RESPONSE,
+            "agent": self.name,
+            "type": "emergency",
+            "is_emergency": True,
+            "emergency_match": emergency,
+            "intent": "emergency",
+            "orchestrator": self.name
+        }
+    
+    async def _route(
+        self,
+        intent: str,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
+        """Run the agent responsible for a single intent"""
+        if intent == "symptom":
+            return await self.symptom_agent.aprocess(user_input, context, on_chunk)
+        elif intent == "medication":
+            return await self.medication_agent.aprocess(user_input, context, on_chunk)
+        elif intent == "doctor_prep":
+            return await self.doctor_prep_agent.aprocess(user_input, context, on_chunk)
+        else:
+            # General health query - orchestrator handles it
+            return await self._handle_general_query(user_input, context, on_chunk)
+    
+    async def _fan_out(
+        self,
+        intents: List[str],
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Run several specialist agents concurrently and merge their results
+        
+        The first agent streams live; the others run at the same time and
+        their sections are emitted in order once everything before them
+        has finished, so wall-clock time is close to the slowest agent,
+        not the sum.
         
         Args:
+            intents: Intents to handle, primary first
             user_input: User's message
+            context: Conversation context
+            on_chunk: Optional streaming chunk callback
             
         Returns:
-            Intent category: symptom, medication, doctor_prep, or general
+            Merged result
         """
-        text_lower = user_input.lower()
+        logger.info(f"Fanning out to {len(intents)} agents: {', '.join(intents)}")
         
-        # Symptom-related keywords
-        symptom_keywords = [
-            "pain", "hurt", "ache", "feel", "sick", "symptom",
-            "headache", "fever", "tired", "fatigue", "dizzy", "nausea"
+        tasks = [
+            asyncio.ensure_future(self._route(
+                intent,
+                user_input,
+                context,
+                on_chunk if index == 0 else None
+            ))
+            for index, intent in enumerate(intents)
         ]
+        results = []
+        try:
+            for index, task in enumerate(tasks):
+                result = await task
+                if index > 0 and on_chunk is not None and result.get("response"):
+                    on_chunk("\n\n" + result["response"])
+                results.append(result)
+        finally:
+            for task in tasks:
+                task.cancel()
         
-        # Medication-related keywords
-        medication_keywords = [
-            "medication", "medicine", "drug", "pill", "prescription",
-            "aspirin", "ibuprofen", "acetaminophen", "take", "taking",
-            "dose", "dosage"
-        ]
+        return self._merge_results(results)
+    
+    def _merge_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge specialist results into one response
         
-        # Doctor prep keywords
-        doctor_keywords = [
-            "doctor", "appointment", "visit", "prepare", "summary",
-            "questions to ask", "see my doctor"
-        ]
+        Safety fields are never dropped: is_emergency is true if any
+        agent flagged an emergency and all interactions are kept.
+        """
+        merged: Dict[str, Any] = {
+            "response": "\n\n".join(r.get("response", "") for r in results if r.get("response")),
+            "agent": self.name,
+            "agents": [r.get("agent", "Unknown") for r in results],
+            "type": "multi_agent",
+            "is_emergency": any(r.get("is_emergency") for r in results),
+            "interactions_found": []
+        }
         
-        # Count keyword matches
-        symptom_score = sum(1 for kw in symptom_keywords if kw in text_lower)
-        medication_score = sum(1 for kw in medication_keywords if kw in text_lower)
-        doctor_score = sum(1 for kw in doctor_keywords if kw in text_lower)
+        for result in results:
+            for key, value in result.items():
+                if key in ("response", "agent", "type", "is_emergency"):
+                    continue
+                if isinstance(value, list) and isinstance(merged.get(key), list):
+                    merged[key] = merged[key] + [item for item in value if item not in merged[key]]
+                elif key not in merged:
+                    merged[key] = value
         
-        # Determine intent based on highest score
-        scores = {
-            "symptom": symptom_score,
-            "medication": medication_score,
-            "doctor_prep": doctor_score
+        return merged
+    
+    def _semantic_cache_eligible(self, user_input: str, context: Dict[str, Any]) -> bool:
+        """
+        Check whether a turn may be answered from the semantic cache
+        
+        Only first turns qualify (the history is empty or holds just the
+        current message), and emergencies always bypass the cache.
+        """
+        if not Config.SEMANTIC_CACHE_ENABLED:
+            return False
+        
+        if get_keyword_matcher().contains(user_input, "emergency"):
+            return False
+        
+        history = context.get("conversation_history", [])
+        if not history:
+            return True
+        
+        if len(history) == 1 and history[0].get("role") == "user":
+            parts = history[0].get("parts", [])
+            return len(parts) == 1 and parts[0].get("text") == user_input
+        
+        return False
+    
+    def _semantic_cache_guard(self, user_input: str, intents: List[str], context: Dict[str, Any]) -> str:
+        """
+        Build the exact-match part of the semantic cache key
+        
+        Captures everything besides the wording that the answer depends
+        on, so e.g. "aspirin with ibuprofen" never answers "aspirin with
+        warfarin", and "I have a headache" never answers "I don't have
+        a headache". Answers built on a patient's long-term memory are
+        keyed by a digest of it, so they are only ever served back to a
+        context with the same memory.
+        """
+        query = canonicalize(user_input)
+        memory = context.get("long_term_memory") or ""
+        guard = {
+            "concepts": query.concepts,  # Symptoms and drugs asked about
+            "negated": query.negated,
+            "kb_version": current_snapshot().version,  # Answers reflect the databases they were built from
+            "user_medications": sorted(context.get("user_medications", [])),
+            "symptoms_discussed": sorted(context.get("symptoms_discussed", [])),
+            "health_concerns": sorted(context.get("health_concerns", [])),
+            "memory": hashlib.sha256(memory.encode("utf-8")).hexdigest() if memory else ""
         }
         
+        if "medication" in intents:
+            guard["medications_mentioned"] = sorted(self.medication_agent._extract_medications(user_input))
+        
+        return json.dumps(guard, sort_keys=True)
+    
+    def _is_cacheable(self, result: Dict[str, Any]) -> bool:
+        """Only successful, non-emergency responses are cached"""
+        response = result.get("response")
+        return bool(response) and \
+            response not in (self.ERROR_RESPONSE, self.FALLBACK_RESPONSE) and \
+            not result.get("is_emergency")
+    
+    def _score_intents(self, user_input: str) -> Dict[str, int]:
+        """
+        Score each specialist intent by routing keyword matches
+        
+        Args:
+            user_input: User's message
+            
+        Returns:
+            Keyword match count per intent
+        """
+        matcher = get_keyword_matcher()
+        
+        # Count distinct keyword matches (one scan, shared by all intents)
+        return {
+            intent: len(matcher.matches(user_input, f"intent:{intent}"))
+            for intent in Config.INTENT_KEYWORDS
+        }
+    
+    def _classify_intent(self, user_input: str) -> str:
+        """
+        Classify user intent to route to correct agent
+        
+        Uses the local intent classifier when a model is available and
+        confident enough, otherwise the keyword rules.
+        
+        Args:
+            user_input: User's message
+            
+        Returns:
+            Intent category: symptom, medication, doctor_prep, or general
+        """
+        classifier = get_intent_classifier()
+        if classifier is not None:
+            prediction = classifier.classify(user_input)
+            if prediction["confidence"] >= Config.INTENT_MIN_CONFIDENCE:
+                return prediction["intent"]
+            logger.debug(f"Low classifier confidence ({prediction['confidence']:.2f}), using keywords")
+        
+        return self._classify_by_keywords(user_input)
+    
+    def _classify_by_keywords(self, user_input: str) -> str:
+        """
+        Classify intent by routing keyword counts (fallback rules)
+        
+        Args:
+            user_input: User's message
+            
+        Returns:
+            Intent category: symptom, medication, doctor_prep, or general
+        """
+        scores = self._score_intents(user_input)
+        
         max_score = max(scores.values())
         
         if max_score == 0:
             return "general"
         
+        # Determine intent based on highest score
         return max(scores, key=scores.get)
     
-    def _handle_general_query(self, user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _select_intents(self, user_input: str) -> List[str]:
+        """
+        Select the intents a message should be routed to
+        
+        The highest scoring intent comes first. With fan-out enabled,
+        other intents scoring at least Config.FAN_OUT_MIN_SCORE are added,
+        and so is the symptom intent when the message names a catalogued
+        symptom ("I have a headache, can I take ibuprofen?"): one clear
+        mention is enough, while a generic keyword alone ("ibuprofen for
+        pain") is not. Emergencies never get here: the safety screen
+        answers them first.
+        
+        Args:
+            user_input: User's message
+            
+        Returns:
+            Intents to handle, primary first
+        """
+        primary = self._classify_intent(user_input)
+        if primary == "general" or not Config.FAN_OUT_ENABLED:
+            return [primary]
+        
+        scores = self._score_intents(user_input)
+        if primary != "symptom" and get_symptom_matcher().match(user_input):
+            scores["symptom"] = max(scores["symptom"], Config.FAN_OUT_MIN_SCORE)
+        
+        intents = [primary] + [
+            intent for intent in sorted(scores, key=scores.get, reverse=True)
+            if intent != primary and scores[intent] >= Config.FAN_OUT_MIN_SCORE
+        ]
+        
+        return intents
+    
+    async def _handle_general_query(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
         """
         Handle general health queries not specific to any agent
         
         Args:
             user_input: User's message
             context: Conversation context
+            on_chunk: Optional streaming chunk callback
             
         Returns:
             General health guidance response
         """
-        response = self.generate_response(
+        response = await self.agenerate_response(
             user_input,
-            context.get("conversation_history", [])
+            context.get("conversation_history", []),
+            on_chunk,
+            deadline=context.get("deadline"),
+            memory=context.get("long_term_memory"),
+            summary=context.get("conversation_summary")
         )
         
         return {
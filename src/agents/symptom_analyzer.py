@@ -3,11 +3,12 @@ Symptom Analyzer Agent
 Specialized agent for analyzing health symptoms and asking clarifying questions
 """
 
-from typing import Dict, Any, List
-from src.agents.base_agent import BaseAgent
-from src.utils.helpers import load_json
-from src.config import Config
+from typing import Dict, Any, List, Optional, Sequence
+from src.agents.base_agent import BaseAgent, ChunkCallback
+from src.utils.knowledge_service import get_symptoms_db
 from src.utils.logger import get_logger
+from src.utils.safety import EMERGENCY_RESPONSE, get_emergency_screen
+from src.utils.symptom_matcher import SymptomMatch, get_symptom_matcher, merge_questions
 
 logger = get_logger(__name__)
 
@@ -56,17 +57,26 @@ Format your response clearly with:
             system_instruction=self.SYSTEM_INSTRUCTION
         )
         
-        # Load symptom database
-        self.symptoms_db = load_json(Config.SYMPTOMS_DB)
         logger.info("Symptom Analyzer Agent initialized")
     
-    def process(self, user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    @property
+    def symptoms_db(self) -> Dict[str, Any]:
+        """Symptom database of the current knowledge snapshot"""
+        return get_symptoms_db()
+    
+    async def aprocess(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
         """
         Process symptom-related queries
         
         Args:
             user_input: User's symptom description
             context: Conversation context
+            on_chunk: Optional streaming chunk callback
             
         Returns:
             Response with symptom analysis and questions
@@ -75,74 +85,78 @@ Format your response clearly with:
         
         # Check for emergency keywords
         if self._detect_emergency(user_input):
+            emergency_response = self._generate_emergency_response()
+            
+            # Emit the canned alert immediately as a single chunk
+            if on_chunk is not None:
+                on_chunk(emergency_response)
+            
             return {
-                "response": self._generate_emergency_response(),
+                "response": emergency_response,
                 "agent": self.name,
                 "is_emergency": True
             }
         
-        # Get relevant symptom questions
-        questions = self._get_relevant_questions(user_input)
+        # Find every mentioned symptom (with red flags) and merge their questions
+        matches = self._match_symptoms(user_input)
+        questions = merge_questions(matches)
         
         # Build enhanced prompt
-        enhanced_prompt = self._build_prompt(user_input, questions, context)
+        enhanced_prompt = self._build_prompt(user_input, questions, context, matches)
         
         # Generate response
-        response = self.generate_response(
+        response = await self.agenerate_response(
             enhanced_prompt,
-            context.get("conversation_history", [])
+            context.get("conversation_history", []),
+            on_chunk,
+            deadline=context.get("deadline"),
+            memory=context.get("long_term_memory"),
+            summary=context.get("conversation_summary")
         )
         
         return {
             "response": response,
             "agent": self.name,
             "symptom_questions": questions,
+            "symptoms_matched": [match.name for match in matches],
+            "red_flags": [{"symptom": match.name, "phrase": flag} for match in matches for flag in match.red_flags],
             "is_emergency": False
         }
     
     def _detect_emergency(self, text: str) -> bool:
-        """Detect emergency keywords in text"""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in Config.EMERGENCY_KEYWORDS)
+        """Detect emergency phrases (and symptom red flags) in text"""
+        return get_emergency_screen().check(text) is not None
     
     def _generate_emergency_response(self) -> str:
         """Generate emergency response"""
-        return """🚨 EMERGENCY ALERT 🚨
-
-Based on your symptoms, this may require IMMEDIATE medical attention.
-
-PLEASE:
-1. Call emergency services (911) immediately
-2. Or go to the nearest emergency room
-3. Do not wait or try to treat this at home
-
-This is not something that can be safely managed through this app.
-
-Your safety is the priority. Please seek emergency medical care now."""
+        return EMERGENCY_RESPONSE
+    
+    def _match_symptoms(self, user_input: str) -> List[SymptomMatch]:
+        """Symptoms mentioned in the input, best first"""
+        return get_symptom_matcher().match(user_input)
     
     def _get_relevant_questions(self, user_input: str) -> List[str]:
         """Get relevant symptom questions from database"""
-        questions = []
-        
-        common_symptoms = self.symptoms_db.get("common_symptoms", [])
-        
-        for symptom in common_symptoms:
-            if symptom["name"].lower() in user_input.lower():
-                questions.extend(symptom.get("questions", []))
-                break
-        
-        return questions[:5]  # Limit to 5 questions
+        return merge_questions(self._match_symptoms(user_input))
     
     def _build_prompt(
         self,
         user_input: str,
         questions: List[str],
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        matches: Sequence[SymptomMatch] = ()
     ) -> str:
         """Build enhanced prompt with context"""
         
         prompt = f"User symptom report: {user_input}\n\n"
         
+        if matches:
+            prompt += f"Symptoms mentioned: {', '.join(match.name for match in matches)}\n"
+            red_flags = [f"{match.name} {flag}" for match in matches for flag in match.red_flags]
+            if red_flags:
+                prompt += f"Warning signs mentioned: {'; '.join(red_flags)}. Advise prompt medical attention.\n"
+            prompt += "\n"
+        
         if questions:
             prompt += "Relevant questions to consider asking:\n"
             for i, q in enumerate(questions, 1):
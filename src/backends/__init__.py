@@ -0,0 +1,58 @@
+"""Model backends for MediMind AI agents"""
+
+import threading
+from typing import Optional
+from src.backends.base import ModelBackend, BackendError
+from src.config import Config
+
+_backend: Optional[ModelBackend] = None
+_backend_lock = threading.Lock()
+
+def create_backend(name: Optional[str] = None) -> ModelBackend:
+    """
+    Create a model backend from Config settings
+
+    Args:
+        name: Backend name ("gemini", "fake" or "cassette"); defaults to Config.MODEL_BACKEND
+
+    Returns:
+        New backend instance
+    """
+    name = (name or Config.MODEL_BACKEND).lower()
+
+    if name == "gemini":
+        from src.backends.gemini import GeminiBackend
+        return GeminiBackend()
+
+    if name == "fake":
+        from src.backends.fake import FakeBackend
+        return FakeBackend(
+            latency_mean=Config.FAKE_LATENCY_MEAN,
+            latency_p99=Config.FAKE_LATENCY_P99,
+            error_rate=Config.FAKE_ERROR_RATE,
+            seed=Config.FAKE_SEED
+        )
+
+    if name == "cassette":
+        from src.backends.cassette import CassetteBackend
+        inner = create_backend(Config.CASSETTE_RECORD_BACKEND) if Config.CASSETTE_MODE == "record" else None
+        return CassetteBackend(Config.CASSETTE_PATH, Config.CASSETTE_MODE, inner)
+
+    raise ValueError(f"Unknown model backend: {name}")
+
+def get_backend() -> ModelBackend:
+    """Get the process-wide model backend, creating it on first use"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+def set_backend(backend: Optional[ModelBackend]) -> None:
+    """Replace the process-wide backend (None resets to Config default)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+__all__ = ["ModelBackend", "BackendError", "create_backend", "get_backend", "set_backend"]
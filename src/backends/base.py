@@ -0,0 +1,85 @@
+"""
+Model Backend interface for MediMind AI
+Abstracts the model API behind BaseAgent.generate_response
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, AsyncIterator
+
+class BackendError(Exception):
+    """Error raised by a model backend"""
+
+    def __init__(self, message: str, retryable: bool = False):
+        """
+        Initialize backend error
+
+        Args:
+            message: Error description
+            retryable: Whether the request may succeed if retried
+        """
+        super().__init__(message)
+        self.retryable = retryable
+
+class ModelBackend(ABC):
+    """
+    Abstract base class for model backends
+
+    A backend turns one generation request (model, system instruction,
+    sampling parameters and conversation contents) into response text,
+    either all at once or as a stream of chunks. Backends raise on
+    failure; BaseAgent owns caching and error handling.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> str:
+        """
+        Generate a complete response
+
+        Args:
+            model: Model name
+            system_instruction: Agent system instruction
+            contents: Conversation contents, ending with the current prompt
+            temperature: Sampling temperature
+            top_p: Nucleus sampling parameter
+
+        Returns:
+            Generated response text
+        """
+        pass
+
+    @abstractmethod
+    def stream(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response as a stream of text chunks
+
+        Args:
+            model: Model name
+            system_instruction: Agent system instruction
+            contents: Conversation contents, ending with the current prompt
+            temperature: Sampling temperature
+            top_p: Nucleus sampling parameter
+
+        Returns:
+            Async iterator over response chunks
+        """
+        pass
+
+    def preconnect(self) -> None:
+        """Warm up connections before the first request (optional)"""
+        pass
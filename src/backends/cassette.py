@@ -0,0 +1,140 @@
+"""
+Cassette Backend for MediMind AI
+Record/replay backend for reproducing captured model traffic offline
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Any, List, AsyncIterator, Optional
+from src.backends.base import ModelBackend, BackendError
+from src.utils.helpers import ensure_directory
+from src.utils.logger import get_logger
+from src.utils.response_cache import make_cache_key
+
+logger = get_logger(__name__)
+
+class CassetteBackend(ModelBackend):
+    """
+    Record/replay model backend
+
+    In record mode every request is forwarded to an inner backend and the
+    response (with its stream chunks) is appended to a JSONL cassette.
+    In replay mode responses are served from the cassette; repeated
+    identical requests replay their recordings in order, repeating the
+    last one once exhausted. Unrecorded requests raise BackendError.
+    """
+
+    name = "cassette"
+
+    def __init__(self, path: str, mode: str = "replay", inner: Optional[ModelBackend] = None):
+        """
+        Initialize cassette backend
+
+        Args:
+            path: Path to the JSONL cassette file
+            mode: "replay" or "record"
+            inner: Backend to record from (required in record mode)
+        """
+        if mode not in ("replay", "record"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode requires an inner backend")
+
+        self.path = path
+        self.mode = mode
+        self.inner = inner
+        self._recordings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._positions: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+
+    def _load(self) -> None:
+        """Load recordings from the cassette file"""
+        if not os.path.exists(self.path):
+            logger.warning(f"Cassette not found: {self.path}")
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._recordings[record["key"]].append(record)
+
+        logger.info(f"Loaded {sum(len(r) for r in self._recordings.values())} recordings from {self.path}")
+
+    @staticmethod
+    def _key(model: str, system_instruction: str, contents: List[Dict[str, Any]], temperature: float, top_p: float) -> str:
+        """Identify a request"""
+        prompt = " ".join(part.get("text", "") for part in contents[-1].get("parts", [])) if contents else ""
+        return make_cache_key(model, system_instruction, temperature, top_p, contents[:-1], prompt)
+
+    def _next_recording(self, key: str) -> Dict[str, Any]:
+        """Get the next recording for a request"""
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                raise BackendError("No cassette recording for request")
+
+            position = self._positions[key]
+            self._positions[key] = position + 1
+            return recordings[min(position, len(recordings) - 1)]
+
+    def _record(self, key: str, model: str, contents: List[Dict[str, Any]], chunks: List[str]) -> None:
+        """Append a recording to the cassette"""
+        record = {
+            "key": key,
+            "model": model,
+            "prompt": " ".join(part.get("text", "") for part in contents[-1].get("parts", [])) if contents else "",
+            "response": "".join(chunks),
+            "chunks": chunks
+        }
+
+        with self._lock:
+            if os.path.dirname(self.path):
+                ensure_directory(os.path.dirname(self.path))
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> str:
+        """Replay or record a complete response"""
+        key = self._key(model, system_instruction, contents, temperature, top_p)
+
+        if self.mode == "replay":
+            return self._next_recording(key)["response"]
+
+        response = await self.inner.generate(model, system_instruction, contents, temperature, top_p)
+        self._record(key, model, contents, [response])
+        return response
+
+    async def stream(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> AsyncIterator[str]:
+        """Replay or record a streamed response"""
+        key = self._key(model, system_instruction, contents, temperature, top_p)
+
+        if self.mode == "replay":
+            for chunk in self._next_recording(key)["chunks"]:
+                yield chunk
+            return
+
+        chunks = []
+        async for chunk in self.inner.stream(model, system_instruction, contents, temperature, top_p):
+            chunks.append(chunk)
+            yield chunk
+        self._record(key, model, contents, chunks)
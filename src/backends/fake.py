@@ -0,0 +1,159 @@
+"""
+Fake Backend for MediMind AI
+Deterministic offline backend with configurable latency and error rate
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import threading
+from typing import Dict, Any, List, AsyncIterator, Optional
+from src.backends.base import ModelBackend, BackendError
+
+# z-score of the 99th percentile of a standard normal distribution
+_Z_P99 = 2.3263
+
+_FILLER_SENTENCES = [
+    "I understand this can be concerning, and I'm here to help you think it through.",
+    "Could you tell me more about when this started and how it has changed?",
+    "On a scale of 1-10, how would you rate it right now?",
+    "Please keep track of any other symptoms you notice.",
+    "If anything gets worse or feels severe, please seek medical care promptly.",
+    "This information is general and not a substitute for professional advice.",
+    "It would be a good idea to discuss this with your doctor or pharmacist.",
+    "Staying hydrated and getting enough rest can also help.",
+]
+
+class LatencyModel:
+    """
+    Log-normal latency distribution parameterized by mean and p99
+
+    Mean and p99 map directly to what a load test wants to control:
+    typical latency and how heavy the tail is.
+    """
+
+    def __init__(self, mean: float, p99: Optional[float] = None, rng: Optional[random.Random] = None):
+        """
+        Initialize latency model
+
+        Args:
+            mean: Mean latency in seconds (0 disables latency)
+            p99: 99th percentile latency in seconds (defaults to 3x mean)
+            rng: Random number generator
+        """
+        self.mean = mean
+        self.p99 = p99 if p99 is not None else 3 * mean
+        self.rng = rng or random.Random()
+
+        if mean <= 0:
+            self.mu, self.sigma = 0.0, 0.0
+            return
+
+        # mean = exp(mu + s^2 / 2) and p99 = exp(mu + z * s); solve for s
+        gap = math.log(max(self.p99, mean)) - math.log(mean)
+        discriminant = _Z_P99 * _Z_P99 - 2 * gap
+        self.sigma = _Z_P99 - math.sqrt(discriminant) if discriminant > 0 else _Z_P99
+        self.mu = math.log(mean) - self.sigma * self.sigma / 2
+
+    def sample(self) -> float:
+        """Draw one latency in seconds"""
+        if self.mean <= 0:
+            return 0.0
+        return self.rng.lognormvariate(self.mu, self.sigma)
+
+class FakeBackend(ModelBackend):
+    """
+    Deterministic fake model backend
+
+    Response text depends only on the request, so repeated runs produce
+    identical output. Latency and failures are drawn from a seeded RNG,
+    which makes a sequence of calls reproducible for load tests.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_mean: float = 0.0,
+        latency_p99: Optional[float] = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        chunk_words: int = 8
+    ):
+        """
+        Initialize fake backend
+
+        Args:
+            latency_mean: Mean response latency in seconds
+            latency_p99: 99th percentile latency in seconds
+            error_rate: Probability (0-1) that a call fails with a retryable error
+            seed: RNG seed for reproducible latency and errors
+            chunk_words: Words per chunk when streaming
+        """
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.latency = LatencyModel(latency_mean, latency_p99, self._rng)
+        self.error_rate = error_rate
+        self.chunk_words = chunk_words
+        self.calls = 0
+
+    def _draw(self) -> float:
+        """Draw latency for one call, raising if the call should fail"""
+        with self._rng_lock:
+            self.calls += 1
+            latency = self.latency.sample()
+            failed = self._rng.random() < self.error_rate
+
+        if failed:
+            raise BackendError("Simulated backend failure", retryable=True)
+        return latency
+
+    def _response_text(self, system_instruction: str, contents: List[Dict[str, Any]]) -> str:
+        """Build a deterministic response for a request"""
+        prompt = " ".join(part.get("text", "") for part in contents[-1].get("parts", [])) if contents else ""
+        digest = hashlib.sha256(f"{system_instruction}\n{prompt}".encode("utf-8")).digest()
+
+        sentences = [_FILLER_SENTENCES[b % len(_FILLER_SENTENCES)] for b in digest[:4]]
+        summary = " ".join(prompt.split()[:30])
+
+        return f"Thank you for sharing that. Regarding \"{summary}\": " + " ".join(sentences)
+
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> str:
+        """Generate a complete response after a simulated delay"""
+        latency = self._draw()
+        if latency:
+            await asyncio.sleep(latency)
+        return self._response_text(system_instruction, contents)
+
+    async def stream(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> AsyncIterator[str]:
+        """Stream the response, spending ~30% of the latency before the first chunk"""
+        latency = self._draw()
+        words = self._response_text(system_instruction, contents).split(" ")
+        chunks = [
+            " ".join(words[i:i + self.chunk_words]) + (" " if i + self.chunk_words < len(words) else "")
+            for i in range(0, len(words), self.chunk_words)
+        ]
+
+        first_delay = latency * 0.3
+        per_chunk_delay = (latency - first_delay) / max(len(chunks) - 1, 1)
+
+        for i, chunk in enumerate(chunks):
+            delay = first_delay if i == 0 else per_chunk_delay
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
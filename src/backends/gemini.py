@@ -0,0 +1,81 @@
+"""
+Gemini Backend for MediMind AI
+Production backend calling Google Gemini through the shared client pool
+"""
+
+from typing import Dict, Any, List, AsyncIterator
+import httpx
+from google import genai
+from google.genai import errors
+from src.backends.base import ModelBackend, BackendError
+from src.utils.client_pool import client_pool
+
+# HTTP status codes worth retrying (timeouts, rate limits, server errors)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+def _backend_error(error: Exception) -> BackendError:
+    """Translate SDK and transport errors into BackendError"""
+    if isinstance(error, errors.APIError):
+        return BackendError(str(error), retryable=error.code in RETRYABLE_STATUS_CODES)
+    return BackendError(str(error), retryable=isinstance(error, httpx.TransportError))
+
+class GeminiBackend(ModelBackend):
+    """Model backend for the Google Gemini API"""
+
+    name = "gemini"
+
+    def __init__(self):
+        """Initialize Gemini backend with the pooled client"""
+        self.client = client_pool.get_client()
+
+    def _config(self, system_instruction: str, temperature: float, top_p: float):
+        """Build the generation config"""
+        return genai.types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            temperature=temperature,
+            top_p=top_p,
+        )
+
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> str:
+        """Generate a complete response"""
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=contents,
+                config=self._config(system_instruction, temperature, top_p)
+            )
+        except (errors.APIError, httpx.HTTPError) as e:
+            raise _backend_error(e) from e
+        return response.text
+
+    async def stream(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        top_p: float
+    ) -> AsyncIterator[str]:
+        """Stream response chunks as they arrive"""
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=self._config(system_instruction, temperature, top_p)
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        except (errors.APIError, httpx.HTTPError) as e:
+            raise _backend_error(e) from e
+
+    def preconnect(self) -> None:
+        """Warm up pooled connections in the background"""
+        client_pool.preconnect()
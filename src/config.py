@@ -15,14 +15,98 @@ class Config:
     GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
     GEMINI_MODEL = "models/gemini-flash-latest"
     
+    # Model Backend: "gemini" (production), "fake" (offline load testing)
+    # or "cassette" (record/replay captured responses)
+    MODEL_BACKEND = os.getenv('MODEL_BACKEND', 'gemini').lower()
+    
+    # Fake Backend Settings
+    FAKE_LATENCY_MEAN = float(os.getenv('FAKE_LATENCY_MEAN', '0.5'))  # Seconds
+    FAKE_LATENCY_P99 = float(os.getenv('FAKE_LATENCY_P99', '2.0'))  # Seconds
+    FAKE_ERROR_RATE = float(os.getenv('FAKE_ERROR_RATE', '0.0'))  # 0-1
+    FAKE_SEED = int(os.getenv('FAKE_SEED')) if os.getenv('FAKE_SEED') else None
+    
+    # Cassette Backend Settings
+    CASSETTE_PATH = os.getenv('CASSETTE_PATH', 'data/cassettes/default.jsonl')
+    CASSETTE_MODE = os.getenv('CASSETTE_MODE', 'replay').lower()  # replay or record
+    CASSETTE_RECORD_BACKEND = os.getenv('CASSETTE_RECORD_BACKEND', 'gemini').lower()
+    
+    # Client Pool Settings (shared by all agents)
+    CLIENT_MAX_CONNECTIONS = int(os.getenv('CLIENT_MAX_CONNECTIONS', '100'))
+    CLIENT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('CLIENT_MAX_KEEPALIVE_CONNECTIONS', '20'))
+    CLIENT_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept open
+    PRECONNECT_ON_STARTUP = os.getenv('PRECONNECT_ON_STARTUP', 'false').lower() == 'true'
+    
     # Agent Settings
     TEMPERATURE = 0.7
     TOP_P = 0.95
     MAX_TOKENS = 2048
+    STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', 'true').lower() == 'true'
+    
+    # Prompt Token Budgets (estimated input tokens per model call)
+    DEFAULT_TOKEN_BUDGET = 4000
+    TOKEN_BUDGETS = {
+        "Orchestrator": 4000,
+        "SymptomAnalyzer": 4000,
+        "MedicationManager": 4000,
+        "DoctorPrep": 8000  # Needs more history to summarize the visit
+    }
+    
+    # Resilience Settings
+    REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', '30'))  # Per user turn, in seconds
+    MAX_RETRIES = 2  # Retries for retryable errors
+    RETRY_BASE_DELAY = 0.5  # Seconds (full-jitter exponential backoff)
+    RETRY_MAX_DELAY = 4.0  # Seconds
+    HEDGING_ENABLED = os.getenv('HEDGING_ENABLED', 'false').lower() == 'true'
+    HEDGE_MIN_SAMPLES = 20  # Latency samples needed before hedging
+    HEDGE_MIN_DELAY = 0.5  # Seconds; hedge fires after max(p95 latency, this)
+    CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures before failing fast
+    CIRCUIT_RECOVERY_TIMEOUT = 30.0  # Seconds before a trial call
+    
+    # Response Cache Settings
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+    RESPONSE_CACHE_MAX_BYTES = 8 * 1024 * 1024  # 8 MB of cached response text
+    RESPONSE_CACHE_TTL = 6 * 60 * 60  # Seconds
+    RESPONSE_CACHE_DB_PATH = os.getenv('RESPONSE_CACHE_DB_PATH')  # Shared SQLite tier (disabled if unset)
+    
+    # Semantic Cache Settings (near-duplicate first-turn queries)
+    SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() == 'true'
+    SEMANTIC_CACHE_CAPACITY = 512
+    SEMANTIC_CACHE_THRESHOLDS = {  # Minimum cosine similarity of canonicalized queries per intent
+        "symptom": 0.7,  # Paraphrases score 1.0; an added duration, severity or negation 0.4-0.62
+        "medication": 0.7,
+        "doctor_prep": 0.6,
+        "general": 0.7
+    }
+    
+    # Intent Classifier (keyword routing is the fallback)
+    INTENT_CLASSIFIER_ENABLED = os.getenv('INTENT_CLASSIFIER_ENABLED', 'true').lower() == 'true'
+    INTENT_MODEL_PATH = os.getenv('INTENT_MODEL_PATH', 'data/models/intent_classifier.npz')
+    INTENT_CORPUS_PATH = "data/intent_corpus.jsonl"
+    INTENT_CALIBRATION_PATH = "data/intent_calibration.jsonl"
+    INTENT_MIN_CONFIDENCE = 0.4  # Below this (near-uniform over 4 intents) the keyword rules decide
+    
+    # Multi-Agent Fan-Out (mixed-intent messages go to several agents at once)
+    FAN_OUT_ENABLED = os.getenv('FAN_OUT_ENABLED', 'true').lower() == 'true'
+    FAN_OUT_MIN_SCORE = 2  # Keyword matches needed to add an extra intent
     
     # Memory Settings
     MAX_CONVERSATION_HISTORY = 20  # Maximum messages to keep in memory
+    COMPACTION_MODE = os.getenv('COMPACTION_MODE', 'extractive').lower()  # extractive or model
+    COMPACTION_IN_BACKGROUND = os.getenv('COMPACTION_IN_BACKGROUND', 'true').lower() == 'true'
+    COMPACTION_WORKERS = 2  # Threads shared by every session's background folds
+    CONVERSATION_SUMMARY_MAX_TOKENS = 400  # Rolling summary of evicted messages
     MEMORY_BANK_PATH = "data/memory_bank.json"
+    MEMORY_BACKEND = os.getenv('MEMORY_BACKEND', 'json').lower()  # json, sqlite, journal or sharded
+    MEMORY_DB_PATH = os.getenv('MEMORY_DB_PATH', 'data/memory_bank.db')  # SQLite memory store
+    MEMORY_JOURNAL_PATH = os.getenv('MEMORY_JOURNAL_PATH', 'data/memory_bank.journal')  # Snapshot is <path>.snapshot
+    MEMORY_JOURNAL_FSYNC = os.getenv('MEMORY_JOURNAL_FSYNC', 'always').lower()  # always, interval or never
+    MEMORY_JOURNAL_FSYNC_INTERVAL = float(os.getenv('MEMORY_JOURNAL_FSYNC_INTERVAL', '1.0'))  # Seconds (interval policy)
+    MEMORY_JOURNAL_COMPACT_BYTES = 1024 * 1024  # Journal size that triggers a compaction
+    MEMORY_JOURNAL_COMPACT_INTERVAL = 300.0  # Seconds after which a non-empty journal is compacted
+    MEMORY_SHARD_DIR = os.getenv('MEMORY_SHARD_DIR', 'data/memory_bank.shards')  # Sharded memory store
+    MEMORY_SHARD_COUNT = int(os.getenv('MEMORY_SHARD_COUNT', '256'))  # Fixed when the store is created
+    MEMORY_SHARD_CACHE_BYTES = int(os.getenv('MEMORY_SHARD_CACHE_BYTES', str(16 * 1024 * 1024)))  # Hot shard LRU cap
     
     # Tool Settings
     ENABLE_GOOGLE_SEARCH = False  # Set to True when implementing search
@@ -33,6 +117,34 @@ class Config:
     SYMPTOMS_DB = os.path.join(DATA_DIR, "symptoms.json")
     MEDICATIONS_DB = os.path.join(DATA_DIR, "medications.json")
     INTERACTIONS_DB = os.path.join(DATA_DIR, "interactions.json")
+    KB_PATH = os.getenv('KB_PATH', os.path.join(DATA_DIR, "medimind.kb"))  # Compiled knowledge base
+    KB_ENABLED = os.getenv('KB_ENABLED', 'true').lower() == 'true'  # Use it when present and up to date
+    KB_RELOAD_INTERVAL = float(os.getenv('KB_RELOAD_INTERVAL', '5'))  # Seconds between checks for changed files (0: reload on SIGHUP only)
+    INTERACTION_MIN_SEVERITY = os.getenv('INTERACTION_MIN_SEVERITY') or None  # e.g. moderate (default: report all)
+    
+    # Phrases marking medications the user no longer takes ("I stopped taking warfarin")
+    MEDICATION_STOP_KEYWORDS = [
+        "stopped", "stopping", "stop taking", "quit", "quitting", "no longer",
+        "discontinued", "not taking", "don't take", "gave up", "came off",
+        "went off", "i'm off"
+    ]
+    
+    # Routing keywords per specialist intent
+    INTENT_KEYWORDS = {
+        "symptom": [
+            "pain", "hurt", "ache", "feel", "sick", "symptom",
+            "headache", "fever", "tired", "fatigue", "dizzy", "nausea"
+        ],
+        "medication": [
+            "medication", "medicine", "drug", "pill", "prescription",
+            "aspirin", "ibuprofen", "acetaminophen", "take", "taking",
+            "dose", "dosage"
+        ],
+        "doctor_prep": [
+            "doctor", "appointment", "visit", "prepare", "summary",
+            "questions to ask", "see my doctor"
+        ]
+    }
     
     # Safety Settings
     EMERGENCY_KEYWORDS = [
@@ -44,6 +156,11 @@ class Config:
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-# Validate configuration
-if not Config.GOOGLE_API_KEY:
+# Validate configuration (only backends that call Gemini need an API key)
+_uses_gemini = Config.MODEL_BACKEND == "gemini" or (
+    Config.MODEL_BACKEND == "cassette" and
+    Config.CASSETTE_MODE == "record" and
+    Config.CASSETTE_RECORD_BACKEND == "gemini"
+)
+if _uses_gemini and not Config.GOOGLE_API_KEY:
     raise ValueError("GOOGLE_API_KEY not found in environment variables")
\ No newline at end of file
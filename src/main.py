@@ -6,12 +6,18 @@ Multi-Agent Implementation
 
 import sys
 import time  
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional
+from src.agents.base_agent import ChunkCallback
 from src.agents.orchestrator import OrchestratorAgent
 from src.memory.session_manager import SessionManager
 from src.memory.memory_bank import MemoryBank
+from src.utils.knowledge_service import get_knowledge_service
 from src.utils.logger import get_logger
 from src.utils.metrics import metrics_tracker 
+from src.utils.async_runner import run_sync
+from src.utils.resilience import Deadline
+from src.backends import get_backend
 from src.config import Config
 
 logger = get_logger(__name__)
@@ -23,7 +29,17 @@ class MediMindAI:
         """Initialize MediMind AI with all components"""
         logger.info("Initializing MediMind AI...")
         
-        # Initialize orchestrator (which initializes all sub-agents)
+        # Optionally warm up model API connections in the background
+        if Config.PRECONNECT_ON_STARTUP:
+            get_backend().preconnect()
+        
+        # Reload the knowledge base when its files change or on SIGHUP
+        knowledge = get_knowledge_service()
+        knowledge.install_reload_signal()
+        if Config.KB_RELOAD_INTERVAL > 0:
+            knowledge.watch(Config.KB_RELOAD_INTERVAL)
+        
+        # Initialize orchestrator (sub-agents are built on first use)
         self.orchestrator = OrchestratorAgent()
         
         # Initialize memory systems
@@ -32,6 +48,92 @@ class MediMindAI:
         
         logger.info("MediMind AI initialized successfully")
     
+    async def ahandle_message(
+        self,
+        user_input: str,
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Handle a single user turn through the async agent pipeline
+        
+        Args:
+            user_input: User's message
+            on_chunk: Optional callback receiving response chunks as they
+                are generated (enables streaming)
+            
+        Returns:
+            Result dict from the orchestrator
+        """
+        # Add user message to session
+        self.session_manager.add_message("user", user_input)
+        
+        # Get current context, with a deadline for the whole turn
+        context = self.session_manager.get_context()
+        context["deadline"] = Deadline(Config.REQUEST_TIMEOUT)
+        context["long_term_memory"] = self.memory_bank.get_memory_summary()
+
+        # Process through orchestrator with timing
+        start_time = time.time()
+        first_token_time = None
+        
+        def handle_chunk(text: str) -> None:
+            nonlocal first_token_time
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+            on_chunk(text)
+        
+        result = await self.orchestrator.aprocess(
+            user_input,
+            context,
+            handle_chunk if on_chunk is not None else None
+        )
+
+        # Track performance metrics
+        response_time = time.time() - start_time
+        agent_name = result.get("agent", "Unknown")
+
+        # Normalize agent name for metrics tracking
+        agent_key = agent_name.lower().replace(" ", "_")
+        if agent_key not in ["orchestrator", "symptom_analyzer", "medication_manager", "doctor_prep"]:
+            agent_key = "orchestrator"  # Default to orchestrator
+        metrics_tracker.track_request(agent_key, response_time, first_token_time)
+
+        # Track special events (emergencies are tracked by the orchestrator)
+        if result.get("interactions_found"):
+            metrics_tracker.track_interaction_check()
+
+        # Extract response
+        response = result.get("response", "I apologize, I couldn't process that.")
+        result["response"] = response
+                        
+        # Update context based on result
+        self._update_context(result)
+        
+        # Add assistant response to session
+        self.session_manager.add_message("model", response)
+        
+        # Log agent used
+        logger.info(f"Response generated by: {agent_name}")
+        
+        return result
+    
+    def handle_message(
+        self,
+        user_input: str,
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Handle a single user turn (sync wrapper around ahandle_message)
+        
+        Args:
+            user_input: User's message
+            on_chunk: Optional streaming chunk callback
+            
+        Returns:
+            Result dict from the orchestrator
+        """
+        return run_sync(self.ahandle_message(user_input, on_chunk))
+    
     def run(self):
         """Run the main conversation loop"""
         self._print_welcome()
@@ -49,48 +151,55 @@ class MediMindAI:
                 if not user_input:
                     continue
                 
-                # Add user message to session
-                self.session_manager.add_message("user", user_input)
+                if Config.STREAM_RESPONSES:
+                    print("\n🤖 MediMind: ", end="", flush=True)
+                    result = self.handle_message(user_input, self._print_chunk)
+                    print(f"\n   ({result.get('agent', 'Unknown')})")
+                else:
+                    result = self.handle_message(user_input)
+                    
+                    # Display response
+                    print(f"\n🤖 MediMind ({result.get('agent', 'Unknown')}): {result['response']}")
                 
-                # Get current context
-                context = self.session_manager.get_context()
-
-                # Process through orchestrator with timing
-                start_time = time.time()
-                result = self.orchestrator.process(user_input, context)
-
-                # Track performance metrics
-                response_time = time.time() - start_time
-                agent_name = result.get("agent", "Unknown")
-
-                # Normalize agent name for metrics tracking
-                agent_key = agent_name.lower().replace(" ", "_")
-                if agent_key not in ["orchestrator", "symptom_analyzer", "medication_manager", "doctor_prep"]:
-                    agent_key = "orchestrator"  # Default to orchestrator
-                metrics_tracker.track_request(agent_key, response_time)
-
-                # Track special events
-                if result.get("is_emergency"):
-                    metrics_tracker.track_emergency()
-                if result.get("interactions_found"):
-                    metrics_tracker.track_interaction_check()
-
-                # Extract response
-                response = result.get("response", "I apologize, I couldn't process that.")
-                                
-                # Update context based on result
-                self._update_context(result)
+            except KeyboardInterrupt:
+                print("\n\nInterrupted by user")
+                self._handle_exit()
+                break
+            except Exception as e:
+                metrics_tracker.track_error(str(e))
+                logger.error(f"Error in main loop: {str(e)}")
+                print(f"\n❌ An error occurred: {str(e)}")
+                print("Please try again or type 'quit' to exit.")
+    
+    async def arun(self):
+        """Run the main conversation loop on an asyncio event loop"""
+        self._print_welcome()
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            try:
+                # Read input off the event loop so other tasks keep running
+                user_input = (await loop.run_in_executor(None, input, "\n👤 You: ")).strip()
                 
-                # Add assistant response to session
-                self.session_manager.add_message("model", response)
+                # Check for exit commands
+                if user_input.lower() in ['quit', 'exit', 'bye']:
+                    self._handle_exit()
+                    break
                 
-                # Display response
-                print(f"\n🤖 MediMind ({agent_name}): {response}")
+                if not user_input:
+                    continue
                 
-                # Log agent used
-                logger.info(f"Response generated by: {agent_name}")
+                if Config.STREAM_RESPONSES:
+                    print("\n🤖 MediMind: ", end="", flush=True)
+                    result = await self.ahandle_message(user_input, self._print_chunk)
+                    print(f"\n   ({result.get('agent', 'Unknown')})")
+                else:
+                    result = await self.ahandle_message(user_input)
+                    
+                    # Display response
+                    print(f"\n🤖 MediMind ({result.get('agent', 'Unknown')}): {result['response']}")
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n\nInterrupted by user")
                 self._handle_exit()
                 break
@@ -100,15 +209,22 @@ class MediMindAI:
                 print(f"\n❌ An error occurred: {str(e)}")
                 print("Please try again or type 'quit' to exit.")
     
+    def _print_chunk(self, text: str) -> None:
+        """Render a streamed response chunk as soon as it arrives"""
+        print(text, end="", flush=True)
+    
     def _update_context(self, result: Dict):
         """Update session context based on agent result"""
         
-        # Add medications if found
+        # Add medications if found, drop the ones the user stopped taking
         for med in result.get("medications_mentioned", []):
             self.session_manager.add_medication(med)
+        for med in result.get("medications_stopped", []):
+            self.session_manager.remove_medication(med)
         
         # Add symptoms if discussed
-        # (Could extract from symptom agent response)
+        for symptom in result.get("symptoms_matched", []):
+            self.session_manager.add_symptom(symptom)
         
     def _print_welcome(self):
         """Print welcome message"""
@@ -128,6 +244,7 @@ class MediMindAI:
         # Save session to long-term memory
         session_data = self.session_manager.get_context()
         self.memory_bank.save_session(session_data)
+        self.memory_bank.store.close()
         
         print("✅ Session saved!")
 
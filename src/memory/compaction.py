@@ -0,0 +1,211 @@
+"""
+Context Compaction
+Folds messages evicted from the conversation window into a rolling summary
+"""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence
+from src.config import Config
+from src.utils.async_runner import run_sync
+from src.utils.logger import get_logger
+from src.utils.prompt_budget import estimate_tokens, message_text, summarize_messages
+
+logger = get_logger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+SUMMARY_INSTRUCTION = """You maintain a running summary of a health conversation.
+Merge the new messages into the existing summary. Keep symptoms (with onset,
+duration and severity), medications, conditions, allergies and any advice
+already given. Use short bullet points. Do not add information that was not
+in the conversation."""
+
+def _bound_lines(lines: List[str], max_tokens: int) -> List[str]:
+    """
+    Drop summary lines from the middle until the summary fits
+
+    The earliest lines (how the conversation started) and the latest
+    lines (what just happened) are the most useful, so they go last.
+    """
+    lines = list(lines)
+    while lines and sum(estimate_tokens(line) + 1 for line in lines) > max_tokens:
+        del lines[len(lines) // 2]
+    return lines
+
+def fold_extractive(summary: str, evicted: Sequence[Dict[str, Any]], max_tokens: int) -> str:
+    """
+    Fold evicted messages into the summary without a model call
+
+    Args:
+        summary: Current rolling summary
+        evicted: Messages leaving the conversation window (oldest first)
+        max_tokens: Token limit for the new summary
+
+    Returns:
+        Updated summary
+    """
+    lines = [line for line in summary.splitlines() if line.strip()]
+    for line in summarize_messages(evicted, max_tokens).splitlines():
+        if line not in lines:
+            lines.append(line)
+    return "\n".join(_bound_lines(lines, max_tokens))
+
+def fold_with_model(summary: str, evicted: Sequence[Dict[str, Any]], max_tokens: int) -> str:
+    """
+    Fold evicted messages into the summary with the model backend
+
+    Must not be called from the async runner thread. Falls back to the
+    extractive fold if the model call fails.
+
+    Args:
+        summary: Current rolling summary
+        evicted: Messages leaving the conversation window (oldest first)
+        max_tokens: Token limit for the new summary
+
+    Returns:
+        Updated summary
+    """
+    from src.backends import get_backend
+
+    transcript = "\n".join(f"{m.get('role', 'user')}: {message_text(m)}" for m in evicted)
+    prompt = (
+        f"Existing summary:\n{summary or '(none)'}\n\n"
+        f"New messages:\n{transcript}\n\n"
+        f"Write the updated summary in at most {max_tokens} tokens."
+    )
+    contents = [{"role": "user", "parts": [{"text": prompt}]}]
+
+    try:
+        updated = run_sync(asyncio.wait_for(
+            get_backend().generate(Config.GEMINI_MODEL, SUMMARY_INSTRUCTION, contents, 0.2, Config.TOP_P),
+            Config.REQUEST_TIMEOUT
+        ))
+    except Exception as e:
+        logger.warning(f"Model summary failed, using extractive fold: {str(e)}")
+        return fold_extractive(summary, evicted, max_tokens)
+
+    lines = [line for line in updated.strip().splitlines() if line.strip()]
+    return "\n".join(_bound_lines(lines, max_tokens))
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Worker pool shared by every session's compactor, created on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.COMPACTION_WORKERS,
+                    thread_name_prefix="medimind-compaction"
+                )
+    return _executor
+
+class HistoryCompactor:
+    """
+    Maintains the rolling summary for one session
+
+    Folds run one at a time, in eviction order, on a worker pool shared
+    by all sessions (or inline when background compaction is disabled):
+    a session has at most one drain task queued, which works through its
+    evictions in order, so sessions hold no threads of their own. Model
+    mode always runs in the background, since the request path may be
+    on the event loop the model call needs.
+    """
+
+    def __init__(self, mode: Optional[str] = None, background: Optional[bool] = None,
+                 max_tokens: Optional[int] = None):
+        """
+        Initialize compactor
+
+        Args:
+            mode: "extractive" or "model" (defaults to Config.COMPACTION_MODE)
+            background: Fold off the request path (defaults to Config.COMPACTION_IN_BACKGROUND)
+            max_tokens: Summary token limit (defaults to Config.CONVERSATION_SUMMARY_MAX_TOKENS)
+        """
+        self.mode = mode or Config.COMPACTION_MODE
+        if self.mode not in ("extractive", "model"):
+            raise ValueError(f"Unknown compaction mode: {self.mode}")
+
+        self.background = Config.COMPACTION_IN_BACKGROUND if background is None else background
+        if self.mode == "model":
+            self.background = True
+        self.max_tokens = max_tokens or Config.CONVERSATION_SUMMARY_MAX_TOKENS
+
+        self.summary = ""
+        self._lock = threading.Lock()
+        self._queue: deque = deque()  # Evictions waiting to be folded, oldest first
+        self._draining = False
+        self._pending: Optional[Future] = None  # Latest drain task
+
+    def _fold(self, evicted: Sequence[Dict[str, Any]]) -> None:
+        """Fold evicted messages into the summary"""
+        with self._lock:
+            current = self.summary
+
+        if self.mode == "model":
+            updated = fold_with_model(current, evicted, self.max_tokens)
+        else:
+            updated = fold_extractive(current, evicted, self.max_tokens)
+
+        with self._lock:
+            self.summary = updated
+        logger.info(f"Folded {len(evicted)} messages into summary (~{estimate_tokens(updated)} tokens)")
+
+    def submit(self, evicted: Sequence[Dict[str, Any]]) -> None:
+        """
+        Schedule evicted messages to be folded into the summary
+
+        The messages are queued as given, without a copy: the
+        HistoryView a trim returns stays valid however the history
+        grows or is trimmed afterwards.
+
+        Args:
+            evicted: Messages leaving the conversation window (oldest first)
+        """
+        if not evicted:
+            return
+
+        if not self.background:
+            self._fold(evicted)
+            return
+
+        with self._lock:
+            self._queue.append(evicted)
+            if not self._draining:
+                self._draining = True
+                self._pending = _get_executor().submit(self._drain)
+
+    def _drain(self) -> None:
+        """Fold queued evictions in order until none are left"""
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._draining = False
+                    return
+                evicted = self._queue.popleft()
+
+            try:
+                self._fold(evicted)
+            except Exception as e:
+                logger.error(f"Summary fold failed, dropping {len(evicted)} messages from it: {str(e)}")
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for scheduled folds to finish"""
+        with self._lock:
+            pending = self._pending
+        if pending is not None:
+            pending.result(timeout)
+
+    def get_summary(self) -> str:
+        """Current rolling summary (may lag behind a running fold)"""
+        with self._lock:
+            return self.summary
+
+    def reset(self) -> None:
+        """Drop the summary, waiting for any running fold first"""
+        self.wait()
+        with self._lock:
+            self.summary = ""
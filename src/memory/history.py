@@ -0,0 +1,122 @@
+"""
+Conversation History
+Append-only message history with O(1) read-only snapshots
+"""
+
+import threading
+from collections.abc import Sequence
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+class HistoryView(Sequence):
+    """
+    Read-only view over a range of a history buffer
+
+    Views never copy messages. They stay valid forever because the
+    buffer they point at is only ever appended to past their end.
+    Slicing a view returns another view.
+    """
+
+    __slots__ = ("_buffer", "_start", "_end")
+
+    def __init__(self, buffer: List[Dict[str, Any]], start: int, end: int):
+        """
+        Initialize view
+
+        Args:
+            buffer: Shared append-only message buffer
+            start: Index of the first message in the view
+            end: Index one past the last message in the view
+        """
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self._buffer[self._start + i] for i in range(start, stop, step)]
+            return HistoryView(self._buffer, self._start + start, self._start + max(start, stop))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._buffer[self._start + index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self._start, self._end):
+            yield self._buffer[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self)!r})"
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Copy the viewed messages into a new list"""
+        return self._buffer[self._start:self._end]
+
+class ConversationHistory:
+    """
+    Append-only conversation history
+
+    Messages are appended to a shared buffer and trimmed by moving a
+    start offset, so snapshots and evictions are O(1) views rather than
+    copies. Once most of the buffer has been trimmed, the live messages
+    are moved to a fresh buffer; existing views keep the old one.
+    """
+
+    def __init__(self, messages: Optional[Iterable[Dict[str, Any]]] = None, rebase_threshold: int = 64):
+        """
+        Initialize history
+
+        Args:
+            messages: Optional initial messages (oldest first)
+            rebase_threshold: Trimmed messages to accumulate before the
+                buffer is reclaimed
+        """
+        self._buffer: List[Dict[str, Any]] = list(messages or [])
+        self._start = 0
+        self.rebase_threshold = rebase_threshold
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buffer) - self._start
+
+    def append(self, message: Dict[str, Any]) -> None:
+        """Append a message"""
+        with self._lock:
+            self._buffer.append(message)
+
+    def snapshot(self) -> HistoryView:
+        """O(1) read-only view of the current messages"""
+        with self._lock:
+            return HistoryView(self._buffer, self._start, len(self._buffer))
+
+    def trim(self, keep: int) -> HistoryView:
+        """
+        Drop all but the most recent messages
+
+        Args:
+            keep: Number of recent messages to keep
+
+        Returns:
+            Read-only view of the evicted messages (oldest first)
+        """
+        with self._lock:
+            end = max(self._start, len(self._buffer) - keep)
+            evicted = HistoryView(self._buffer, self._start, end)
+            self._start = end
+
+            if self._start >= self.rebase_threshold and self._start * 2 >= len(self._buffer):
+                self._buffer = self._buffer[self._start:]
+                self._start = 0
+
+            return evicted
@@ -3,9 +3,10 @@ Memory Bank
 Long-term memory storage for patient history across sessions
 """
 
-from typing import Dict, Any, List
-from src.utils.helpers import load_json, save_json, get_timestamp
-from src.config import Config
+import threading
+from typing import Dict, Any, List, Optional
+from src.memory.storage import MemoryStore, apply_update, empty_memory, get_memory_store
+from src.utils.helpers import get_timestamp
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,32 +20,32 @@ class MemoryBank:
     - Chronic conditions
     - Medication history
     - Symptom patterns
+    
+    Only the current user's memory is loaded; saving a session sends
+    the store just what the session added (see MemoryStore). Saves from
+    several threads are serialized; stores merge saves from several
+    processes.
     """
     
-    def __init__(self, user_id: str = "default_user"):
+    def __init__(self, user_id: str = "default_user", store: Optional[MemoryStore] = None):
         """
         Initialize memory bank
         
         Args:
             user_id: Unique user identifier
+            store: Memory store (default: the configured store)
         """
         self.user_id = user_id
-        self.memory_file = Config.MEMORY_BANK_PATH
-        self.memory = self._load_memory()
+        self.store = store or get_memory_store()
+        self._lock = threading.Lock()
+        self.user_memory = self._load_memory()
         logger.info(f"Memory Bank initialized for user: {user_id}")
     
     def _load_memory(self) -> Dict[str, Any]:
-        """Load memory from file"""
-        memory = load_json(self.memory_file)
-        
-        if self.user_id not in memory:
-            memory[self.user_id] = {
-                "medications": [],
-                "chronic_conditions": [],
-                "symptom_history": [],
-                "doctor_visits": [],
-                "created_at": get_timestamp()
-            }
+        """Load the user's memory from the store"""
+        memory = self.store.load_user(self.user_id)
+        if memory is None:
+            memory = empty_memory(get_timestamp())
         
         return memory
     
@@ -55,35 +56,66 @@ class MemoryBank:
         Args:
             session_data: Session data to save
         """
-        user_memory = self.memory[self.user_id]
-        
         # Add timestamp
-        session_data["timestamp"] = get_timestamp()
-        
-        # Update medications
-        for med in session_data.get("user_medications", []):
-            if med not in user_memory["medications"]:
-                user_memory["medications"].append(med)
+        timestamp = get_timestamp()
+        session_data["timestamp"] = timestamp
         
-        # Add symptoms to history
-        for symptom in session_data.get("symptoms_discussed", []):
-            user_memory["symptom_history"].append({
-                "symptom": symptom,
-                "timestamp": get_timestamp()
-            })
-        
-        # Save to file
-        save_json(self.memory, self.memory_file)
+        with self._lock:
+            update = self._session_update(session_data, timestamp)
+            apply_update(self.user_memory, update)
+            
+            # Save to the store
+            self.store.append(self.user_id, update)
         logger.info("Session saved to memory bank")
     
+    def _session_update(self, session_data: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        """What a session adds to the user's memory"""
+        return {
+            # New medications
+            "medications": [
+                med for med in session_data.get("user_medications", [])
+                if med not in self.user_memory["medications"]
+            ],
+            # Symptoms for the history
+            "symptom_history": [
+                {"symptom": symptom, "timestamp": timestamp}
+                for symptom in session_data.get("symptoms_discussed", [])
+            ],
+            "created_at": self.user_memory.get("created_at")
+        }
+    
     def get_user_history(self) -> Dict[str, Any]:
         """Get user's complete history"""
-        return self.memory.get(self.user_id, {})
+        return self.user_memory
     
     def get_medications(self) -> List[str]:
         """Get user's medication list"""
-        return self.memory.get(self.user_id, {}).get("medications", [])
+        return self.user_memory.get("medications", [])
     
     def get_symptom_patterns(self) -> List[Dict[str, Any]]:
         """Get historical symptom patterns"""
-        return self.memory.get(self.user_id, {}).get("symptom_history", [])
\ No newline at end of file
+        return self.user_memory.get("symptom_history", [])
+    
+    def get_memory_summary(self, max_symptoms: int = 5) -> str:
+        """
+        Get a compact text summary of the user's history for prompts
+        
+        Args:
+            max_symptoms: Number of most recent symptoms to include
+            
+        Returns:
+            Summary text (empty if nothing is known about the user)
+        """
+        user_memory = self.get_user_history()
+        lines = []
+        
+        if user_memory.get("medications"):
+            lines.append(f"Medications: {', '.join(user_memory['medications'])}")
+        if user_memory.get("chronic_conditions"):
+            lines.append(f"Chronic conditions: {', '.join(user_memory['chronic_conditions'])}")
+        
+        recent = [entry["symptom"] for entry in user_memory.get("symptom_history", [])[-max_symptoms:]]
+        if recent:
+            lines.append(f"Recent symptoms: {', '.join(recent)}")
+        
+        return "\n".join(lines)
@@ -3,9 +3,12 @@ Session Manager
 Handles conversation sessions and short-term memory
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 from src.utils.logger import get_logger
 from src.config import Config
+from src.memory.compaction import HistoryCompactor
+from src.memory.history import ConversationHistory, HistoryView
+from src.utils.interactions import InteractionState
 
 logger = get_logger(__name__)
 
@@ -23,12 +26,14 @@ class SessionManager:
     def __init__(self):
         """Initialize session manager"""
         self.current_session = {
-            "conversation_history": [],
+            "conversation_history": ConversationHistory(),
             "user_medications": [],
+            "interaction_state": InteractionState(),
             "symptoms_discussed": [],
             "health_concerns": [],
             "session_metadata": {}
         }
+        self.compactor = HistoryCompactor()
         logger.info("Session Manager initialized")
     
     def add_message(self, role: str, content: str) -> None:
@@ -44,10 +49,11 @@ class SessionManager:
             "parts": [{"text": content}]
         }
         
-        self.current_session["conversation_history"].append(message)
+        history = self.current_session["conversation_history"]
+        history.append(message)
         
         # Trim history if too long
-        if len(self.current_session["conversation_history"]) > Config.MAX_CONVERSATION_HISTORY:
+        if len(history) > Config.MAX_CONVERSATION_HISTORY:
             self._compact_history()
         
         logger.debug(f"Added {role} message to history")
@@ -57,6 +63,17 @@ class SessionManager:
         if medication not in self.current_session["user_medications"]:
             self.current_session["user_medications"].append(medication)
             logger.info(f"Added medication: {medication}")
+        
+        # Only checks the new drug against the known ones (no-op if known)
+        self.current_session["interaction_state"].add([medication])
+    
+    def remove_medication(self, medication: str) -> None:
+        """Remove medication the user no longer takes"""
+        if medication in self.current_session["user_medications"]:
+            self.current_session["user_medications"].remove(medication)
+            logger.info(f"Removed medication: {medication}")
+        
+        self.current_session["interaction_state"].remove([medication])
     
     def add_symptom(self, symptom: str) -> None:
         """Add symptom to discussed symptoms"""
@@ -65,34 +82,49 @@ class SessionManager:
             logger.info(f"Added symptom: {symptom}")
     
     def get_context(self) -> Dict[str, Any]:
-        """Get current session context"""
-        return self.current_session.copy()
+        """
+        Get current session context, including the rolling summary
+        
+        The conversation history is an O(1) read-only snapshot, so
+        agents can never modify the session's own history.
+        """
+        context = self.current_session.copy()
+        context["conversation_history"] = self.current_session["conversation_history"].snapshot()
+        context["conversation_summary"] = self.compactor.get_summary()
+        return context
     
-    def get_conversation_history(self) -> List[Dict[str, Any]]:
-        """Get conversation history"""
-        return self.current_session["conversation_history"]
+    def get_conversation_history(self) -> HistoryView:
+        """Get a read-only snapshot of the conversation history"""
+        return self.current_session["conversation_history"].snapshot()
     
     def _compact_history(self) -> None:
         """
         Compact conversation history using context compaction
-        Keep only recent messages
-        """
-        history = self.current_session["conversation_history"]
         
+        Keeps a recent window of messages; the evicted ones are folded
+        into the rolling summary (in the background by default).
+        """
         # Keep last N messages
         keep_count = Config.MAX_CONVERSATION_HISTORY - 5
         
-        self.current_session["conversation_history"] = history[-keep_count:]
+        evicted = self.current_session["conversation_history"].trim(keep_count)
+        self.compactor.submit(evicted)
         
-        logger.info(f"Compacted history to {keep_count} messages")
+        logger.info(f"Compacted history to {keep_count} messages, summarizing {len(evicted)}")
+    
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Wait until pending summary updates have finished"""
+        self.compactor.wait(timeout)
     
     def clear_session(self) -> None:
         """Clear current session"""
         self.current_session = {
-            "conversation_history": [],
+            "conversation_history": ConversationHistory(),
             "user_medications": [],
+            "interaction_state": InteractionState(),
             "symptoms_discussed": [],
             "health_concerns": [],
             "session_metadata": {}
         }
+        self.compactor.reset()
         logger.info("Session cleared")
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Long-term memory stores for MediMind AI"""
+
+import os
+import threading
+from typing import Optional
+from src.memory.storage.base import MemoryStore, apply_update, empty_memory
+from src.config import Config
+
+_store: Optional[MemoryStore] = None
+_store_lock = threading.Lock()
+
+def create_memory_store(name: Optional[str] = None, path: Optional[str] = None) -> MemoryStore:
+    """
+    Create a memory store from Config settings
+
+    Args:
+        name: Store name ("json", "sqlite", "journal" or "sharded"); defaults to Config.MEMORY_BACKEND
+        path: Storage path; defaults to the configured path of that store
+
+    Returns:
+        New store instance
+    """
+    name = (name or Config.MEMORY_BACKEND).lower()
+
+    if name == "json":
+        from src.memory.storage.json_store import JSONMemoryStore
+        return JSONMemoryStore(path or Config.MEMORY_BANK_PATH)
+
+    if name == "sqlite":
+        from src.memory.storage.sqlite_store import SQLiteMemoryStore
+        return SQLiteMemoryStore(path or Config.MEMORY_DB_PATH)
+
+    if name == "journal":
+        from src.memory.storage.journal_store import JournalMemoryStore
+        return JournalMemoryStore(
+            path or Config.MEMORY_JOURNAL_PATH,
+            fsync=Config.MEMORY_JOURNAL_FSYNC,
+            fsync_interval=Config.MEMORY_JOURNAL_FSYNC_INTERVAL,
+            compact_bytes=Config.MEMORY_JOURNAL_COMPACT_BYTES,
+            compact_interval=Config.MEMORY_JOURNAL_COMPACT_INTERVAL
+        )
+
+    if name == "sharded":
+        from src.memory.storage.sharded_store import ShardedMemoryStore
+        return ShardedMemoryStore(
+            path or Config.MEMORY_SHARD_DIR,
+            shards=Config.MEMORY_SHARD_COUNT,
+            cache_bytes=Config.MEMORY_SHARD_CACHE_BYTES
+        )
+
+    raise ValueError(f"Unknown memory backend: {name}")
+
+def open_memory_store(path: str) -> MemoryStore:
+    """
+    Open a store by path, choosing the backend from the file extension
+
+    Args:
+        path: .db/.sqlite database, .journal memory journal, .shards
+            (or existing) directory of shards, else a JSON memory bank
+
+    Returns:
+        New store instance
+    """
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return create_memory_store("sqlite", path)
+    if path.endswith(".journal"):
+        return create_memory_store("journal", path)
+    if path.endswith(".shards") or os.path.isdir(path):
+        return create_memory_store("sharded", path)
+    return create_memory_store("json", path)
+
+def get_memory_store() -> MemoryStore:
+    """Get the process-wide memory store, creating it on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_memory_store()
+    return _store
+
+def set_memory_store(store: Optional[MemoryStore]) -> None:
+    """Replace the process-wide store (None resets to Config default)"""
+    global _store
+    with _store_lock:
+        _store = store
+
+__all__ = [
+    "MemoryStore", "apply_update", "empty_memory",
+    "create_memory_store", "open_memory_store", "get_memory_store", "set_memory_store"
+]
@@ -0,0 +1,99 @@
+"""
+Memory Store interface for MediMind AI
+Abstracts where MemoryBank keeps each user's long-term memory
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Fields of a user's memory: sets of names, and append-only histories
+SET_FIELDS = ("medications", "chronic_conditions")
+HISTORY_FIELDS = ("symptom_history", "doctor_visits")
+
+def empty_memory(created_at: Optional[str] = None) -> Dict[str, Any]:
+    """Memory of a user nothing is known about yet"""
+    memory: Dict[str, Any] = {field: [] for field in SET_FIELDS + HISTORY_FIELDS}
+    if created_at is not None:
+        memory["created_at"] = created_at
+    return memory
+
+def apply_update(memory: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a memory update in place
+
+    Updates only ever add: names are added to medications and
+    chronic_conditions unless already there, entries are appended to
+    symptom_history and doctor_visits, and created_at is kept from the
+    first update. Applying updates in any order therefore never loses
+    one (a full memory is itself a valid update).
+
+    Args:
+        memory: User memory to update
+        update: Fields to add
+
+    Returns:
+        The updated memory
+    """
+    for field in SET_FIELDS:
+        values = memory.setdefault(field, [])
+        for value in update.get(field, []):
+            if value not in values:
+                values.append(value)
+    for field in HISTORY_FIELDS:
+        memory.setdefault(field, []).extend(update.get(field, []))
+    if "created_at" not in memory and update.get("created_at") is not None:
+        memory["created_at"] = update["created_at"]
+    return memory
+
+class MemoryStore(ABC):
+    """
+    Abstract base class for long-term memory storage
+
+    A store keeps one memory per user (see empty_memory for its fields)
+    and is written through additive updates (see apply_update), so
+    backends can append instead of rewriting what they already hold.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load one user's memory
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            The user's memory, or None for an unknown user
+        """
+        pass
+
+    @abstractmethod
+    def append(self, user_id: str, update: Dict[str, Any]) -> None:
+        """
+        Add to one user's memory (creating it if needed)
+
+        Args:
+            user_id: User identifier
+            update: Fields to add (see apply_update)
+        """
+        pass
+
+    @abstractmethod
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream every user's memory
+
+        Yields:
+            (user_id, memory) pairs
+        """
+        pass
+
+    def user_ids(self) -> List[str]:
+        """Identifiers of every stored user"""
+        return [user_id for user_id, _ in self.iter_users()]
+
+    def close(self) -> None:
+        """Release resources held by the store"""
+        pass
@@ -0,0 +1,256 @@
+"""
+Journal Memory Store for MediMind AI
+Append-only write-ahead journal folded into a snapshot in the background
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from src.memory.storage.base import MemoryStore, apply_update, empty_memory
+from src.utils.helpers import ensure_directory, file_lock
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+class JournalMemoryStore(MemoryStore):
+    """
+    Journaled single-process store (a second process opening the same
+    journal gets a RuntimeError; share memory across worker processes
+    through the sqlite or sharded stores)
+
+    Each update is appended to a JSONL journal as one compact record
+    ({"seq", "user_id", "update"}), so a save costs the same however
+    much history is stored, and a crash can only lose the record being
+    written, never corrupt earlier ones. A background thread folds the
+    journal into a snapshot ({"seq", "users"}, replaced atomically) once
+    it grows past compact_bytes or every compact_interval seconds, then
+    drops the records the snapshot covers. Startup loads the snapshot
+    and replays the journal records newer than it.
+
+    fsync policy:
+        always   - every save is on disk before it returns
+        interval - saves are flushed to the OS; the background thread
+                   fsyncs every fsync_interval seconds
+        never    - the OS decides when data reaches the disk
+    """
+
+    name = "journal"
+
+    def __init__(
+        self,
+        journal_path: str,
+        fsync: str = "always",
+        fsync_interval: float = 1.0,
+        compact_bytes: int = 1024 * 1024,
+        compact_interval: float = 300.0,
+        background: bool = True
+    ):
+        """
+        Initialize store, rebuilding its state from disk
+
+        Args:
+            journal_path: Journal file (the snapshot is journal_path + ".snapshot")
+            fsync: fsync policy ("always", "interval" or "never")
+            fsync_interval: Seconds between fsyncs with the interval policy
+            compact_bytes: Journal size that triggers a compaction
+            compact_interval: Seconds after which a non-empty journal is compacted
+            background: Run fsyncs and compactions in a daemon thread
+                (otherwise call compact() yourself)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self.journal_path = journal_path
+        self.snapshot_path = f"{journal_path}.snapshot"
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_bytes = compact_bytes
+        self.compact_interval = compact_interval
+
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._dirty = False
+        self._last_compaction = time.monotonic()
+
+        if os.path.dirname(journal_path):
+            ensure_directory(os.path.dirname(journal_path))
+        self._exit = ExitStack()
+        try:
+            self._exit.enter_context(file_lock(journal_path, blocking=False))
+        except BlockingIOError:
+            raise RuntimeError(f"Memory journal {journal_path} is open in another process") from None
+        self._recover()
+        self._journal = open(journal_path, 'a', encoding='utf-8')
+        self._journal_bytes = os.path.getsize(journal_path)
+
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="medimind-memory-journal", daemon=True)
+            self._thread.start()
+
+    def _recover(self) -> None:
+        """Load the snapshot and replay the journal records newer than it"""
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._users = snapshot["users"]
+            self._seq = snapshot["seq"]
+
+        if not os.path.exists(self.journal_path):
+            return
+
+        replayed = 0
+        valid_bytes = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn last record (crash mid-write)
+                if not line.endswith(b"\n"):
+                    break
+                valid_bytes += len(line)
+                if record["seq"] > self._seq:
+                    apply_update(self._users.setdefault(record["user_id"], empty_memory()), record["update"])
+                    self._seq = record["seq"]
+                    replayed += 1
+
+        # Drop a torn tail, so the next record starts on its own line
+        if valid_bytes < os.path.getsize(self.journal_path):
+            logger.warning(f"Discarding a torn record at the end of {self.journal_path}")
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+        logger.info(f"Memory journal recovered: {len(self._users)} users, {replayed} records replayed")
+
+    def load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Load one user's memory (a copy; change it through append)"""
+        with self._lock:
+            return copy.deepcopy(self._users.get(user_id))
+
+    def append(self, user_id: str, update: Dict[str, Any]) -> None:
+        """Journal an update, then apply it"""
+        with self._lock:
+            self._seq += 1
+            line = json.dumps(
+                {"seq": self._seq, "user_id": user_id, "update": update},
+                ensure_ascii=False,
+                separators=(",", ":")
+            ) + "\n"
+            self._journal.write(line)
+            self._journal.flush()
+            if self.fsync == "always":
+                os.fsync(self._journal.fileno())
+            else:
+                self._dirty = True
+            self._journal_bytes += len(line.encode("utf-8"))
+
+            apply_update(self._users.setdefault(user_id, empty_memory()), update)
+            if self._journal_bytes >= self.compact_bytes:
+                self._wake.set()
+
+    def user_ids(self) -> List[str]:
+        """Identifiers of every stored user"""
+        with self._lock:
+            return sorted(self._users)
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream every user's memory, copying one user at a time"""
+        for user_id in self.user_ids():
+            memory = self.load_user(user_id)
+            if memory is not None:
+                yield user_id, memory
+
+    def sync(self) -> None:
+        """fsync journal records written so far"""
+        with self._lock:
+            if self._dirty:
+                os.fsync(self._journal.fileno())
+                self._dirty = False
+
+    def compact(self) -> bool:
+        """
+        Fold the journal into the snapshot
+
+        Returns:
+            True if there was anything to compact
+        """
+        with self._compact_lock:
+            # State and journal position are taken together; saves only
+            # wait for the serialization, not for the disk writes
+            with self._lock:
+                if not self._journal_bytes:
+                    return False
+                seq = self._seq
+                covered_bytes = self._journal_bytes
+                document = json.dumps({"seq": seq, "users": self._users}, ensure_ascii=False, separators=(",", ":"))
+
+            temporary = f"{self.snapshot_path}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(document)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.snapshot_path)
+
+            # The snapshot covers every record up to seq; keep only the
+            # ones written while it was being saved
+            with self._lock:
+                self._journal.flush()
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(covered_bytes)
+                    tail = f.read()
+                temporary = f"{self.journal_path}.tmp"
+                with open(temporary, 'wb') as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal.close()
+                os.replace(temporary, self.journal_path)
+                self._journal = open(self.journal_path, 'a', encoding='utf-8')
+                self._journal_bytes = len(tail)
+                self._dirty = False
+                self._last_compaction = time.monotonic()
+
+        logger.info(f"Memory journal compacted into {self.snapshot_path} (seq {seq})")
+        return True
+
+    def _run(self) -> None:
+        """Background fsyncs and compactions"""
+        timeout = min(self.fsync_interval, self.compact_interval) if self.fsync == "interval" else self.compact_interval
+        while not self._closed.is_set():
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._closed.is_set():
+                break
+            try:
+                if self.fsync == "interval":
+                    self.sync()
+                if self._journal_bytes >= self.compact_bytes or \
+                        time.monotonic() - self._last_compaction >= self.compact_interval:
+                    self.compact()
+            except OSError as e:
+                logger.error(f"Memory journal maintenance failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background thread and make every record durable"""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if not self._journal.closed:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+                self._journal.close()
+            self._exit.close()
@@ -0,0 +1,72 @@
+"""
+JSON Memory Store for MediMind AI
+Every user's memory in one JSON document (the original memory bank format)
+"""
+
+import copy
+import threading
+from typing import Dict, Any, Iterator, Optional, Tuple
+from src.memory.storage.base import MemoryStore, apply_update, empty_memory
+from src.utils.helpers import file_lock, file_signature, load_json, save_json
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class JSONMemoryStore(MemoryStore):
+    """
+    Single-file store
+
+    The whole document is read on first use and rewritten on every
+    update, so costs grow with the total number of users; suited to
+    single-user installs and as the format other stores migrate from.
+
+    Several threads and processes may share the file: an update takes
+    an advisory lock on it, rereads the document if another writer
+    changed it since it was read, applies the update on top (updates
+    only add, so nothing is lost) and replaces the file atomically.
+    """
+
+    name = "json"
+
+    def __init__(self, path: str):
+        """
+        Initialize store
+
+        Args:
+            path: JSON file mapping user_id -> memory
+        """
+        self.path = path
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _document(self) -> Dict[str, Dict[str, Any]]:
+        """The whole document (reread whenever the file has changed)"""
+        signature = file_signature(self.path)
+        if self._data is None or signature != self._signature:
+            self._data = load_json(self.path)
+            self._signature = signature
+        return self._data
+
+    def load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Load one user's memory (a copy; change it through append)"""
+        with self._lock:
+            return copy.deepcopy(self._document().get(user_id))
+
+    def append(self, user_id: str, update: Dict[str, Any]) -> None:
+        """Add to one user's memory and rewrite the file"""
+        with self._lock, file_lock(self.path):
+            document = self._document()
+            apply_update(document.setdefault(user_id, empty_memory()), update)
+            try:
+                save_json(document, self.path)
+            except OSError:
+                self._data = None  # Reread rather than keep an unsaved update
+                raise
+            self._signature = file_signature(self.path)
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream every user's memory"""
+        with self._lock:
+            users = copy.deepcopy(list(self._document().items()))
+        return iter(users)
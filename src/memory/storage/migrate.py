@@ -0,0 +1,66 @@
+"""
+Memory Store Migration for MediMind AI
+Copies every user from one memory store into another
+
+Migrate the JSON memory bank into SQLite:
+    python -m src.memory.storage.migrate [source] [target]
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict
+from src.config import Config
+from src.memory.storage import MemoryStore, open_memory_store
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def migrate(source: MemoryStore, target: MemoryStore, overwrite: bool = False) -> Dict[str, int]:
+    """
+    Copy users from one store to another, one user at a time
+
+    Args:
+        source: Store to read
+        target: Store to write
+        overwrite: Also copy users the target already has (their
+            histories are appended again); by default they are skipped,
+            so an interrupted migration can simply be rerun
+
+    Returns:
+        Number of users migrated and skipped
+    """
+    counts = {"migrated": 0, "skipped": 0}
+    existing = set(target.user_ids())
+
+    for user_id, memory in source.iter_users():
+        if user_id in existing and not overwrite:
+            counts["skipped"] += 1
+            continue
+        target.append(user_id, memory)  # A full memory is a valid update
+        counts["migrated"] += 1
+
+    logger.info(f"Migrated {counts['migrated']} users ({counts['skipped']} already present)")
+    return counts
+
+def main():
+    """Migrate between the stores given on the command line"""
+    parser = argparse.ArgumentParser(description="Copy the memory bank into another store")
+    parser.add_argument("source", nargs="?", default=Config.MEMORY_BANK_PATH,
+                        help="store to read (default: the JSON memory bank)")
+    parser.add_argument("target", nargs="?", default=Config.MEMORY_DB_PATH,
+                        help="store to write (default: the SQLite memory database)")
+    parser.add_argument("--overwrite", action="store_true", help="also copy users the target already has")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = migrate(open_memory_store(args.source), open_memory_store(args.target), args.overwrite)
+
+    print(
+        f"Migrated {counts['migrated']} users from {args.source} to {args.target} "
+        f"({counts['skipped']} already present) in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Sharded Memory Store for MediMind AI
+Users spread over small JSON shard files by a hash of their ID
+"""
+
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from src.memory.storage.base import MemoryStore, apply_update, empty_memory
+from src.utils.helpers import ensure_directory, file_lock, file_signature, load_json, save_json
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST = "manifest.json"
+
+def shard_of(user_id: str, shards: int) -> int:
+    """
+    Shard holding a user (stable across processes and restarts)
+
+    Args:
+        user_id: User identifier
+        shards: Number of shards
+
+    Returns:
+        Shard index
+    """
+    digest = hashlib.sha1(user_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % shards
+
+class ShardedMemoryStore(MemoryStore):
+    """
+    Store split into shard files
+
+    Each user lives in one of `shards` JSON files, chosen by a hash of
+    the user ID, so opening a session reads only that user's shard and
+    a save rewrites only that shard. Recently used shards stay parsed
+    in an LRU capped at cache_bytes (measured as their size on disk);
+    iter_users streams shards from disk one at a time without filling
+    the cache, for analytics jobs over every user.
+
+    Saves to different shards run in parallel. Several processes may
+    share the directory: a save locks its shard file, rereads it if
+    another writer changed it, applies the update on top and replaces
+    the file atomically.
+    """
+
+    name = "sharded"
+
+    def __init__(self, directory: str, shards: int = 256, cache_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialize store
+
+        Args:
+            directory: Directory holding the shard files
+            shards: Number of shards for a new store (an existing store
+                keeps the count recorded in its manifest)
+            cache_bytes: Total size of the shards kept parsed in memory
+        """
+        self.directory = directory
+        self.cache_bytes = cache_bytes
+        self._cache: "OrderedDict[int, Tuple[Dict[str, Dict[str, Any]], int, Any]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()  # Guards the LRU
+
+        ensure_directory(directory)
+        manifest_path = os.path.join(directory, MANIFEST)
+        with file_lock(manifest_path):
+            manifest = load_json(manifest_path)
+            if not manifest:
+                manifest = {"shards": shards}
+                save_json(manifest, manifest_path)
+        if manifest["shards"] != shards:
+            logger.info(f"Using the {manifest['shards']} shards recorded in {manifest_path}")
+        self.shards = manifest["shards"]
+        self._shard_locks = [threading.Lock() for _ in range(self.shards)]
+
+    def shard_path(self, shard: int) -> str:
+        """Path of one shard file"""
+        return os.path.join(self.directory, f"shard-{shard:05d}.json")
+
+    def _shard(self, shard: int) -> Dict[str, Dict[str, Any]]:
+        """
+        One shard's users, parsed on first use and kept in the LRU
+
+        Reread when another writer has replaced the file. Callers hold
+        the shard's lock.
+        """
+        path = self.shard_path(shard)
+        signature = file_signature(path)
+        with self._lock:
+            cached = self._cache.get(shard)
+            if cached is not None and cached[2] == signature:
+                self._cache.move_to_end(shard)
+                return cached[0]
+
+        users = load_json(path)
+        self._remember(shard, users, signature)
+        return users
+
+    def _remember(self, shard: int, users: Dict[str, Dict[str, Any]], signature: Any) -> None:
+        """Cache a shard, evicting least recently used ones past the cap"""
+        size = signature[2] if signature is not None else 0
+        with self._lock:
+            if shard in self._cache:
+                self._cached_bytes -= self._cache.pop(shard)[1]
+            self._cache[shard] = (users, size, signature)
+            self._cached_bytes += size
+
+            # The shard just used always stays, even if it alone exceeds the cap
+            while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, (_, evicted_size, _) = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted_size
+
+    def load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Load one user's memory (a copy; change it through append)"""
+        shard = shard_of(user_id, self.shards)
+        with self._shard_locks[shard]:
+            return copy.deepcopy(self._shard(shard).get(user_id))
+
+    def append(self, user_id: str, update: Dict[str, Any]) -> None:
+        """Add to one user's memory and rewrite that user's shard"""
+        shard = shard_of(user_id, self.shards)
+        path = self.shard_path(shard)
+        with self._shard_locks[shard], file_lock(path):
+            users = self._shard(shard)
+            apply_update(users.setdefault(user_id, empty_memory()), update)
+            try:
+                save_json(users, path)
+            except OSError:
+                self._forget(shard)  # Reread rather than keep an unsaved update
+                raise
+            self._remember(shard, users, file_signature(path))
+
+    def _forget(self, shard: int) -> None:
+        """Drop a shard from the LRU"""
+        with self._lock:
+            if shard in self._cache:
+                self._cached_bytes -= self._cache.pop(shard)[1]
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream every user's memory, one shard in memory at a time"""
+        for shard in range(self.shards):
+            with self._shard_locks[shard]:
+                with self._lock:
+                    cached = self._cache.get(shard)
+                if cached is not None and cached[2] == file_signature(self.shard_path(shard)):
+                    users = copy.deepcopy(cached[0])
+                else:
+                    users = load_json(self.shard_path(shard))
+            for user_id in sorted(users):
+                yield user_id, users[user_id]
+
+    def user_ids(self) -> List[str]:
+        """Identifiers of every stored user"""
+        return sorted(user_id for user_id, _ in self.iter_users())
+
+    def cache_info(self) -> Dict[str, int]:
+        """Shards and bytes currently held in the LRU"""
+        with self._lock:
+            return {"shards": len(self._cache), "bytes": self._cached_bytes, "max_bytes": self.cache_bytes}
@@ -0,0 +1,130 @@
+"""
+SQLite Memory Store for MediMind AI
+One row per medication, condition, symptom and visit, indexed by user
+"""
+
+import json
+import os
+import sqlite3
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from src.memory.storage.base import MemoryStore, empty_memory
+from src.utils.helpers import ensure_directory, get_timestamp
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS users ("
+    "user_id TEXT PRIMARY KEY, created_at TEXT)",
+    "CREATE TABLE IF NOT EXISTS medications ("
+    "user_id TEXT NOT NULL, name TEXT NOT NULL, timestamp TEXT, PRIMARY KEY (user_id, name))",
+    "CREATE TABLE IF NOT EXISTS chronic_conditions ("
+    "user_id TEXT NOT NULL, name TEXT NOT NULL, timestamp TEXT, PRIMARY KEY (user_id, name))",
+    "CREATE TABLE IF NOT EXISTS symptom_history ("
+    "id INTEGER PRIMARY KEY, user_id TEXT NOT NULL, symptom TEXT NOT NULL, timestamp TEXT)",
+    "CREATE TABLE IF NOT EXISTS doctor_visits ("
+    "id INTEGER PRIMARY KEY, user_id TEXT NOT NULL, timestamp TEXT, data TEXT NOT NULL)",
+] + [
+    f"CREATE INDEX IF NOT EXISTS {table}_user_time ON {table} (user_id, timestamp)"
+    for table in ("medications", "chronic_conditions", "symptom_history", "doctor_visits")
+]
+
+class SQLiteMemoryStore(MemoryStore):
+    """
+    Store backed by SQLite
+
+    Every user's data lives in its own rows, found through indexes on
+    (user_id, timestamp), so loading or updating one user touches only
+    that user's rows whatever the number of users. Uses WAL journaling
+    and short-lived connections, so threads and worker processes can
+    share one database file.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str):
+        """
+        Initialize store (creating the schema if needed)
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+
+        if os.path.dirname(db_path):
+            ensure_directory(os.path.dirname(db_path))
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection (safe across threads and processes)"""
+        return sqlite3.connect(self.db_path, timeout=30.0)
+
+    def load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Load one user's memory"""
+        with self._connect() as conn:
+            return self._load(conn, user_id)
+
+    def _load(self, conn: sqlite3.Connection, user_id: str) -> Optional[Dict[str, Any]]:
+        """Load one user's memory over an open connection"""
+        user = conn.execute("SELECT created_at FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        if user is None:
+            return None
+
+        memory = empty_memory(user[0])
+        memory["medications"] = [name for (name,) in conn.execute(
+            "SELECT name FROM medications WHERE user_id = ? ORDER BY rowid", (user_id,)
+        )]
+        memory["chronic_conditions"] = [name for (name,) in conn.execute(
+            "SELECT name FROM chronic_conditions WHERE user_id = ? ORDER BY rowid", (user_id,)
+        )]
+        memory["symptom_history"] = [
+            {"symptom": symptom, "timestamp": timestamp}
+            for symptom, timestamp in conn.execute(
+                "SELECT symptom, timestamp FROM symptom_history WHERE user_id = ? ORDER BY id", (user_id,)
+            )
+        ]
+        memory["doctor_visits"] = [json.loads(data) for (data,) in conn.execute(
+            "SELECT data FROM doctor_visits WHERE user_id = ? ORDER BY id", (user_id,)
+        )]
+        return memory
+
+    def append(self, user_id: str, update: Dict[str, Any]) -> None:
+        """Add to one user's memory in one transaction"""
+        timestamp = get_timestamp()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO users (user_id, created_at) VALUES (?, ?)",
+                (user_id, update.get("created_at", timestamp))
+            )
+            for table in ("medications", "chronic_conditions"):
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {table} (user_id, name, timestamp) VALUES (?, ?, ?)",
+                    [(user_id, name, timestamp) for name in update.get(table, [])]
+                )
+            conn.executemany(
+                "INSERT INTO symptom_history (user_id, symptom, timestamp) VALUES (?, ?, ?)",
+                [(user_id, entry["symptom"], entry.get("timestamp")) for entry in update.get("symptom_history", [])]
+            )
+            conn.executemany(
+                "INSERT INTO doctor_visits (user_id, timestamp, data) VALUES (?, ?, ?)",
+                [
+                    (user_id, visit.get("timestamp") if isinstance(visit, dict) else None, json.dumps(visit))
+                    for visit in update.get("doctor_visits", [])
+                ]
+            )
+
+    def user_ids(self) -> List[str]:
+        """Identifiers of every stored user"""
+        with self._connect() as conn:
+            return [user_id for (user_id,) in conn.execute("SELECT user_id FROM users ORDER BY user_id")]
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream every user's memory, one user in memory at a time"""
+        for user_id in self.user_ids():
+            memory = self.load_user(user_id)
+            if memory is not None:
+                yield user_id, memory
@@ -0,0 +1,72 @@
+"""
+Async runner for MediMind AI
+Bridges the synchronous agent API onto the asyncio pipeline
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class AsyncRunner:
+    """
+    Background event loop for synchronous callers
+
+    All sync wrappers share one long-lived loop running in a daemon
+    thread, so async model clients (and their connection pools) are
+    always driven from the same loop instead of a fresh one per call.
+    """
+
+    def __init__(self):
+        """Initialize runner (loop is started lazily)"""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background loop on first use"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="medimind-async-runner",
+                    daemon=True
+                )
+                self._thread.start()
+                logger.debug("Async runner loop started")
+            return self._loop
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """
+        Run a coroutine to completion from synchronous code
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Result of the coroutine
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("run_sync() cannot be called from inside the async runner loop")
+
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result()
+
+# Global runner instance
+async_runner = AsyncRunner()
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine from synchronous code on the shared runner loop
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Result of the coroutine
+    """
+    return async_runner.run(coro)
@@ -0,0 +1,110 @@
+"""
+Model client pool for MediMind AI
+Shares one pooled Gemini client (and its HTTP connections) across all agents
+"""
+
+import threading
+from typing import Dict, Optional
+import httpx
+from google import genai
+from src.config import Config
+from src.utils.async_runner import run_sync
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ClientPool:
+    """
+    Process-wide pool of Gemini clients
+
+    Every agent used to build its own client, which meant one HTTP
+    connection pool and TLS handshake per agent per session. The pool
+    hands out a single client per API key whose sync and async HTTP
+    transports share configurable connection limits and keep-alive.
+    """
+
+    def __init__(self):
+        """Initialize empty client pool"""
+        self._clients: Dict[str, genai.Client] = {}
+        self._lock = threading.Lock()
+        self._preconnect_thread: Optional[threading.Thread] = None
+
+    def get_client(self, api_key: Optional[str] = None) -> genai.Client:
+        """
+        Get the shared client for an API key, creating it on first use
+
+        Args:
+            api_key: API key (defaults to Config.GOOGLE_API_KEY)
+
+        Returns:
+            Shared Gemini client
+        """
+        api_key = api_key or Config.GOOGLE_API_KEY
+
+        client = self._clients.get(api_key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            if api_key not in self._clients:
+                self._clients[api_key] = self._build_client(api_key)
+                logger.info("Created pooled Gemini client")
+            return self._clients[api_key]
+
+    def _build_client(self, api_key: str) -> genai.Client:
+        """Build a Gemini client with pooled HTTP transports"""
+        limits = httpx.Limits(
+            max_connections=Config.CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=Config.CLIENT_KEEPALIVE_EXPIRY
+        )
+
+        http_options = genai.types.HttpOptions(
+            httpx_client=httpx.Client(limits=limits, timeout=None),
+            httpx_async_client=httpx.AsyncClient(limits=limits, timeout=None)
+        )
+
+        return genai.Client(api_key=api_key, http_options=http_options)
+
+    def preconnect(self, background: bool = True) -> None:
+        """
+        Warm up connections to the model API
+
+        Issues a cheap model listing call on both transports so the TCP
+        and TLS handshakes happen before the first user turn.
+
+        Args:
+            background: Run in a daemon thread instead of blocking
+        """
+        if not background:
+            self._warm_connections()
+            return
+
+        if self._preconnect_thread is not None and self._preconnect_thread.is_alive():
+            return
+
+        self._preconnect_thread = threading.Thread(
+            target=self._warm_connections,
+            name="medimind-preconnect",
+            daemon=True
+        )
+        self._preconnect_thread.start()
+
+    def _warm_connections(self) -> None:
+        """Open connections on the sync and async transports"""
+        client = self.get_client()
+
+        try:
+            client.models.list(config={"page_size": 1})
+            run_sync(client.aio.models.list(config={"page_size": 1}))
+            logger.info("Pre-connected to model API")
+        except Exception as e:
+            logger.warning(f"Pre-connect failed: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop all pooled clients"""
+        with self._lock:
+            self._clients.clear()
+
+# Global client pool instance
+client_pool = ClientPool()
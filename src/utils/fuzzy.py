@@ -0,0 +1,240 @@
+"""
+Fuzzy Phrase Matching for MediMind AI
+Typo-tolerant word and phrase lookup shared by the safety screen and the
+medication extractor
+"""
+
+import re
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+# Words are letters/digits with an optional apostrophe part ("can't")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+# Articles carry no meaning for phrase matching ("with a stiff neck"
+# matches "with stiff neck")
+ARTICLES = frozenset(("a", "an", "the"))
+
+# Distinct message words whose candidate phrase words are remembered
+CANDIDATE_CACHE_SIZE = 20000
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words, unifying apostrophes"""
+    return _WORD.findall(text.lower().replace("’", "'"))
+
+def content_words(text: str) -> List[str]:
+    """Lowercase words without articles"""
+    return [word for word in tokenize(text) if word not in ARTICLES]
+
+def max_typos(word: str) -> int:
+    """Edits tolerated in a word: none for short words, more for long ones"""
+    if len(word) <= 3 or word.isdigit():
+        return 0
+    return 1 if len(word) < 8 else 2
+
+def deletes(word: str, distance: int) -> Set[str]:
+    """All strings reachable from word by deleting up to `distance` characters"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+def query_deletes(word: str) -> int:
+    """Deletions to try on a message word to reach its vocabulary words"""
+    return 2 if len(word) >= 7 else 1
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance, giving up once it exceeds limit
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance of interest
+
+    Returns:
+        The distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+class PhraseMatch(NamedTuple):
+    """A phrase found in a word sequence"""
+    start: int  # Index of the first word
+    end: int  # Index after the last word
+    phrase: str
+    value: Any
+    distance: int  # Total edits over the phrase words
+
+class FuzzyPhraseIndex:
+    """
+    Typo-tolerant phrase index
+
+    Phrases are matched word by word, each word within a bounded edit
+    distance (see max_typos). Candidate words are found through a
+    symmetric-delete index, so a message word costs a few dictionary
+    lookups rather than an edit-distance computation per vocabulary
+    word, and lookup time stays flat as the vocabulary grows.
+    """
+
+    def __init__(self, closest_only: bool = False, max_edits: Optional[int] = None,
+                 same_first_letter: bool = False, min_fuzzy_length: int = 0):
+        """
+        Initialize an empty index
+
+        Args:
+            closest_only: Let a word only stand for its closest vocabulary
+                words (just itself if spelled exactly), instead of every
+                vocabulary word within the typo bound. Trades recall for
+                precision on large vocabularies.
+            max_edits: Cap on the edits tolerated in any one word (on top
+                of max_typos), for vocabularies where a false match costs
+                more than a missed typo
+            same_first_letter: Only let a misspelled word stand for
+                vocabulary words with the same first letter
+            min_fuzzy_length: Vocabulary words shorter than this only
+                match exactly (short names sit one edit away from common
+                words: "bayer" from "payer", "layer", "buyer")
+        """
+        self.closest_only = closest_only
+        self.max_edits = max_edits
+        self.same_first_letter = same_first_letter
+        self.min_fuzzy_length = min_fuzzy_length
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], Any]]] = {}
+        self._delete_index: Dict[str, Set[str]] = {}
+        self._vocabulary: Set[str] = set()
+        self._candidate_cache: Dict[str, Dict[str, int]] = {}
+
+    def add(self, phrase: str, value: Any = None) -> None:
+        """
+        Index a phrase
+
+        Args:
+            phrase: Phrase to find
+            value: Value reported with each match
+        """
+        words = tuple(tokenize(phrase))
+        if not words:
+            return
+        self._phrases.setdefault(words[0], []).append((words, value))
+        delete_index = self._delete_index
+        for word in words:
+            if word in self._vocabulary:
+                continue
+            self._vocabulary.add(word)
+            for variant in deletes(word, self.typo_limit(word)):
+                targets = delete_index.get(variant)
+                if targets is None:
+                    delete_index[variant] = {word}
+                else:
+                    targets.add(word)
+        self._candidate_cache.clear()
+
+    def __len__(self) -> int:
+        """Number of indexed phrases"""
+        return sum(len(entries) for entries in self._phrases.values())
+
+    def typo_limit(self, word: str) -> int:
+        """Edits tolerated in a vocabulary word under this index's options"""
+        if len(word) < self.min_fuzzy_length:
+            return 0
+        limit = max_typos(word)
+        return limit if self.max_edits is None else min(limit, self.max_edits)
+
+    # Storage lookups (overridden by indexes backed by other storage)
+
+    def _is_word(self, word: str) -> bool:
+        """Check whether a word is in the vocabulary"""
+        return word in self._vocabulary
+
+    def _targets(self, variant: str) -> Iterable[str]:
+        """Vocabulary words with a given delete variant"""
+        return self._delete_index.get(variant, ())
+
+    def _phrases_starting(self, word: str) -> Sequence[Tuple[Tuple[str, ...], Any]]:
+        """(phrase words, value) of the phrases starting with a word"""
+        return self._phrases.get(word, ())
+
+    def candidates(self, word: str) -> Dict[str, int]:
+        """
+        Vocabulary words a message word may stand for
+
+        Args:
+            word: Lowercase message word
+
+        Returns:
+            Vocabulary word -> edit distance (empty if none is close enough)
+        """
+        cached = self._candidate_cache.get(word)
+        if cached is not None:
+            return cached
+
+        found = {word: 0} if self._is_word(word) else {}
+        if not (found and self.closest_only):
+            distance = query_deletes(word)
+            if self.max_edits is not None:
+                distance = min(distance, self.max_edits)
+            for variant in deletes(word, distance):
+                for target in self._targets(variant):
+                    limit = self.typo_limit(target)
+                    if target in found or not limit:
+                        continue
+                    if self.same_first_letter and target[0] != word[0]:
+                        continue
+                    distance = edit_distance(word, target, limit)
+                    if distance <= limit:
+                        found[target] = distance
+
+            if self.closest_only and found:
+                best = min(found.values())
+                found = {target: distance for target, distance in found.items() if distance == best}
+
+        if len(self._candidate_cache) >= CANDIDATE_CACHE_SIZE:
+            self._candidate_cache.clear()
+        self._candidate_cache[word] = found
+        return found
+
+    def find(self, words: Sequence[str]) -> List[PhraseMatch]:
+        """
+        Find every phrase occurrence in a word sequence
+
+        Args:
+            words: Lowercase words (see tokenize)
+
+        Returns:
+            Matches ordered by start word (overlapping phrases are all reported)
+        """
+        candidates = [self.candidates(word) for word in words]
+
+        matches = []
+        for position, options in enumerate(candidates):
+            for first, first_distance in options.items():
+                for phrase, value in self._phrases_starting(first):
+                    end = position + len(phrase)
+                    if end > len(words):
+                        continue
+                    distance = first_distance
+                    for offset in range(1, len(phrase)):
+                        word_distance = candidates[position + offset].get(phrase[offset])
+                        if word_distance is None:
+                            break
+                        distance += word_distance
+                    else:
+                        matches.append(PhraseMatch(position, end, " ".join(phrase), value, distance))
+
+        return matches
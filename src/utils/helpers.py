@@ -3,11 +3,18 @@ Helper functions for MediMind AI
 Common utilities used across the application
 """
 
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator
 import json
 import os
+import tempfile
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks across processes
+    fcntl = None
+
 def ensure_directory(path: str) -> None:
     """
     Ensure a directory exists, create if it doesn't
@@ -36,16 +43,85 @@ def load_json(filepath: str) -> Dict[str, Any]:
 
 def save_json(data: Dict[str, Any], filepath: str) -> None:
     """
-    Save data to JSON file
+    Save data to JSON file atomically
+    
+    The data is written to a temporary file in the same directory,
+    fsynced and renamed over the target, so readers and crashes only
+    ever see the old or the new file, never a truncated one.
     
     Args:
         data: Data to save
         filepath: Path to save file
     """
-    ensure_directory(os.path.dirname(filepath))
+    directory = os.path.dirname(filepath)
+    if directory:
+        ensure_directory(directory)
+    
+    fd, temporary = tempfile.mkstemp(prefix=f".{os.path.basename(filepath)}.", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(filepath):
+            os.chmod(temporary, os.stat(filepath).st_mode & 0o7777)
+        os.replace(temporary, filepath)
+    except BaseException:
+        os.unlink(temporary)
+        raise
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Make the rename itself durable
+    if os.name == "posix":
+        dir_fd = os.open(directory or ".", os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+@contextmanager
+def file_lock(filepath: str, blocking: bool = True) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock for a file across processes
+    
+    The lock is taken on a separate filepath + ".lock" file, which
+    survives the data file being replaced by save_json. Without fcntl
+    (Windows) only the caller's own in-process locks apply.
+    
+    Args:
+        filepath: File to lock
+        blocking: Wait for the lock; otherwise raise BlockingIOError
+            when another process holds it
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    directory = os.path.dirname(filepath)
+    if directory:
+        ensure_directory(directory)
+    
+    with open(f"{filepath}.lock", 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+def file_signature(filepath: str) -> Any:
+    """
+    Identify a file's current contents cheaply
+    
+    Args:
+        filepath: Path to file
+        
+    Returns:
+        (inode, mtime_ns, size), or None if the file does not exist
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
 
 def get_timestamp() -> str:
     """
@@ -60,6 +136,9 @@ def detect_emergency(text: str, keywords: List[str]) -> bool:
     """
     Detect if text contains emergency keywords
     
+    Keywords match on word boundaries using a compiled matcher that is
+    built once per keyword list.
+    
     Args:
         text: Text to check
         keywords: List of emergency keywords
@@ -67,8 +146,8 @@ def detect_emergency(text: str, keywords: List[str]) -> bool:
     Returns:
         True if emergency detected, False otherwise
     """
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in keywords)
+    from src.utils.keyword_matcher import compile_keywords
+    return compile_keywords(tuple(keywords), "emergency").contains(text, "emergency")
 
 def truncate_text(text: str, max_length: int = 100) -> str:
     """
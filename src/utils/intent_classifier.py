@@ -0,0 +1,355 @@
+"""
+Intent Classifier for MediMind AI
+Local multinomial naive Bayes over hashed word and character n-grams
+
+Train a model from a labeled JSONL corpus ({"text": ..., "intent": ...}):
+    python -m src.utils.intent_classifier [corpus] [model_path] [calibration_set]
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from zlib import crc32
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+from src.config import Config
+from src.utils.helpers import ensure_directory
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Per-kind hash seeds, so a word, a bigram and a character n-gram with
+# the same text land in different buckets
+_WORD_SEED = crc32(b"w:")
+_BIGRAM_SEED = crc32(b"b:")
+_CHAR_SEED = crc32(b"c:")
+
+class HashedFeaturizer:
+    """
+    Hashed word unigram/bigram and character n-gram features
+
+    Word n-grams carry most of the signal; character n-grams make the
+    model tolerant to typos and inflections ("headach", "hurting").
+    """
+
+    def __init__(self, n_features: int = 8192, char_ngrams: Sequence[int] = (3, 4)):
+        """
+        Initialize featurizer
+
+        Args:
+            n_features: Dimension of the hashed feature space
+            char_ngrams: Inclusive (min, max) character n-gram lengths
+        """
+        self.n_features = n_features
+        self.char_ngrams = tuple(char_ngrams)
+
+    def features(self, text: str) -> List[int]:
+        """Hashed feature indices of a text (with repeats)"""
+        words = _TOKEN.findall(text.casefold().replace("’", "'"))
+        hashes = [crc32(word.encode("utf-8"), _WORD_SEED) for word in words]
+        hashes.extend(
+            crc32(f"{first} {second}".encode("utf-8"), _BIGRAM_SEED)
+            for first, second in zip(words, words[1:])
+        )
+
+        padded = f" {' '.join(words)} ".encode("utf-8")
+        low, high = self.char_ngrams
+        for n in range(low, high + 1):
+            hashes.extend(crc32(padded[i:i + n], _CHAR_SEED) for i in range(len(padded) - n + 1))
+
+        n_features = self.n_features
+        return [h % n_features for h in hashes]
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Vectorize texts
+
+        Args:
+            texts: Texts to vectorize
+
+        Returns:
+            (len(texts), n_features) float32 matrix of sublinear term counts
+        """
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self.features(text)
+            if features:
+                matrix[row] = np.bincount(features, minlength=self.n_features)
+        np.log1p(matrix, out=matrix)
+        return matrix
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax"""
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    np.exp(shifted, out=shifted)
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+class IntentClassifier:
+    """
+    Multinomial naive Bayes intent classifier
+
+    Inference is one matrix product of hashed features against per-class
+    log feature probabilities. Naive Bayes posteriors are overconfident,
+    so logits are divided by a temperature fitted on held-out data,
+    which makes the reported confidence track the actual accuracy.
+    """
+
+    def __init__(
+        self,
+        classes: Sequence[str],
+        feature_log_prob: np.ndarray,
+        class_log_prior: np.ndarray,
+        temperature: float = 1.0,
+        featurizer: Optional[HashedFeaturizer] = None
+    ):
+        """
+        Initialize classifier from model parameters
+
+        Args:
+            classes: Intent labels
+            feature_log_prob: (n_classes, n_features) log P(feature | class)
+            class_log_prior: (n_classes,) log P(class)
+            temperature: Calibration temperature for the logits
+            featurizer: Featurizer matching the parameters
+        """
+        self.classes = list(classes)
+        self.feature_log_prob = np.asarray(feature_log_prob, dtype=np.float32)
+        self.class_log_prior = np.asarray(class_log_prior, dtype=np.float32)
+        self.temperature = float(temperature)
+        self.featurizer = featurizer or HashedFeaturizer(self.feature_log_prob.shape[1])
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        alpha: float = 0.1,
+        featurizer: Optional[HashedFeaturizer] = None,
+        calibration: Optional[Tuple[Sequence[str], Sequence[str]]] = None,
+        calibration_share: float = 0.2,
+        seed: int = 0
+    ) -> "IntentClassifier":
+        """
+        Train a classifier
+
+        The temperature is fitted on a separate calibration set when one
+        is given (best when the training corpus is templated, since
+        held-out template variants are unrealistically easy). Otherwise a
+        share of the training data is held out for it and the final model
+        is refit on everything.
+
+        Args:
+            texts: Training texts
+            labels: Intent label per text
+            alpha: Additive (Laplace/Lidstone) smoothing
+            featurizer: Featurizer to use
+            calibration: Optional (texts, labels) for fitting the temperature
+            calibration_share: Fraction of data held out without a calibration set
+            seed: Shuffle seed for the calibration split
+
+        Returns:
+            Trained classifier
+        """
+        featurizer = featurizer or HashedFeaturizer()
+        classes = sorted(set(labels))
+        X = featurizer.transform(texts)
+        y = np.array([classes.index(label) for label in labels])
+
+        model = cls(classes, *cls._fit(X, y, len(classes), alpha), featurizer=featurizer)
+
+        if calibration is not None:
+            calibration_texts, calibration_labels = calibration
+            model.temperature = model._fit_temperature(
+                featurizer.transform(calibration_texts),
+                np.array([classes.index(label) for label in calibration_labels])
+            )
+            return model
+
+        order = np.random.default_rng(seed).permutation(len(y))
+        split = int(len(y) * (1 - calibration_share))
+        fit_rows, calibration_rows = order[:split], order[split:]
+
+        if len(calibration_rows) and len(set(y[fit_rows])) == len(classes):
+            held_out = cls(classes, *cls._fit(X[fit_rows], y[fit_rows], len(classes), alpha), featurizer=featurizer)
+            model.temperature = held_out._fit_temperature(X[calibration_rows], y[calibration_rows])
+
+        return model
+
+    @staticmethod
+    def _fit(X: np.ndarray, y: np.ndarray, n_classes: int, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Estimate naive Bayes parameters"""
+        counts = np.zeros((n_classes, X.shape[1]), dtype=np.float64)
+        for label in range(n_classes):
+            counts[label] = X[y == label].sum(axis=0)
+
+        smoothed = counts + alpha
+        feature_log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        class_log_prior = np.log(np.bincount(y, minlength=n_classes) / len(y))
+        return feature_log_prob, class_log_prior
+
+    def _logits(self, X: np.ndarray) -> np.ndarray:
+        """Uncalibrated class log-likelihoods"""
+        return X @ self.feature_log_prob.T + self.class_log_prior
+
+    def _fit_temperature(self, X: np.ndarray, y: np.ndarray) -> float:
+        """Temperature minimizing held-out negative log-likelihood"""
+        logits = self._logits(X)
+        best_temperature, best_nll = 1.0, np.inf
+        for temperature in np.geomspace(0.05, 100, 160):
+            probabilities = _softmax(logits / temperature)
+            nll = -np.log(probabilities[np.arange(len(y)), y] + 1e-12).mean()
+            if nll < best_nll:
+                best_temperature, best_nll = float(temperature), nll
+        return best_temperature
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Calibrated class probabilities
+
+        Args:
+            texts: Texts to classify
+
+        Returns:
+            (len(texts), n_classes) probabilities in self.classes order
+        """
+        return _softmax(self._logits(self.featurizer.transform(texts)) / self.temperature)
+
+    def classify_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Classify several texts with one matrix product
+
+        Args:
+            texts: Texts to classify
+
+        Returns:
+            One dict per text with intent, confidence and probabilities
+        """
+        if not texts:
+            return []
+
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [
+            {
+                "intent": self.classes[index],
+                "confidence": float(row[index]),
+                "probabilities": {label: float(p) for label, p in zip(self.classes, row)}
+            }
+            for index, row in zip(best, probabilities)
+        ]
+
+    def classify(self, text: str) -> Dict[str, Any]:
+        """
+        Classify one text
+
+        Args:
+            text: Text to classify
+
+        Returns:
+            Dict with intent, confidence and probabilities
+        """
+        return self.classify_batch([text])[0]
+
+    def save(self, path: str) -> None:
+        """
+        Save the model as a compressed .npz (float16 parameters)
+
+        Args:
+            path: Output path
+        """
+        if os.path.dirname(path):
+            ensure_directory(os.path.dirname(path))
+        np.savez_compressed(
+            path,
+            classes=np.array(self.classes),
+            feature_log_prob=self.feature_log_prob.astype(np.float16),
+            class_log_prior=self.class_log_prior,
+            temperature=np.array(self.temperature),
+            char_ngrams=np.array(self.featurizer.char_ngrams)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        """
+        Load a model saved with save()
+
+        Args:
+            path: Model path
+
+        Returns:
+            Classifier
+        """
+        with np.load(path) as data:
+            feature_log_prob = data["feature_log_prob"].astype(np.float32)
+            return cls(
+                [str(label) for label in data["classes"]],
+                feature_log_prob,
+                data["class_log_prior"],
+                float(data["temperature"]),
+                HashedFeaturizer(feature_log_prob.shape[1], tuple(int(n) for n in data["char_ngrams"]))
+            )
+
+def load_corpus(path: str) -> Tuple[List[str], List[str]]:
+    """
+    Load a labeled JSONL corpus
+
+    Args:
+        path: Path to a file with one {"text", "intent"} object per line
+
+    Returns:
+        (texts, labels)
+    """
+    texts, labels = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                texts.append(record["text"])
+                labels.append(record["intent"])
+    return texts, labels
+
+_classifier: Optional[IntentClassifier] = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+def get_intent_classifier() -> Optional[IntentClassifier]:
+    """
+    Get the shared classifier (loaded on first use)
+
+    Returns:
+        Classifier, or None if disabled or no model file exists
+    """
+    global _classifier, _classifier_loaded
+    if not _classifier_loaded:
+        with _classifier_lock:
+            if not _classifier_loaded:
+                if Config.INTENT_CLASSIFIER_ENABLED and os.path.exists(Config.INTENT_MODEL_PATH):
+                    _classifier = IntentClassifier.load(Config.INTENT_MODEL_PATH)
+                    logger.info(f"Intent classifier loaded from {Config.INTENT_MODEL_PATH}")
+                elif Config.INTENT_CLASSIFIER_ENABLED:
+                    logger.warning(f"Intent model not found at {Config.INTENT_MODEL_PATH}, using keyword routing")
+                _classifier_loaded = True
+    return _classifier
+
+def main():
+    """Train a model from a corpus and save it"""
+    corpus = sys.argv[1] if len(sys.argv) > 1 else Config.INTENT_CORPUS_PATH
+    output = sys.argv[2] if len(sys.argv) > 2 else Config.INTENT_MODEL_PATH
+    calibration_path = sys.argv[3] if len(sys.argv) > 3 else Config.INTENT_CALIBRATION_PATH
+
+    texts, labels = load_corpus(corpus)
+    calibration = load_corpus(calibration_path) if os.path.exists(calibration_path) else None
+    classifier = IntentClassifier.train(texts, labels, calibration=calibration)
+    classifier.save(output)
+
+    print(f"Trained on {len(texts)} examples, classes: {', '.join(classifier.classes)}")
+    print(f"Calibration temperature: {classifier.temperature:.2f}"
+          f" ({'calibration set' if calibration else 'held-out split'})")
+    print(f"Saved {os.path.getsize(output) / 1024:.1f} KiB to {output}")
+
+if __name__ == "__main__":
+    main()
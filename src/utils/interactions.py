@@ -0,0 +1,271 @@
+"""
+Drug Interaction Index for MediMind AI
+Hash index over the interaction database, keyed on unordered drug pairs
+"""
+
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from src.config import Config
+from src.utils.helpers import load_json
+from src.utils.knowledge_service import current_snapshot
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Severity ranks for filtering and ordering; unknown labels rank highest
+# so that a filter never hides an interaction it does not understand
+SEVERITY_RANK = {
+    "minor": 0,
+    "mild": 0,
+    "moderate": 1,
+    "major": 2,
+    "severe": 2,
+    "contraindicated": 3
+}
+
+PairKey = Tuple[str, str]
+
+def normalize_drug(name: str) -> str:
+    """Normalize a drug name for lookups"""
+    return " ".join(name.casefold().split())
+
+def pair_key(drug1: str, drug2: str) -> PairKey:
+    """
+    Key of an unordered drug pair
+
+    Args:
+        drug1: First drug name
+        drug2: Second drug name
+
+    Returns:
+        Normalized names in sorted order, so (a, b) and (b, a) share a key
+    """
+    first, second = normalize_drug(drug1), normalize_drug(drug2)
+    return (first, second) if first <= second else (second, first)
+
+def severity_rank(severity: Optional[str]) -> int:
+    """Rank of a severity label (higher is more serious)"""
+    return SEVERITY_RANK.get((severity or "").casefold(), max(SEVERITY_RANK.values()) + 1)
+
+class InteractionIndex:
+    """
+    Interaction lookup by unordered drug pair
+
+    Built once from the interaction records; a lookup is one dict access
+    instead of a scan of the whole database, so checking m medications
+    costs O(m^2) hash lookups whatever the size of the database. A pair
+    may have several interactions (e.g. from different sources); they
+    are kept most severe first.
+    """
+
+    def __init__(self, interactions: Iterable[Dict[str, Any]] = ()):
+        """
+        Initialize index
+
+        Args:
+            interactions: Records with drug1, drug2 and severity fields
+        """
+        self._pairs: Dict[PairKey, List[Dict[str, Any]]] = {}
+        self._size = 0
+
+        for interaction in interactions:
+            self.add(interaction)
+
+    def add(self, interaction: Dict[str, Any]) -> None:
+        """Add an interaction record"""
+        entries = self._pairs.setdefault(pair_key(interaction["drug1"], interaction["drug2"]), [])
+        entries.append(interaction)
+        entries.sort(key=lambda entry: -severity_rank(entry.get("severity")))
+        self._size += 1
+
+    def __len__(self) -> int:
+        """Number of interaction records"""
+        return self._size
+
+    @property
+    def pair_count(self) -> int:
+        """Number of distinct drug pairs with at least one interaction"""
+        return len(self._pairs)
+
+    def items(self) -> Iterator[Tuple[PairKey, List[Dict[str, Any]]]]:
+        """Iterate over (pair key, interaction records) for every pair"""
+        return iter(self._pairs.items())
+
+    def lookup(self, drug1: str, drug2: str, min_severity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Interactions between two drugs
+
+        Args:
+            drug1: First drug name
+            drug2: Second drug name
+            min_severity: Only return interactions at least this severe
+
+        Returns:
+            Interaction records, most severe first
+        """
+        entries = self._pairs.get(pair_key(drug1, drug2), [])
+        if min_severity is None or not entries:
+            return list(entries)
+
+        threshold = severity_rank(min_severity)
+        return [entry for entry in entries if severity_rank(entry.get("severity")) >= threshold]
+
+    def check(self, medications: Sequence[str], min_severity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Interactions among a set of medications
+
+        Args:
+            medications: Drug names (duplicates and case variants are ignored)
+            min_severity: Only return interactions at least this severe
+
+        Returns:
+            Interaction records of every interacting pair, most severe first
+        """
+        drugs = list(dict.fromkeys(normalize_drug(name) for name in medications))
+        pairs = self._pairs
+
+        found = []
+        for i, first in enumerate(drugs):
+            for second in drugs[i + 1:]:
+                key = (first, second) if first <= second else (second, first)
+                if key in pairs:
+                    found.extend(self.lookup(first, second, min_severity))
+
+        found.sort(key=lambda entry: -severity_rank(entry.get("severity")))
+        return found
+
+class InteractionState:
+    """
+    Incrementally maintained interactions of one patient's medications
+
+    Kept per session so each turn only checks what changed: adding a
+    drug looks up its pairs with the drugs already known (new x
+    existing), removing one drops its pairs, instead of re-checking
+    every pair of the full medication list.
+    """
+
+    def __init__(self, medications: Iterable[str] = (), index: Optional[InteractionIndex] = None):
+        """
+        Initialize state
+
+        Args:
+            medications: Medications already known
+            index: Interaction index (default: the shared index)
+        """
+        self.index = index or get_interaction_index()
+        self._medications: Dict[str, str] = {}  # Normalized -> name as given
+        self._partners: Dict[str, Set[str]] = {}  # Drug -> drugs it interacts with
+        self._interactions: Dict[PairKey, List[Dict[str, Any]]] = {}
+        self.add(medications)
+
+    def rebind(self, index: InteractionIndex) -> None:
+        """
+        Re-check the known medications against another index
+        (e.g. after the interaction database was reloaded)
+
+        Args:
+            index: New interaction index
+        """
+        if index is self.index:
+            return
+        medications = self.medications
+        self.index = index
+        self._medications.clear()
+        self._partners.clear()
+        self._interactions.clear()
+        self.add(medications)
+
+    @property
+    def medications(self) -> List[str]:
+        """Known medications in the order they were added"""
+        return list(self._medications.values())
+
+    def __contains__(self, medication: str) -> bool:
+        """Check whether a medication is known"""
+        return normalize_drug(medication) in self._medications
+
+    def add(self, medications: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Add medications, checking them against the known ones
+
+        Args:
+            medications: Medication names (known ones are ignored)
+
+        Returns:
+            Interaction records found by this call
+        """
+        found = []
+        for name in medications:
+            drug = normalize_drug(name)
+            if drug in self._medications:
+                continue
+
+            for other in self._medications:
+                records = self.index.lookup(drug, other)
+                if records:
+                    self._interactions[pair_key(drug, other)] = records
+                    self._partners.setdefault(drug, set()).add(other)
+                    self._partners.setdefault(other, set()).add(drug)
+                    found.extend(records)
+
+            self._medications[drug] = name
+        return found
+
+    def remove(self, medications: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Remove medications the patient no longer takes
+
+        Args:
+            medications: Medication names (unknown ones are ignored)
+
+        Returns:
+            Interaction records that no longer apply
+        """
+        resolved = []
+        for name in medications:
+            drug = normalize_drug(name)
+            if self._medications.pop(drug, None) is None:
+                continue
+
+            for other in self._partners.pop(drug, ()):
+                self._partners[other].discard(drug)
+                resolved.extend(self._interactions.pop(pair_key(drug, other)))
+        return resolved
+
+    def interactions(self, min_severity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Current interactions among the known medications
+
+        Args:
+            min_severity: Only return interactions at least this severe
+
+        Returns:
+            Interaction records, most severe first
+        """
+        threshold = severity_rank(min_severity) if min_severity is not None else None
+        found = [
+            record
+            for records in self._interactions.values()
+            for record in records
+            if threshold is None or severity_rank(record.get("severity")) >= threshold
+        ]
+        found.sort(key=lambda entry: -severity_rank(entry.get("severity")))
+        return found
+
+def build_interaction_index(path: Optional[str] = None) -> InteractionIndex:
+    """
+    Build an index from an interaction database file
+
+    Args:
+        path: JSON file with a drug_interactions list (default Config.INTERACTIONS_DB)
+
+    Returns:
+        Interaction index
+    """
+    path = path or Config.INTERACTIONS_DB
+    index = InteractionIndex(load_json(path).get("drug_interactions", []))
+    logger.info(f"Interaction index built: {len(index)} interactions, {index.pair_count} pairs")
+    return index
+
+def get_interaction_index() -> InteractionIndex:
+    """Get the interaction index of the current knowledge snapshot"""
+    return current_snapshot().interaction_index
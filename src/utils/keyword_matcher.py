@@ -0,0 +1,272 @@
+"""
+Keyword Matcher for MediMind AI
+Compiled multi-pattern matcher for routing keywords, emergency phrases,
+symptom names and drug names
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+from src.config import Config
+from src.utils.knowledge_service import current_snapshot, get_medications_db, get_symptoms_db
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Words are letters/digits with an optional apostrophe part ("can't")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+# Inflections that still count as a match ("hurts", "feeling", "headaches")
+SUFFIXES = ("ing", "es", "ed", "s", "d")
+
+# Distinct words whose keyword mapping is remembered
+CANONICAL_CACHE_SIZE = 50000
+
+_MISSING = object()
+
+class KeywordHit(NamedTuple):
+    """A keyword found in text"""
+    keyword: str
+    category: str
+    start: int
+    end: int
+
+def _normalize(text: str) -> str:
+    """Lowercase text and unify apostrophes"""
+    return text.lower().replace("’", "'")
+
+class KeywordMatcher:
+    """
+    Word-level Aho-Corasick automaton over categorized keywords
+
+    Text is tokenized into words once, and the words drive an automaton
+    whose transitions are keyword words, so every keyword in every
+    category is found in a single left-to-right pass whose cost does
+    not depend on the number of keywords. Matches only start
+    and end on word boundaries ("take" does not match "mistake"), but a
+    word may carry an inflectional suffix ("feeling" matches "feel").
+    """
+
+    def __init__(self, cache_size: int = 256):
+        """
+        Initialize an empty matcher
+
+        Args:
+            cache_size: Number of recent texts whose hits are memoized, so
+                several components checking the same message share one scan
+        """
+        self.cache_size = cache_size
+        self._keywords: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+        self._vocabulary = set()
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str, int]]] = [[]]
+        self._canonical_cache: Dict[str, Optional[str]] = {}
+        self._find = lru_cache(maxsize=cache_size)(self._scan)
+
+    def add(self, keyword: str, category: str) -> None:
+        """
+        Add a keyword (call build() afterwards)
+
+        Args:
+            keyword: Word or phrase to find
+            category: Category reported with each hit
+        """
+        words = tuple(_WORD.findall(_normalize(keyword)))
+        if not words:
+            return
+        entries = self._keywords.setdefault(words, [])
+        if (keyword, category) not in entries:
+            entries.append((keyword, category))
+
+    def add_many(self, keywords: Iterable[str], category: str) -> None:
+        """Add several keywords with the same category"""
+        for keyword in keywords:
+            self.add(keyword, category)
+
+    def build(self) -> "KeywordMatcher":
+        """
+        Compile the automaton
+
+        Returns:
+            The matcher itself
+        """
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[Tuple[str, str, int]]] = [[]]
+
+        for words, entries in self._keywords.items():
+            state = 0
+            for word in words:
+                next_state = goto[state].get(word)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][word] = next_state
+                    goto.append({})
+                    output.append([])
+                state = next_state
+            output[state].extend((keyword, category, len(words)) for keyword, category in entries)
+
+        # Breadth-first failure links; outputs inherit from their fail state
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and word not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(word, 0)
+                output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._vocabulary = {word for words in self._keywords for word in words}
+        self._canonical_cache = {}
+        self._find = lru_cache(maxsize=self.cache_size)(self._scan)
+
+        logger.debug(f"Keyword matcher built: {len(self._keywords)} keywords, {len(goto)} states")
+        return self
+
+    def _canonical(self, word: str) -> Optional[str]:
+        """Map a word onto a keyword word, allowing inflections"""
+        cached = self._canonical_cache.get(word, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        canonical = None
+        if word in self._vocabulary:
+            canonical = word
+        else:
+            for suffix in SUFFIXES:
+                if word.endswith(suffix) and len(word) > len(suffix) + 2:
+                    stem = word[:-len(suffix)]
+                    if stem in self._vocabulary:
+                        canonical = stem
+                        break
+                    if suffix in ("ing", "ed") and stem + "e" in self._vocabulary:
+                        canonical = stem + "e"  # "taking" -> "take"
+                        break
+
+        if len(self._canonical_cache) >= CANONICAL_CACHE_SIZE:
+            self._canonical_cache.clear()
+        self._canonical_cache[word] = canonical
+        return canonical
+
+    def _scan(self, text: str) -> Tuple[KeywordHit, ...]:
+        """Run the automaton over the words of the text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        cache = self._canonical_cache
+        hits = []
+        starts = []
+        state = 0
+
+        for match in _WORD.finditer(_normalize(text)):
+            word = cache.get(match.group(), _MISSING)
+            if word is _MISSING:
+                word = self._canonical(match.group())
+            if word is None:
+                # Not part of any keyword: no partial match survives
+                state = 0
+                continue
+
+            starts.append(match.start())
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+
+            for keyword, category, length in output[state]:
+                hits.append(KeywordHit(keyword, category, starts[-length], match.end()))
+
+        return tuple(hits)
+
+    def find_all(self, text: str) -> Tuple[KeywordHit, ...]:
+        """
+        Find every keyword occurrence in text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Hits ordered by end offset (overlapping phrases are all reported)
+        """
+        return self._find(text)
+
+    def matches(self, text: str, category: str) -> List[str]:
+        """
+        Distinct keywords of a category found in text
+
+        Args:
+            text: Text to scan
+            category: Category to report
+
+        Returns:
+            Keywords in order of first occurrence
+        """
+        found = []
+        for hit in self.find_all(text):
+            if hit.category == category and hit.keyword not in found:
+                found.append(hit.keyword)
+        return found
+
+    def contains(self, text: str, category: str) -> bool:
+        """Check whether text contains any keyword of a category"""
+        return any(hit.category == category for hit in self.find_all(text))
+
+@lru_cache(maxsize=32)
+def compile_keywords(keywords: Tuple[str, ...], category: str = "keyword") -> KeywordMatcher:
+    """
+    Compile (once) a matcher for an ad-hoc keyword list
+
+    Args:
+        keywords: Keywords to find
+        category: Category for the hits
+
+    Returns:
+        Compiled matcher
+    """
+    matcher = KeywordMatcher()
+    matcher.add_many(keywords, category)
+    return matcher.build()
+
+def build_default_matcher(
+    symptoms_db: Optional[Dict[str, Any]] = None,
+    medications_db: Optional[Dict[str, Any]] = None
+) -> KeywordMatcher:
+    """
+    Build the matcher used across the agents
+
+    Categories:
+        intent:<name> - routing keywords from Config.INTENT_KEYWORDS
+        emergency     - Config.EMERGENCY_KEYWORDS
+        symptom       - symptom names from the symptoms database
+        medication    - drug names from the medications database
+
+    Args:
+        symptoms_db: Symptoms database (default: the current knowledge snapshot's)
+        medications_db: Medications database (default: the current knowledge snapshot's)
+
+    Returns:
+        Compiled matcher
+    """
+    matcher = KeywordMatcher()
+
+    for intent, keywords in Config.INTENT_KEYWORDS.items():
+        matcher.add_many(keywords, f"intent:{intent}")
+    matcher.add_many(Config.EMERGENCY_KEYWORDS, "emergency")
+
+    symptoms_db = symptoms_db if symptoms_db is not None else get_symptoms_db()
+    symptoms = symptoms_db.get("common_symptoms", [])
+    matcher.add_many((symptom["name"] for symptom in symptoms), "symptom")
+
+    medications_db = medications_db if medications_db is not None else get_medications_db()
+    medications = medications_db.get("common_medications", [])
+    matcher.add_many((medication["name"] for medication in medications), "medication")
+
+    return matcher.build()
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Get the matcher of the current knowledge snapshot"""
+    return current_snapshot().keyword_matcher
@@ -0,0 +1,563 @@
+"""
+Knowledge Base for MediMind AI
+Compiled, memory-mapped symptom, medication and interaction databases
+
+Compile the JSON databases into one binary file (read-only at runtime):
+    python -m src.utils.knowledge_base [output_path]
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from zlib import crc32
+import numpy as np
+from src.config import Config
+from src.utils.fuzzy import FuzzyPhraseIndex, deletes, tokenize
+from src.utils.helpers import ensure_directory, load_json
+from src.utils.interactions import (
+    InteractionIndex, PairKey, normalize_drug, pair_key, severity_rank
+)
+from src.utils.logger import get_logger
+from src.utils.medication_extractor import MEDICATION_INDEX_OPTIONS
+
+logger = get_logger(__name__)
+
+MAGIC = b"MMKB"
+FORMAT_VERSION = 1
+
+# Preamble: magic, format version, header length
+_PREAMBLE = struct.Struct("<4sII")
+
+# Sections start on 8-byte boundaries so arrays can be viewed in place
+_ALIGNMENT = 8
+
+# Decoded records kept per table
+RECORD_CACHE_SIZE = 4096
+
+def _aligned(offset: int) -> int:
+    """Round an offset up to the section alignment"""
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def _string_sections(strings: Sequence[str]) -> Tuple[np.ndarray, bytes]:
+    """Offsets and concatenated UTF-8 data of a string table"""
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+def _source_info(path: str) -> Dict[str, Any]:
+    """Identity of a source file, to detect edits after compiling"""
+    stat = os.stat(path)
+    return {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def compile_knowledge_base(
+    output: str,
+    symptoms_path: Optional[str] = None,
+    medications_path: Optional[str] = None,
+    interactions_path: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Compile the JSON databases into a knowledge base file
+
+    Sections (named in a JSON header, each 8-byte aligned):
+        symptoms                  the symptoms database as JSON
+        medications.*             one JSON record per formulary entry
+        drugs.*                   sorted normalized drug names (id = position)
+        pairs.codes, .offsets     sorted pair codes lo * n_drugs + hi and
+                                  their record ranges in interactions.*
+        interactions.*            JSON records, most severe first per pair
+        words.*                   sorted medication name vocabulary
+        deletes.hashes, .words    crc32 of every delete variant -> word id
+        phrases.*                 name phrases by first word id, with the
+                                  generic name (names.*) each stands for
+
+    Args:
+        output: Output path (replaced atomically)
+        symptoms_path: Symptoms database (default Config.SYMPTOMS_DB)
+        medications_path: Medications database (default Config.MEDICATIONS_DB)
+        interactions_path: Interaction database (default Config.INTERACTIONS_DB)
+
+    Returns:
+        Record counts per database
+    """
+    sources = {
+        "symptoms": symptoms_path or Config.SYMPTOMS_DB,
+        "medications": medications_path or Config.MEDICATIONS_DB,
+        "interactions": interactions_path or Config.INTERACTIONS_DB
+    }
+    symptoms_db = load_json(sources["symptoms"])
+    medications = load_json(sources["medications"]).get("common_medications", [])
+    index = InteractionIndex(load_json(sources["interactions"]).get("drug_interactions", []))
+
+    sections: Dict[str, Tuple[bytes, str]] = {}
+
+    def add_array(name: str, array: np.ndarray) -> None:
+        sections[name] = (np.ascontiguousarray(array).tobytes(), array.dtype.str)
+
+    def add_strings(name: str, strings: Sequence[str]) -> None:
+        offsets, data = _string_sections(strings)
+        add_array(f"{name}.offsets", offsets)
+        sections[f"{name}.data"] = (data, "|u1")
+
+    sections["symptoms"] = (json.dumps(symptoms_db, ensure_ascii=False).encode("utf-8"), "|u1")
+    add_strings("medications", [json.dumps(record, ensure_ascii=False) for record in medications])
+
+    # Interactions: drug ids, sorted pair codes, records grouped by pair
+    pairs = dict(index.items())
+    drugs = sorted({drug for key in pairs for drug in key})
+    drug_ids = {drug: position for position, drug in enumerate(drugs)}
+    keyed = sorted(
+        ((drug_ids[first] * len(drugs) + drug_ids[second], records) for (first, second), records in pairs.items()),
+        key=lambda item: item[0]
+    )
+    add_strings("drugs", drugs)
+    add_array("pairs.codes", np.array([code for code, _ in keyed], dtype=np.int64))
+    add_array("pairs.offsets", np.concatenate(([0], np.cumsum([len(records) for _, records in keyed]))).astype(np.uint32))
+    add_strings("interactions", [
+        json.dumps(record, ensure_ascii=False) for _, records in keyed for record in records
+    ])
+
+    # Medication names: vocabulary, symmetric-delete index, phrases
+    phrases = {}
+    for medication in medications:
+        canonical = medication["name"]
+        for name in [canonical] + medication.get("brand_names", []) + medication.get("synonyms", []):
+            words = tuple(tokenize(name))
+            if words:
+                phrases[(words, canonical)] = None
+    phrases = list(phrases)
+
+    vocabulary = sorted({word for words, _ in phrases for word in words})
+    word_ids = {word: position for position, word in enumerate(vocabulary)}
+    names = sorted({canonical for _, canonical in phrases})
+    name_ids = {name: position for position, name in enumerate(names)}
+
+    matching = FuzzyPhraseIndex(**MEDICATION_INDEX_OPTIONS)
+    delete_hashes, delete_words = [], []
+    for word, word_id in word_ids.items():
+        for variant in deletes(word, matching.typo_limit(word)):
+            delete_hashes.append(crc32(variant.encode("utf-8")))
+            delete_words.append(word_id)
+    delete_hashes = np.array(delete_hashes, dtype=np.uint32)
+    delete_words = np.array(delete_words, dtype=np.uint32)
+    order = np.lexsort((delete_words, delete_hashes))
+
+    phrases.sort(key=lambda phrase: word_ids[phrase[0][0]])
+    add_strings("words", vocabulary)
+    add_strings("names", names)
+    add_array("deletes.hashes", delete_hashes[order])
+    add_array("deletes.words", delete_words[order])
+    add_array("phrases.first", np.array([word_ids[words[0]] for words, _ in phrases], dtype=np.uint32))
+    add_array("phrases.offsets", np.concatenate(([0], np.cumsum([len(words) for words, _ in phrases]))).astype(np.uint32))
+    add_array("phrases.words", np.array([word_ids[word] for words, _ in phrases for word in words], dtype=np.uint32))
+    add_array("phrases.values", np.array([name_ids[canonical] for _, canonical in phrases], dtype=np.uint32))
+
+    counts = {
+        "symptoms": len(symptoms_db.get("common_symptoms", [])),
+        "medications": len(medications),
+        "names": len(phrases),
+        "drugs": len(drugs),
+        "pairs": len(keyed),
+        "interactions": len(index)
+    }
+
+    layout = {}
+    offset = 0
+    for name, (data, dtype) in sections.items():
+        layout[name] = {"offset": offset, "length": len(data), "dtype": dtype}
+        offset = _aligned(offset + len(data))
+
+    header = json.dumps({
+        "sections": layout,
+        "counts": counts,
+        "sources": {name: _source_info(path) for name, path in sources.items() if os.path.exists(path)},
+        "compiled_at": time.time()
+    }).encode("utf-8")
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    if os.path.dirname(output):
+        ensure_directory(os.path.dirname(output))
+    temporary = f"{output}.tmp{os.getpid()}"
+    with open(temporary, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, (data, _) in sections.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(data)
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, output)
+
+    logger.info(f"Knowledge base compiled to {output}: {counts}")
+    return counts
+
+class StringTable(Sequence):
+    """Read-only table of strings stored as offsets plus UTF-8 data"""
+
+    def __init__(self, offsets: np.ndarray, data: memoryview):
+        """
+        Initialize table
+
+        Args:
+            offsets: (n + 1,) byte offsets of each string in data
+            data: Concatenated UTF-8 strings
+        """
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        """Number of strings"""
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position):
+        """Decode one string (or a list of strings for a slice)"""
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("string table index out of range")
+        start, end = int(self._offsets[position]), int(self._offsets[position + 1])
+        return str(self._data[start:end], "utf-8")
+
+    def find(self, string: str) -> Optional[int]:
+        """Position of a string in a sorted table (None if absent)"""
+        position = bisect_left(self, string)
+        if position < len(self) and self[position] == string:
+            return position
+        return None
+
+class RecordTable(StringTable):
+    """Read-only table of JSON records, decoded on access"""
+
+    def __init__(self, offsets: np.ndarray, data: memoryview):
+        """Initialize table (see StringTable)"""
+        super().__init__(offsets, data)
+        self._decode = lru_cache(maxsize=RECORD_CACHE_SIZE)(self._load)
+
+    def _load(self, position: int) -> Dict[str, Any]:
+        """Decode one record"""
+        return json.loads(StringTable.__getitem__(self, position))
+
+    def __getitem__(self, position):
+        """Decode one record (or a list of records for a slice)"""
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("record table index out of range")
+        return self._decode(position)
+
+class KnowledgeBase:
+    """
+    Memory-mapped, read-only knowledge base
+
+    Opening a compiled file reads only its small JSON header; sections
+    are NumPy views and lazily decoded tables over one read-only mmap,
+    so processes on the same host share the page-cached file instead of
+    each parsing and holding their own copy of the databases.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a compiled knowledge base
+
+        Args:
+            path: File written by compile_knowledge_base
+
+        Raises:
+            ValueError: If the file is not a knowledge base of this version
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} knowledge base")
+
+        header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_length])
+        self.sections: Dict[str, Dict[str, Any]] = header["sections"]
+        self.counts: Dict[str, int] = header["counts"]
+        self.sources: Dict[str, Dict[str, Any]] = header["sources"]
+        self._data_start = _aligned(_PREAMBLE.size + header_length)
+        self._symptoms_db: Optional[Dict[str, Any]] = None
+        self._medications: Optional[RecordTable] = None
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only NumPy view of a section"""
+        section = self.sections[name]
+        dtype = np.dtype(section["dtype"])
+        return np.frombuffer(
+            self._mmap,
+            dtype=dtype,
+            count=section["length"] // dtype.itemsize,
+            offset=self._data_start + section["offset"]
+        )
+
+    def strings(self, name: str) -> StringTable:
+        """String table section"""
+        return StringTable(self.array(f"{name}.offsets"), memoryview(self.array(f"{name}.data")))
+
+    def records(self, name: str) -> RecordTable:
+        """JSON record table section"""
+        return RecordTable(self.array(f"{name}.offsets"), memoryview(self.array(f"{name}.data")))
+
+    def is_stale(self) -> bool:
+        """Check whether a source JSON file changed since compiling"""
+        for source in self.sources.values():
+            if os.path.exists(source["path"]) and _source_info(source["path"]) != source:
+                return True
+        return False
+
+    def symptoms_db(self) -> Dict[str, Any]:
+        """Symptoms database (small, decoded once)"""
+        if self._symptoms_db is None:
+            self._symptoms_db = json.loads(memoryview(self.array("symptoms")).tobytes())
+        return self._symptoms_db
+
+    def medications_db(self) -> Dict[str, Any]:
+        """Medications database, with entries decoded on access"""
+        if self._medications is None:
+            self._medications = self.records("medications")
+        return {"common_medications": self._medications}
+
+    def interaction_index(self) -> "MappedInteractionIndex":
+        """Interaction index over the compiled pair table"""
+        return MappedInteractionIndex(self)
+
+    def medication_names(self) -> "MappedPhraseIndex":
+        """Medication name index over the compiled delete index"""
+        return MappedPhraseIndex(self)
+
+class MappedInteractionIndex(InteractionIndex):
+    """
+    InteractionIndex over a compiled knowledge base
+
+    Drug names are found by binary search in the sorted drug table and
+    pairs by searchsorted over the sorted pair codes, so nothing is
+    parsed up front; only the interaction records a lookup returns are
+    decoded.
+    """
+
+    def __init__(self, kb: KnowledgeBase):
+        """
+        Initialize index
+
+        Args:
+            kb: Open knowledge base
+        """
+        super().__init__()
+        self._drugs = kb.strings("drugs")
+        self._codes = kb.array("pairs.codes")
+        self._offsets = kb.array("pairs.offsets")
+        self._records = kb.records("interactions")
+        self._size = len(self._records)
+
+    def add(self, interaction: Dict[str, Any]) -> None:
+        """Compiled indexes are read-only"""
+        raise TypeError("a compiled interaction index is read-only")
+
+    @property
+    def pair_count(self) -> int:
+        """Number of distinct drug pairs with at least one interaction"""
+        return len(self._codes)
+
+    def _pair_records(self, codes: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """Records of each pair code (empty for pairs without interactions)"""
+        if not len(self._codes):
+            return [[] for _ in codes]
+        positions = np.minimum(np.searchsorted(self._codes, codes), len(self._codes) - 1)
+        found = []
+        for code, position in zip(codes.tolist(), positions.tolist()):
+            if self._codes[position] == code:
+                found.append(self._records[int(self._offsets[position]):int(self._offsets[position + 1])])
+            else:
+                found.append([])
+        return found
+
+    def _ids(self, medications: Sequence[str]) -> List[int]:
+        """Sorted distinct ids of the drugs that have any interaction"""
+        ids = {self._drugs.find(normalize_drug(name)) for name in medications}
+        ids.discard(None)
+        return sorted(ids)
+
+    def items(self) -> Iterator[Tuple[PairKey, List[Dict[str, Any]]]]:
+        """Iterate over (pair key, interaction records) for every pair"""
+        n_drugs = len(self._drugs)
+        for position, code in enumerate(self._codes.tolist()):
+            records = self._records[int(self._offsets[position]):int(self._offsets[position + 1])]
+            yield (self._drugs[code // n_drugs], self._drugs[code % n_drugs]), records
+
+    def lookup(self, drug1: str, drug2: str, min_severity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Interactions between two drugs
+
+        Args:
+            drug1: First drug name
+            drug2: Second drug name
+            min_severity: Only return interactions at least this severe
+
+        Returns:
+            Interaction records, most severe first
+        """
+        ids = self._ids(pair_key(drug1, drug2))
+        if len(ids) < 2:
+            return []
+
+        records = self._pair_records(np.array([ids[0] * len(self._drugs) + ids[1]], dtype=np.int64))[0]
+        if min_severity is None:
+            return records
+
+        threshold = severity_rank(min_severity)
+        return [record for record in records if severity_rank(record.get("severity")) >= threshold]
+
+    def check(self, medications: Sequence[str], min_severity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Interactions among a set of medications
+
+        Args:
+            medications: Drug names (duplicates and case variants are ignored)
+            min_severity: Only return interactions at least this severe
+
+        Returns:
+            Interaction records of every interacting pair, most severe first
+        """
+        ids = np.array(self._ids(medications), dtype=np.int64)
+        if len(ids) < 2:
+            return []
+
+        first, second = np.triu_indices(len(ids), k=1)
+        threshold = severity_rank(min_severity) if min_severity is not None else None
+
+        found = [
+            record
+            for records in self._pair_records(ids[first] * len(self._drugs) + ids[second])
+            for record in records
+            if threshold is None or severity_rank(record.get("severity")) >= threshold
+        ]
+        found.sort(key=lambda entry: -severity_rank(entry.get("severity")))
+        return found
+
+class MappedPhraseIndex(FuzzyPhraseIndex):
+    """
+    Medication name index over a compiled knowledge base
+
+    The vocabulary is a sorted string table, the symmetric-delete index
+    a sorted array of variant hashes (a hash collision only adds a
+    candidate that the edit-distance check then rejects), and phrases
+    are grouped by first word id.
+    """
+
+    def __init__(self, kb: KnowledgeBase):
+        """
+        Initialize index
+
+        Args:
+            kb: Open knowledge base
+        """
+        super().__init__(**MEDICATION_INDEX_OPTIONS)
+        self._words = kb.strings("words")
+        self._names = kb.strings("names")
+        self._delete_hashes = kb.array("deletes.hashes")
+        self._delete_words = kb.array("deletes.words")
+        self._phrase_first = kb.array("phrases.first")
+        self._phrase_offsets = kb.array("phrases.offsets")
+        self._phrase_words = kb.array("phrases.words")
+        self._phrase_values = kb.array("phrases.values")
+        self._phrase_cache: Dict[str, List[Tuple[Tuple[str, ...], Any]]] = {}
+
+    def add(self, phrase: str, value: Any = None) -> None:
+        """Compiled indexes are read-only"""
+        raise TypeError("a compiled phrase index is read-only")
+
+    def __len__(self) -> int:
+        """Number of indexed phrases"""
+        return len(self._phrase_first)
+
+    def _is_word(self, word: str) -> bool:
+        """Check whether a word is in the vocabulary"""
+        return self._words.find(word) is not None
+
+    def _targets(self, variant: str) -> List[str]:
+        """Vocabulary words whose delete variants hash like this one"""
+        # A NumPy scalar of the array's dtype keeps searchsorted from
+        # converting the whole (mapped) array for the comparison
+        digest = np.uint32(crc32(variant.encode("utf-8")))
+        start = int(np.searchsorted(self._delete_hashes, digest, side="left"))
+        end = int(np.searchsorted(self._delete_hashes, digest, side="right"))
+        return [self._words[int(word_id)] for word_id in self._delete_words[start:end]]
+
+    def _phrases_starting(self, word: str) -> List[Tuple[Tuple[str, ...], Any]]:
+        """(phrase words, generic name) of the phrases starting with a word"""
+        cached = self._phrase_cache.get(word)
+        if cached is not None:
+            return cached
+
+        phrases = []
+        word_id = self._words.find(word)
+        if word_id is not None:
+            word_id = np.uint32(word_id)
+            start = int(np.searchsorted(self._phrase_first, word_id, side="left"))
+            end = int(np.searchsorted(self._phrase_first, word_id, side="right"))
+            for position in range(start, end):
+                ids = self._phrase_words[int(self._phrase_offsets[position]):int(self._phrase_offsets[position + 1])]
+                phrases.append((
+                    tuple(self._words[int(i)] for i in ids),
+                    self._names[int(self._phrase_values[position])]
+                ))
+
+        if len(self._phrase_cache) >= RECORD_CACHE_SIZE:
+            self._phrase_cache.clear()
+        self._phrase_cache[word] = phrases
+        return phrases
+
+def open_knowledge_base(path: Optional[str] = None) -> Optional[KnowledgeBase]:
+    """
+    Open the compiled knowledge base if it can be used
+
+    Args:
+        path: Compiled file (default Config.KB_PATH)
+
+    Returns:
+        Knowledge base, or None if not compiled, unreadable or older than
+        its JSON sources (the JSON files are used instead)
+    """
+    path = path or Config.KB_PATH
+    if not os.path.exists(path):
+        return None
+
+    try:
+        kb = KnowledgeBase(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not open knowledge base {path}: {e}")
+        return None
+
+    if kb.is_stale():
+        logger.warning(f"{path} is older than its JSON sources, recompile it")
+        return None
+
+    logger.info(f"Knowledge base mapped from {path}")
+    return kb
+
+def main():
+    """Compile the configured JSON databases"""
+    output = sys.argv[1] if len(sys.argv) > 1 else Config.KB_PATH
+
+    start = time.perf_counter()
+    counts = compile_knowledge_base(output)
+    elapsed = time.perf_counter() - start
+
+    print(f"Compiled {', '.join(f'{count} {name}' for name, count in counts.items())}")
+    print(f"Wrote {os.path.getsize(output) / 1024:.1f} KiB to {output} in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Knowledge Service for MediMind AI
+Versioned snapshots of the symptom, medication and interaction databases
+with hot reload
+
+Every index built from the databases belongs to one immutable snapshot.
+A reload builds a complete new snapshot in the background and swaps it
+in with a single reference assignment, so a request pinned to a snapshot
+(see pinned_snapshot) finishes on the version it started with and never
+sees a half-updated mix. Reloads are triggered by polling the source
+files (Config.KB_RELOAD_INTERVAL) or by SIGHUP.
+"""
+
+import hashlib
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Tuple
+from src.config import Config
+from src.utils.helpers import load_json
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Signature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+class KnowledgeSnapshot(NamedTuple):
+    """One version of the databases and the indexes built from them"""
+    version: str  # Digest of the source files' identities (same across workers)
+    generation: int  # Reloads in this process, starting at 1
+    source: str  # "kb" (compiled file) or "json"
+    loaded_at: float
+    signature: Signature  # Source files' identities when loading started
+    symptoms_db: Dict[str, Any]
+    medications_db: Dict[str, Any]
+    interaction_index: Any  # InteractionIndex
+    medication_extractor: Any  # MedicationExtractor
+    emergency_screen: Any  # EmergencyScreen
+    keyword_matcher: Any  # KeywordMatcher
+    symptom_matcher: Any  # SymptomMatcher
+    kb: Any  # KnowledgeBase, if the compiled file was used
+
+def watched_paths() -> List[str]:
+    """Files whose changes trigger a reload"""
+    paths = [Config.SYMPTOMS_DB, Config.MEDICATIONS_DB, Config.INTERACTIONS_DB]
+    if Config.KB_ENABLED:
+        paths.append(Config.KB_PATH)
+    return paths
+
+def source_signature(paths: List[str]) -> Signature:
+    """Size and modification time of each file (None if missing)"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+def load_snapshot(generation: int = 1) -> KnowledgeSnapshot:
+    """
+    Load the databases and build every index
+
+    Args:
+        generation: Generation number of the new snapshot
+
+    Returns:
+        New snapshot
+
+    Raises:
+        OSError: If a database cannot be read
+        ValueError: If a database is not valid JSON (e.g. half written)
+    """
+    from src.utils.interactions import build_interaction_index
+    from src.utils.keyword_matcher import build_default_matcher
+    from src.utils.knowledge_base import open_knowledge_base
+    from src.utils.medication_extractor import MedicationExtractor
+    from src.utils.safety import build_emergency_screen
+    from src.utils.symptom_matcher import build_symptom_matcher
+
+    # Taken before reading, so a file changed while loading triggers another reload
+    signature = source_signature(watched_paths())
+
+    kb = open_knowledge_base() if Config.KB_ENABLED else None
+    if kb is not None:
+        symptoms_db = kb.symptoms_db()
+        medications_db = kb.medications_db()
+        interaction_index = kb.interaction_index()
+        medication_extractor = MedicationExtractor(index=kb.medication_names())
+    else:
+        symptoms_db = load_json(Config.SYMPTOMS_DB)
+        medications_db = load_json(Config.MEDICATIONS_DB)
+        interaction_index = build_interaction_index()
+        medication_extractor = MedicationExtractor(medications_db.get("common_medications", []))
+
+    return KnowledgeSnapshot(
+        version=hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:12],
+        generation=generation,
+        source="kb" if kb is not None else "json",
+        loaded_at=time.time(),
+        signature=signature,
+        symptoms_db=symptoms_db,
+        medications_db=medications_db,
+        interaction_index=interaction_index,
+        medication_extractor=medication_extractor,
+        emergency_screen=build_emergency_screen(symptoms_db),
+        keyword_matcher=build_default_matcher(symptoms_db, medications_db),
+        symptom_matcher=build_symptom_matcher(symptoms_db),
+        kb=kb
+    )
+
+class KnowledgeService:
+    """
+    Holder of the current knowledge snapshot
+
+    Readers take the current snapshot without locking (reading one
+    attribute is atomic); reloads are serialized and only replace it
+    once the new snapshot is fully built. A failed reload (e.g. a file
+    caught mid-write) keeps serving the previous version.
+    """
+
+    def __init__(self):
+        """Initialize service (the first snapshot is loaded on first use)"""
+        self._snapshot: Optional[KnowledgeSnapshot] = None
+        self._failed_signature: Optional[Signature] = None
+        self._reload_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def snapshot(self) -> KnowledgeSnapshot:
+        """Current snapshot"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._reload_lock:
+                if self._snapshot is None:
+                    self._snapshot = load_snapshot()
+                    logger.info(f"Knowledge snapshot {self._snapshot.version} loaded from {self._snapshot.source}")
+            snapshot = self._snapshot
+        return snapshot
+
+    def changed(self) -> bool:
+        """Check whether a source file changed since the current snapshot was loaded"""
+        snapshot = self._snapshot
+        signature = source_signature(watched_paths())
+        return (snapshot is None or signature != snapshot.signature) and signature != self._failed_signature
+
+    def reload(self, force: bool = False) -> KnowledgeSnapshot:
+        """
+        Build a new snapshot and swap it in
+
+        Args:
+            force: Reload even if no source file changed
+
+        Returns:
+            The current snapshot (the previous one if loading failed)
+        """
+        with self._reload_lock:
+            signature = source_signature(watched_paths())
+            if self._snapshot is not None and not force and signature == self._snapshot.signature:
+                return self._snapshot
+
+            generation = self._snapshot.generation + 1 if self._snapshot is not None else 1
+            start = time.perf_counter()
+            try:
+                snapshot = load_snapshot(generation)
+            except (OSError, ValueError) as e:
+                self._failed_signature = signature
+                logger.error(f"Knowledge reload failed, keeping the current version: {e}")
+                if self._snapshot is None:
+                    raise
+                return self._snapshot
+
+            self._snapshot = snapshot
+            self._failed_signature = None
+            logger.info(
+                f"Knowledge snapshot {snapshot.version} (generation {generation}) loaded from "
+                f"{snapshot.source} in {time.perf_counter() - start:.2f}s"
+            )
+            return snapshot
+
+    def request_reload(self) -> None:
+        """Reload in a background thread (one at a time; safe from a signal handler)"""
+        if self._reload_thread is not None and self._reload_thread.is_alive():
+            return
+        self._reload_thread = threading.Thread(
+            target=self.reload,
+            kwargs={"force": True},
+            name="medimind-knowledge-reload",
+            daemon=True
+        )
+        self._reload_thread.start()
+
+    def watch(self, interval: float) -> None:
+        """
+        Poll the source files and reload when one changes
+
+        Args:
+            interval: Seconds between checks
+        """
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+
+        def poll() -> None:
+            while not self._stop_watching.wait(interval):
+                if self.changed():
+                    self.reload()
+
+        self._stop_watching.clear()
+        self._watch_thread = threading.Thread(target=poll, name="medimind-knowledge-watch", daemon=True)
+        self._watch_thread.start()
+        logger.info(f"Watching knowledge files every {interval}s")
+
+    def stop_watching(self) -> None:
+        """Stop polling the source files"""
+        self._stop_watching.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+
+    def install_reload_signal(self, signum: Optional[int] = None) -> bool:
+        """
+        Reload when the process receives a signal
+
+        Args:
+            signum: Signal number (default SIGHUP)
+
+        Returns:
+            True if installed (only possible from the main thread, on
+            platforms with the signal)
+        """
+        signum = signum if signum is not None else getattr(signal, "SIGHUP", None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, lambda received, frame: self.request_reload())
+        return True
+
+_service: Optional[KnowledgeService] = None
+_service_lock = threading.Lock()
+
+# Snapshot a request is pinned to (copied into tasks it starts)
+_pinned: ContextVar[Optional[KnowledgeSnapshot]] = ContextVar("knowledge_snapshot", default=None)
+
+def get_knowledge_service() -> KnowledgeService:
+    """Get the shared knowledge service"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = KnowledgeService()
+    return _service
+
+def current_snapshot() -> KnowledgeSnapshot:
+    """The snapshot pinned to this request, else the service's current one"""
+    snapshot = _pinned.get()
+    return snapshot if snapshot is not None else get_knowledge_service().snapshot
+
+@contextmanager
+def pinned_snapshot() -> Iterator[KnowledgeSnapshot]:
+    """
+    Pin the current snapshot for the duration of a request
+
+    Code run inside the block (including asyncio tasks it creates) reads
+    this snapshot even if a reload swaps in a newer one meanwhile.
+
+    Yields:
+        Pinned snapshot
+    """
+    token = _pinned.set(current_snapshot())
+    try:
+        yield _pinned.get()
+    finally:
+        _pinned.reset(token)
+
+def get_symptoms_db() -> Dict[str, Any]:
+    """Symptoms database of the current snapshot"""
+    return current_snapshot().symptoms_db
+
+def get_medications_db() -> Dict[str, Any]:
+    """Medications database of the current snapshot"""
+    return current_snapshot().medications_db
@@ -0,0 +1,150 @@
+"""
+Medication Extractor for MediMind AI
+Finds drug mentions (generic names, brand names, synonyms and misspellings)
+and maps them to canonical generic names
+"""
+
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from src.config import Config
+from src.utils.fuzzy import FuzzyPhraseIndex, PhraseMatch, tokenize
+from src.utils.helpers import load_json
+from src.utils.knowledge_service import current_snapshot
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Name index options. Everyday words lie one edit from drug names
+# ("warfare", "payer" for Bayer), and a false mention reports
+# interactions and is saved to the patient's memory, so a misspelling
+# must keep its first letter, be off by one edit, and be of a name long
+# enough not to be an English word's neighbour.
+MEDICATION_INDEX_OPTIONS: Dict[str, Any] = {
+    "closest_only": True,
+    "max_edits": 1,
+    "same_first_letter": True,
+    "min_fuzzy_length": 6
+}
+
+class MedicationMention(NamedTuple):
+    """A medication found in text"""
+    name: str  # Canonical generic name
+    matched: str  # Formulary name that matched ("advil")
+    distance: int  # Spelling edits between the text and the matched name
+
+class MedicationExtractor:
+    """
+    Tokenizing medication extractor
+
+    Every generic name, brand name and synonym is indexed word by word
+    in a FuzzyPhraseIndex, so extraction costs a few hash lookups per
+    message word however large the formulary is, and misspellings
+    ("ibuprofin") within one edit are still found (see
+    MEDICATION_INDEX_OPTIONS).
+    Overlapping mentions resolve to the longest, then closest, name.
+    """
+
+    def __init__(self, medications: Iterable[Dict[str, Any]] = (), index: Optional[FuzzyPhraseIndex] = None):
+        """
+        Initialize extractor
+
+        Args:
+            medications: Formulary entries with name and optional
+                brand_names and synonyms lists
+            index: Prebuilt name index (phrase values are generic names),
+                e.g. from the compiled knowledge base
+        """
+        self._index = index if index is not None else FuzzyPhraseIndex(**MEDICATION_INDEX_OPTIONS)
+
+        for medication in medications:
+            self.add_medication(medication)
+
+    def add(self, name: str, canonical: str) -> None:
+        """
+        Index one name
+
+        Args:
+            name: Name as it may appear in text
+            canonical: Generic name reported for it
+        """
+        self._index.add(name, canonical)
+
+    def add_medication(self, medication: Dict[str, Any]) -> None:
+        """Index a formulary entry under its generic name"""
+        canonical = medication["name"]
+        for name in [canonical] + medication.get("brand_names", []) + medication.get("synonyms", []):
+            self.add(name, canonical)
+
+    def __len__(self) -> int:
+        """Number of indexed names"""
+        return len(self._index)
+
+    def find(self, text: str) -> List[MedicationMention]:
+        """
+        Find medication mentions in text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Non-overlapping mentions in order of appearance
+        """
+        return [
+            MedicationMention(match.value, match.phrase, match.distance)
+            for match in self._resolve(tokenize(text))
+        ]
+
+    def spans(self, words: Sequence[str]) -> List[Tuple[int, int, str]]:
+        """
+        Medication mentions in an already tokenized text
+
+        Args:
+            words: Lowercase words
+
+        Returns:
+            Non-overlapping (start, end, generic name) word ranges
+        """
+        return [(match.start, match.end, match.value) for match in self._resolve(words)]
+
+    def _resolve(self, words: Sequence[str]) -> List[PhraseMatch]:
+        """Non-overlapping matches in order (longest, then closest, name wins)"""
+        matches = self._index.find(words)
+        matches.sort(key=lambda match: (match.start, match.start - match.end, match.distance))
+
+        resolved = []
+        covered = 0
+        for match in matches:
+            if match.start >= covered:
+                resolved.append(match)
+                covered = match.end
+        return resolved
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Canonical names of the medications mentioned in text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Distinct generic names in order of first mention
+        """
+        return list(dict.fromkeys(mention.name for mention in self.find(text)))
+
+def build_medication_extractor(path: Optional[str] = None) -> MedicationExtractor:
+    """
+    Build an extractor from a medications database file
+
+    Args:
+        path: JSON file with a common_medications list (default Config.MEDICATIONS_DB)
+
+    Returns:
+        Medication extractor
+    """
+    path = path or Config.MEDICATIONS_DB
+    extractor = MedicationExtractor(load_json(path).get("common_medications", []))
+    logger.info(f"Medication extractor built: {len(extractor)} names")
+    return extractor
+
+def get_medication_extractor() -> MedicationExtractor:
+    """Get the medication extractor of the current knowledge snapshot"""
+    return current_snapshot().medication_extractor
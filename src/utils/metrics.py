@@ -4,7 +4,7 @@ Tracks agent performance, response times, and usage statistics
 """
 
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from src.utils.logger import get_logger
 
@@ -16,10 +16,13 @@ class MetricsTracker:
     
     Monitors:
     - Request counts per agent
-    - Response times
+    - Response times and time-to-first-token
     - Emergency detections
     - Drug interaction checks
     - Error rates
+    - Response cache hits/misses per agent
+    - Resilience events (retries, hedges, timeouts, circuit breaker)
+    - Prompt tokens used and saved per agent
     """
     
     def __init__(self):
@@ -33,20 +36,39 @@ class MetricsTracker:
                 "doctor_prep": 0
             },
             "response_times": [],
+            "first_token_times": [],
             "errors": 0,
             "emergency_detections": 0,
             "interactions_checked": 0,
+            "cache": {},
+            "resilience": {
+                "retries": 0,
+                "hedges": 0,
+                "hedge_wins": 0,
+                "timeouts": 0,
+                "circuit_opens": 0,
+                "fallbacks": 0
+            },
+            "circuit_states": {},
+            "tokens": {},
             "session_start": datetime.now()
         }
         logger.info("MetricsTracker initialized")
     
-    def track_request(self, agent_name: str, response_time: float):
+    def track_request(
+        self,
+        agent_name: str,
+        response_time: float,
+        first_token_time: Optional[float] = None
+    ):
         """
         Track a request to an agent
         
         Args:
             agent_name: Name of the agent that handled request
             response_time: Response time in seconds
+            first_token_time: Time to first streamed chunk in seconds
+                (None when the response was not streamed)
         """
         self.metrics["total_requests"] += 1
         
@@ -58,7 +80,11 @@ class MetricsTracker:
         
         self.metrics["response_times"].append(response_time)
         
-        logger.info(f"Request tracked: {agent_name} - {response_time:.2f}s")
+        if first_token_time is not None:
+            self.metrics["first_token_times"].append(first_token_time)
+            logger.info(f"Request tracked: {agent_name} - {response_time:.2f}s (first token {first_token_time:.2f}s)")
+        else:
+            logger.info(f"Request tracked: {agent_name} - {response_time:.2f}s")
     
     def track_error(self, error_type: str = "unknown"):
         """
@@ -80,6 +106,55 @@ class MetricsTracker:
         self.metrics["interactions_checked"] += 1
         logger.info("💊 Drug interaction check tracked")
     
+    def track_cache(self, agent_name: str, hit: bool):
+        """
+        Track a response cache lookup
+        
+        Args:
+            agent_name: Name of the agent that performed the lookup
+            hit: Whether the lookup was served from cache
+        """
+        stats = self.metrics["cache"].setdefault(agent_name, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+        logger.debug(f"Cache {'hit' if hit else 'miss'} tracked: {agent_name}")
+    
+    def track_resilience(self, event: str):
+        """
+        Track a resilience event
+        
+        Args:
+            event: One of retries, hedges, hedge_wins, timeouts,
+                circuit_opens or fallbacks
+        """
+        self.metrics["resilience"][event] = self.metrics["resilience"].get(event, 0) + 1
+        logger.debug(f"Resilience event tracked: {event}")
+    
+    def track_circuit_state(self, name: str, state: str):
+        """
+        Track a circuit breaker state change
+        
+        Args:
+            name: Name of the protected dependency
+            state: New state (closed, open or half_open)
+        """
+        self.metrics["circuit_states"][name] = state
+        logger.info(f"Circuit state tracked: {name} -> {state}")
+    
+    def track_tokens(self, agent_name: str, tokens_used: int, tokens_saved: int):
+        """
+        Track prompt tokens for a model call
+        
+        Args:
+            agent_name: Name of the agent making the call
+            tokens_used: Estimated input tokens sent
+            tokens_saved: Estimated input tokens trimmed by the budget
+        """
+        stats = self.metrics["tokens"].setdefault(agent_name, {"calls": 0, "used": 0, "saved": 0})
+        stats["calls"] += 1
+        stats["used"] += tokens_used
+        stats["saved"] += tokens_saved
+        logger.debug(f"Tokens tracked: {agent_name} - {tokens_used} used, {tokens_saved} saved")
+    
     def get_summary(self) -> Dict[str, Any]:
         """
         Get comprehensive metrics summary
@@ -93,6 +168,13 @@ class MetricsTracker:
             if self.metrics["response_times"] else 0
         )
         
+        # Calculate average time-to-first-token (streamed requests only)
+        first_token_times = self.metrics["first_token_times"]
+        avg_first_token_time = (
+            sum(first_token_times) / len(first_token_times)
+            if first_token_times else 0
+        )
+        
         # Calculate session duration
         session_duration = datetime.now() - self.metrics["session_start"]
         
@@ -102,9 +184,15 @@ class MetricsTracker:
             "average_response_time": round(avg_response_time, 2),
             "min_response_time": round(min(self.metrics["response_times"]), 2) if self.metrics["response_times"] else 0,
             "max_response_time": round(max(self.metrics["response_times"]), 2) if self.metrics["response_times"] else 0,
+            "average_time_to_first_token": round(avg_first_token_time, 2),
+            "streamed_requests": len(first_token_times),
             "errors": self.metrics["errors"],
             "emergency_detections": self.metrics["emergency_detections"],
             "interactions_checked": self.metrics["interactions_checked"],
+            "cache": {agent: dict(stats) for agent, stats in self.metrics["cache"].items()},
+            "resilience": dict(self.metrics["resilience"]),
+            "tokens": {agent: dict(stats) for agent, stats in self.metrics["tokens"].items()},
+            "circuit_states": dict(self.metrics["circuit_states"]),
             "session_duration": str(session_duration).split('.')[0],  # Remove microseconds
             "success_rate": round((1 - (self.metrics["errors"] / max(self.metrics["total_requests"], 1))) * 100, 1)
         }
@@ -125,6 +213,8 @@ class MetricsTracker:
         print(f"  • Average Response Time: {summary['average_response_time']}s")
         print(f"  • Fastest Response: {summary['min_response_time']}s")
         print(f"  • Slowest Response: {summary['max_response_time']}s")
+        if summary['streamed_requests']:
+            print(f"  • Average Time to First Token: {summary['average_time_to_first_token']}s")
         
         print(f"\n🤖 Agent Activity:")
         for agent, calls in summary['agent_calls'].items():
@@ -132,6 +222,30 @@ class MetricsTracker:
             percentage = (calls / max(summary['total_requests'], 1)) * 100
             print(f"  • {agent_name}: {calls} calls ({percentage:.1f}%)")
         
+        if summary['cache']:
+            print(f"\n🗄️  Response Cache:")
+            for agent, stats in summary['cache'].items():
+                lookups = stats['hits'] + stats['misses']
+                hit_rate = (stats['hits'] / max(lookups, 1)) * 100
+                print(f"  • {agent}: {stats['hits']} hits / {stats['misses']} misses ({hit_rate:.1f}%)")
+        
+        if summary['tokens']:
+            print(f"\n🔤 Prompt Tokens (estimated):")
+            for agent, stats in summary['tokens'].items():
+                average = stats['used'] / max(stats['calls'], 1)
+                print(f"  • {agent}: {stats['used']} used ({average:.0f}/call), {stats['saved']} saved")
+        
+        resilience = summary['resilience']
+        if any(resilience.values()):
+            print(f"\n🔁 Resilience:")
+            print(f"  • Retries: {resilience['retries']}")
+            print(f"  • Hedged Requests: {resilience['hedges']} ({resilience['hedge_wins']} won by hedge)")
+            print(f"  • Timeouts: {resilience['timeouts']}")
+            print(f"  • Circuit Opens: {resilience['circuit_opens']}")
+            print(f"  • Fallback Responses: {resilience['fallbacks']}")
+            for name, state in summary['circuit_states'].items():
+                print(f"  • Circuit '{name}': {state}")
+        
         print(f"\n🛡️  Safety Metrics:")
         print(f"  • Emergency Detections: {summary['emergency_detections']}")
         print(f"  • Drug Interaction Checks: {summary['interactions_checked']}")
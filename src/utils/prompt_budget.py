@@ -0,0 +1,191 @@
+"""
+Prompt Budget for MediMind AI
+Token estimation and budgeted prompt assembly for agent model calls
+"""
+
+import math
+import re
+from typing import Dict, Any, List, Optional, Sequence
+from src.config import Config
+
+# Fixed per-message overhead (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer
+
+    Uses the larger of ~4 characters per token and ~1.3 tokens per word,
+    which tracks SentencePiece-style tokenizers closely for English.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / 4), math.ceil(len(text.split()) * 1.3))
+
+def message_text(message: Dict[str, Any]) -> str:
+    """Concatenate the text parts of a conversation message"""
+    return " ".join(part.get("text", "") for part in message.get("parts", []))
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    """Estimate the token count of a conversation message"""
+    return estimate_tokens(message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to roughly max_tokens, preferring word boundaries"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    keep = max(0, int(max_tokens / 1.3))
+    return " ".join(words[:keep]) + " ..." if keep else ""
+
+def summarize_messages(messages: Sequence[Dict[str, Any]], max_tokens: int) -> str:
+    """
+    Extractive summary of dropped messages
+
+    Keeps the first sentence of each user message (what the user told
+    us), oldest first, until the token limit is reached.
+
+    Args:
+        messages: Messages to summarize
+        max_tokens: Token limit for the summary
+
+    Returns:
+        Summary text (empty if nothing fits)
+    """
+    points = []
+    used = 0
+    for message in messages:
+        if message.get("role") != "user":
+            continue
+        text = message_text(message).strip()
+        if not text:
+            continue
+        first_sentence = _SENTENCE_END.split(text, maxsplit=1)[0]
+        point = _truncate_to_tokens(first_sentence, 40)
+        cost = estimate_tokens(point) + 1
+        if used + cost > max_tokens:
+            break
+        points.append(f"- {point}")
+        used += cost
+    return "\n".join(points)
+
+class PromptAssembler:
+    """
+    Fits a model request into a token budget
+
+    Priority order: system instruction and current prompt (always kept),
+    then recent history (newest first), then retrieved long-term memory
+    and the rolling conversation summary.
+    History that does not fit is dropped oldest first and, budget
+    permitting, replaced by a short extractive summary.
+    """
+
+    def __init__(self, budget: int, summary_share: float = 0.15):
+        """
+        Initialize prompt assembler
+
+        Args:
+            budget: Maximum input tokens per call
+            summary_share: Fraction of the budget usable for memory and the
+                summary of dropped history
+        """
+        self.budget = budget
+        self.summary_share = summary_share
+
+    def assemble(
+        self,
+        system_instruction: str,
+        history: Sequence[Dict[str, Any]],
+        prompt: str,
+        memory: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build conversation contents within the budget
+
+        Args:
+            system_instruction: Agent system instruction
+            history: Conversation history (oldest first)
+            prompt: Current prompt
+            memory: Optional retrieved memory text
+            summary: Optional rolling summary of earlier conversation
+
+        Returns:
+            Dict with contents (new list, history is not modified),
+            tokens_used, tokens_saved and messages_dropped
+        """
+        prompt_message = {"role": "user", "parts": [{"text": prompt}]}
+        full_cost = (
+            estimate_tokens(system_instruction) +
+            message_tokens(prompt_message) +
+            sum(message_tokens(m) for m in history) +
+            (estimate_tokens(memory) + MESSAGE_OVERHEAD_TOKENS if memory else 0) +
+            (estimate_tokens(summary) + MESSAGE_OVERHEAD_TOKENS if summary else 0)
+        )
+
+        used = estimate_tokens(system_instruction) + message_tokens(prompt_message)
+        fits = full_cost <= self.budget
+        reserve = 0 if fits else int(self.budget * self.summary_share)
+
+        # Newest history first, leaving room for memory/summary
+        kept: List[Dict[str, Any]] = []
+        history_budget = self.budget - used - reserve
+        cutoff = len(history)
+        for index in range(len(history) - 1, -1, -1):
+            cost = message_tokens(history[index])
+            if cost > history_budget:
+                break
+            kept.append(history[index])
+            history_budget -= cost
+            used += cost
+            cutoff = index
+        kept.reverse()
+        dropped = history[:cutoff]
+
+        # Long-term memory and a summary of dropped history share the reserve
+        preamble_parts = []
+        remaining = self.budget - used if fits else min(reserve, self.budget - used)
+        if memory and remaining > MESSAGE_OVERHEAD_TOKENS:
+            memory_text = _truncate_to_tokens(memory, remaining - MESSAGE_OVERHEAD_TOKENS)
+            if memory_text:
+                preamble_parts.append(f"Relevant patient history:\n{memory_text}")
+                remaining -= estimate_tokens(memory_text)
+        earlier = []
+        if summary and remaining > MESSAGE_OVERHEAD_TOKENS + 8:
+            summary_text = _truncate_to_tokens(summary, remaining - MESSAGE_OVERHEAD_TOKENS - 8)
+            if summary_text:
+                earlier.append(summary_text)
+                remaining -= estimate_tokens(summary_text)
+        if dropped and remaining > MESSAGE_OVERHEAD_TOKENS + 8:
+            dropped_summary = summarize_messages(dropped, remaining - MESSAGE_OVERHEAD_TOKENS - 8)
+            if dropped_summary:
+                earlier.append(dropped_summary)
+        if earlier:
+            preamble_parts.append("Earlier in this conversation:\n" + "\n".join(earlier))
+
+        contents: List[Dict[str, Any]] = []
+        if preamble_parts:
+            preamble = {"role": "user", "parts": [{"text": "\n\n".join(preamble_parts)}]}
+            contents.append(preamble)
+            used += message_tokens(preamble)
+        contents.extend(kept)
+        contents.append(prompt_message)
+
+        return {
+            "contents": contents,
+            "tokens_used": used,
+            "tokens_saved": max(0, full_cost - used),
+            "messages_dropped": len(dropped)
+        }
+
+def get_assembler(agent_name: str) -> PromptAssembler:
+    """Get a prompt assembler with the agent's configured budget"""
+    return PromptAssembler(Config.TOKEN_BUDGETS.get(agent_name, Config.DEFAULT_TOKEN_BUDGET))
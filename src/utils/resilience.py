@@ -0,0 +1,354 @@
+"""
+Resilience utilities for MediMind AI
+Deadlines, retries with jittered backoff, hedged requests and a circuit breaker
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.backends.base import BackendError
+from src.config import Config
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics_tracker
+
+logger = get_logger(__name__)
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs out of time"""
+    pass
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call"""
+    pass
+
+class Deadline:
+    """Absolute point in time by which a request must complete"""
+
+    def __init__(self, timeout: float):
+        """
+        Initialize deadline
+
+        Args:
+            timeout: Seconds from now until the deadline
+        """
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed"""
+        return self.remaining() <= 0
+
+class CircuitBreaker:
+    """
+    Circuit breaker for an upstream dependency
+
+    closed    -> calls flow; consecutive failures are counted
+    open      -> calls fail fast until recovery_timeout has passed
+    half_open -> one trial call; success closes, failure re-opens
+
+    Every allowed call must end in record_success, record_failure or
+    release, or a half-open breaker never admits another trial.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Name of the protected dependency
+            failure_threshold: Consecutive failures before opening
+            recovery_timeout: Seconds to stay open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a call may proceed"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+                metrics_tracker.track_circuit_state(self.name, self.state)
+
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        with self._lock:
+            if self.state != "closed":
+                logger.info(f"Circuit '{self.name}' closed")
+                metrics_tracker.track_circuit_state(self.name, "closed")
+            self.state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        End a call without a verdict on the upstream
+
+        For calls that were cancelled, ran out of the caller's time or
+        were rejected as bad requests; a half-open breaker admits the
+        next trial.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if needed"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+
+            if self.state == "half_open" or (
+                self.state == "closed" and self._failures >= self.failure_threshold
+            ):
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                metrics_tracker.track_resilience("circuit_opens")
+                metrics_tracker.track_circuit_state(self.name, self.state)
+                logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures")
+
+class LatencyTracker:
+    """Sliding window of recent call latencies"""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize latency tracker
+
+        Args:
+            window: Number of recent samples to keep
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """Record a call latency in seconds"""
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile, or None without enough samples"""
+        with self._lock:
+            if len(self._samples) < Config.HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(pct / 100 * len(ordered)))
+        return ordered[index]
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether a failed call may succeed if retried"""
+    if isinstance(error, BackendError):
+        return error.retryable
+    return isinstance(error, (ConnectionError, asyncio.TimeoutError))
+
+def backoff_delay(attempt: int, rng: Optional[random.Random] = None) -> float:
+    """
+    Full-jitter exponential backoff
+
+    Args:
+        attempt: Zero-based retry attempt
+        rng: Random number generator
+
+    Returns:
+        Delay in seconds, uniform in [0, min(cap, base * 2^attempt)]
+    """
+    ceiling = min(Config.RETRY_MAX_DELAY, Config.RETRY_BASE_DELAY * (2 ** attempt))
+    return (rng or random).uniform(0, ceiling)
+
+class ResilientExecutor:
+    """
+    Runs model calls under a deadline with retries, hedging and a breaker
+
+    Attempt factories are zero-argument callables returning a fresh
+    awaitable, so a call can be retried or hedged by invoking the
+    factory again.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, latency: LatencyTracker):
+        """
+        Initialize executor
+
+        Args:
+            breaker: Circuit breaker for the upstream
+            latency: Latency tracker used to size the hedge delay
+        """
+        self.breaker = breaker
+        self.latency = latency
+
+    def hedge_delay(self) -> Optional[float]:
+        """Delay before firing a hedge request (None disables hedging)"""
+        if not Config.HEDGING_ENABLED:
+            return None
+        p95 = self.latency.percentile(95)
+        if p95 is None:
+            return None
+        return max(p95, Config.HEDGE_MIN_DELAY)
+
+    async def call(
+        self,
+        make_attempt: Callable[[], Awaitable[Any]],
+        deadline: Deadline,
+        hedge: bool = True,
+        can_retry: Optional[Callable[[], bool]] = None
+    ) -> Any:
+        """
+        Run a call with retries, optional hedging and the circuit breaker
+
+        Args:
+            make_attempt: Factory creating one attempt
+            deadline: Deadline for the whole call including retries
+            hedge: Whether hedging may be used (not for streams)
+            can_retry: Extra predicate that must hold to retry (e.g. no
+                chunks have been streamed yet)
+
+        Returns:
+            Result of the first successful attempt
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(f"Circuit '{self.breaker.name}' is open")
+
+            try:
+                result = await self._attempt(make_attempt, deadline, self.hedge_delay() if hedge else None)
+            except DeadlineExceeded:
+                # The caller's time ran out, which says nothing about the upstream
+                self.breaker.release()
+                metrics_tracker.track_resilience("timeouts")
+                raise
+            except Exception as e:
+                # Only upstream trouble counts; a bad request (4xx) would fail anywhere
+                if is_retryable(e):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release()
+
+                retryable = is_retryable(e) and (can_retry is None or can_retry())
+                if not retryable or attempt >= Config.MAX_RETRIES:
+                    raise
+
+                delay = backoff_delay(attempt)
+                if delay >= deadline.remaining():
+                    metrics_tracker.track_resilience("timeouts")
+                    raise DeadlineExceeded("No time left to retry") from e
+
+                metrics_tracker.track_resilience("retries")
+                logger.warning(f"Retrying after error ({str(e)}) in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled (fan-out, an outer wait_for): give back a half-open trial
+                self.breaker.release()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+    async def _timed(self, make_attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one attempt and record its latency on success"""
+        start = time.monotonic()
+        result = await make_attempt()
+        self.latency.record(time.monotonic() - start)
+        return result
+
+    async def _attempt(
+        self,
+        make_attempt: Callable[[], Awaitable[Any]],
+        deadline: Deadline,
+        hedge_delay: Optional[float]
+    ) -> Any:
+        """Run one (possibly hedged) attempt within the deadline"""
+        if deadline.expired:
+            raise DeadlineExceeded("Deadline expired before the call")
+
+        primary = asyncio.ensure_future(self._timed(make_attempt))
+
+        if hedge_delay is None or hedge_delay >= deadline.remaining():
+            try:
+                return await asyncio.wait_for(primary, deadline.remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("Model call exceeded its deadline")
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        # Primary is slow: fire a hedge and take whichever finishes first
+        metrics_tracker.track_resilience("hedges")
+        hedge_task = asyncio.ensure_future(self._timed(make_attempt))
+        pending = {primary, hedge_task}
+        last_error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=deadline.remaining(),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise DeadlineExceeded("Hedged model call exceeded its deadline")
+
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            metrics_tracker.track_resilience("hedge_wins")
+                        return task.result()
+                    last_error = task.exception()
+
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+# Shared breakers (per backend) and latency trackers (per agent)
+_breakers: Dict[str, CircuitBreaker] = {}
+_latency_trackers: Dict[str, LatencyTracker] = {}
+_registry_lock = threading.Lock()
+
+def get_executor(backend_name: str, agent_name: str) -> ResilientExecutor:
+    """
+    Get an executor sharing the backend's breaker and the agent's latency history
+
+    Args:
+        backend_name: Name of the model backend
+        agent_name: Name of the calling agent
+
+    Returns:
+        Resilient executor
+    """
+    with _registry_lock:
+        breaker = _breakers.get(backend_name)
+        if breaker is None:
+            breaker = _breakers[backend_name] = CircuitBreaker(
+                backend_name,
+                Config.CIRCUIT_FAILURE_THRESHOLD,
+                Config.CIRCUIT_RECOVERY_TIMEOUT
+            )
+
+        latency = _latency_trackers.get(agent_name)
+        if latency is None:
+            latency = _latency_trackers[agent_name] = LatencyTracker()
+
+    return ResilientExecutor(breaker, latency)
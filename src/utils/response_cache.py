@@ -0,0 +1,259 @@
+"""
+Response Cache for MediMind AI
+Two-tier LLM response cache: in-memory LRU plus optional shared SQLite tier
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from src.config import Config
+from src.utils.helpers import ensure_directory
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def _normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivially different inputs share a key"""
+    return " ".join(text.split()).casefold()
+
+def make_cache_key(
+    model: str,
+    system_instruction: str,
+    temperature: float,
+    top_p: float,
+    history: List[Dict[str, Any]],
+    prompt: str
+) -> str:
+    """
+    Build a stable cache key for a model request
+
+    Args:
+        model: Model name
+        system_instruction: Agent system instruction
+        temperature: Sampling temperature
+        top_p: Nucleus sampling parameter
+        history: Conversation history sent with the request
+        prompt: Current prompt
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    normalized_history = [
+        [
+            message.get("role", ""),
+            _normalize_text(" ".join(part.get("text", "") for part in message.get("parts", [])))
+        ]
+        for message in history
+    ]
+
+    payload = json.dumps(
+        {
+            "model": model,
+            "system_instruction": system_instruction,
+            "temperature": temperature,
+            "top_p": top_p,
+            "history": normalized_history,
+            "prompt": _normalize_text(prompt)
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LRUCache:
+    """
+    In-memory LRU cache with TTL and size-based eviction
+
+    Entries are evicted least-recently-used first once either the entry
+    count or the total stored text size exceeds its limit.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 8 * 1024 * 1024, ttl: float = 3600.0):
+        """
+        Initialize LRU cache
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses in bytes
+            ttl: Time-to-live for each entry in seconds
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at, size = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._size -= size
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, expires_at: Optional[float] = None) -> None:
+        """Store a value, evicting old entries as needed"""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[2]
+
+            self._entries[key] = (value, expires_at or time.time() + self.ttl, size)
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache:
+    """
+    On-disk cache tier backed by SQLite
+
+    Uses WAL journaling so several worker processes can read and write
+    the same cache file concurrently.
+    """
+
+    def __init__(self, db_path: str, ttl: float = 3600.0):
+        """
+        Initialize SQLite cache
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl: Time-to-live for each entry in seconds
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+
+        if os.path.dirname(db_path):
+            ensure_directory(os.path.dirname(db_path))
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection (safe across threads and processes)"""
+        return sqlite3.connect(self.db_path, timeout=5.0)
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Get (value, expires_at) for a key, or None if missing or expired"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM response_cache WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            return row
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed: {str(e)}")
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, time.time() + self.ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {str(e)}")
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache")
+
+class ResponseCache:
+    """
+    Two-tier response cache
+
+    Lookups try the in-memory LRU first, then the shared SQLite tier
+    (promoting hits into memory). Writes go to both tiers.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        """
+        Initialize response cache
+
+        Args:
+            memory: In-memory tier
+            disk: Optional on-disk tier shared between processes
+        """
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response"""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        if self.disk is not None:
+            row = self.disk.get(key)
+            if row is not None:
+                value, expires_at = row
+                self.memory.set(key, value, expires_at)
+                return value
+
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response in all tiers"""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self) -> None:
+        """Clear all tiers"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+def create_response_cache() -> ResponseCache:
+    """Build the response cache from Config settings"""
+    memory = LRUCache(
+        max_entries=Config.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=Config.RESPONSE_CACHE_MAX_BYTES,
+        ttl=Config.RESPONSE_CACHE_TTL
+    )
+
+    disk = None
+    if Config.RESPONSE_CACHE_DB_PATH:
+        disk = SQLiteCache(Config.RESPONSE_CACHE_DB_PATH, ttl=Config.RESPONSE_CACHE_TTL)
+
+    return ResponseCache(memory, disk)
+
+# Global response cache instance
+response_cache = create_response_cache()
@@ -0,0 +1,145 @@
+"""
+Safety Screen for MediMind AI
+Typo-tolerant emergency detection that runs before any routing or model call
+"""
+
+from typing import Dict, Any, Iterable, List, Optional
+from src.config import Config
+from src.utils.fuzzy import FuzzyPhraseIndex, content_words
+from src.utils.knowledge_service import current_snapshot, get_symptoms_db
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EMERGENCY_RESPONSE = """🚨 EMERGENCY ALERT 🚨
+
+Based on your symptoms, this may require IMMEDIATE medical attention.
+
+PLEASE:
+1. Call emergency services (911) immediately
+2. Or go to the nearest emergency room
+3. Do not wait or try to treat this at home
+
+This is not something that can be safely managed through this app.
+
+Your safety is the priority. Please seek emergency medical care now."""
+
+# Value marking a symptom name (as opposed to one of its red flags)
+_SYMPTOM = "__symptom__"
+
+class EmergencyScreen:
+    """
+    Typo-tolerant emergency phrase detector
+
+    Phrases are matched through a FuzzyPhraseIndex, so misspellings
+    ("chest pian", "heart atack") are caught in a few dictionary lookups
+    per message word. A word may be off by one edit at most and must
+    keep its first letter, so everyday near-words ("overdue",
+    "subconscious") do not pass for emergency words.
+
+    Emergency keywords always trigger. Symptom red flags are qualifiers
+    ("with stiff neck", "lasting more than 3 days"), so they trigger only
+    when their symptom is mentioned too, by name or by an alias
+    ("migraine" for headache). Red flags naming their symptom ("worst
+    headache ever") are also indexed with each alias in its place.
+    """
+
+    def __init__(self, emergency_phrases: Iterable[str], red_flags: Optional[Dict[str, List[str]]] = None,
+                 aliases: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize screen
+
+        Args:
+            emergency_phrases: Phrases that always indicate an emergency
+            red_flags: Red-flag phrases per symptom name
+            aliases: Other names per symptom name (its synonyms)
+        """
+        self._index = FuzzyPhraseIndex(max_edits=1, same_first_letter=True)
+        self._symptom_names: Dict[str, str] = {}  # Indexed name or alias -> symptom name
+        aliases = aliases or {}
+
+        for phrase in emergency_phrases:
+            self._add(phrase, None)
+        for symptom, flags in (red_flags or {}).items():
+            names = [symptom] + list(aliases.get(symptom, []))
+            for name in names:
+                self._symptom_names[self._add(name, _SYMPTOM)] = symptom
+            for flag in flags:
+                self._add(flag, symptom)
+                flag_text = f" {self._normalize(flag)} "
+                symptom_text = f" {self._normalize(symptom)} "
+                if symptom_text in flag_text:
+                    for alias in names[1:]:
+                        self._add(flag_text.replace(symptom_text, f" {self._normalize(alias)} "), symptom)
+
+    @staticmethod
+    def _normalize(phrase: str) -> str:
+        """A phrase as indexed (lowercase content words)"""
+        return " ".join(content_words(phrase))
+
+    def _add(self, phrase: str, requires: Optional[str]) -> str:
+        """
+        Index a phrase
+
+        Args:
+            phrase: Phrase to find
+            requires: Symptom that must also be mentioned (None for none)
+
+        Returns:
+            The phrase as indexed
+        """
+        normalized = self._normalize(phrase)
+        self._index.add(normalized, requires)
+        return normalized
+
+    def check(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Screen a message for emergencies
+
+        Args:
+            text: User message
+
+        Returns:
+            Dict with the matched phrase (and symptom for red flags),
+            or None if no emergency was found
+        """
+        matches = self._index.find(content_words(text))
+        symptoms = {self._symptom_names[match.phrase] for match in matches if match.value == _SYMPTOM}
+
+        for match in matches:
+            if match.value is None or match.value in symptoms:
+                result = {"phrase": match.phrase}
+                if match.value is not None:
+                    result["symptom"] = match.value
+                return result
+
+        return None
+
+def build_emergency_screen(symptoms_db: Optional[Dict[str, Any]] = None) -> EmergencyScreen:
+    """
+    Build the screen from Config.EMERGENCY_KEYWORDS and the symptoms'
+    emergency red flags
+
+    Only each symptom's emergency_red_flags escalate here; its other red
+    flags ("headache with fever") are warning signs the symptom analyzer
+    raises in its answer. Symptom synonyms are aliases, so a red flag
+    next to a synonym ("migraine with stiff neck") escalates like one
+    next to the name.
+
+    Args:
+        symptoms_db: Symptoms database (default: the current knowledge snapshot's)
+
+    Returns:
+        Emergency screen
+    """
+    symptoms_db = symptoms_db if symptoms_db is not None else get_symptoms_db()
+    symptoms = symptoms_db.get("common_symptoms", [])
+    return EmergencyScreen(
+        Config.EMERGENCY_KEYWORDS,
+        {symptom["name"]: symptom.get("emergency_red_flags", []) for symptom in symptoms},
+        {symptom["name"]: symptom.get("synonyms", []) for symptom in symptoms}
+    )
+
+def get_emergency_screen() -> EmergencyScreen:
+    """Get the emergency screen of the current knowledge snapshot"""
+    return current_snapshot().emergency_screen
@@ -0,0 +1,335 @@
+"""
+Bulk Interaction Screening for MediMind AI
+Vectorized drug-interaction screening of many patients' medication lists
+
+Screen the memory bank (or a JSONL file of {"patient_id", "medications"})
+and stream a JSONL report of patients with interactions:
+    python -m src.utils.screening [source] [-o report.jsonl] [--workers N]
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+import numpy as np
+from src.config import Config
+from src.memory.storage import get_memory_store, open_memory_store
+from src.utils.interactions import (
+    InteractionIndex, build_interaction_index, normalize_drug, severity_rank
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Patient = Tuple[str, Sequence[str]]
+
+# Distinct medication spellings whose drug id is remembered
+NAME_CACHE_SIZE = 100000
+
+class InteractionScreener:
+    """
+    Screens many medication lists at once
+
+    Drugs are encoded as integer ids and every interacting pair as the
+    code lo * n_drugs + hi, kept in a sorted array (a sparse adjacency
+    matrix in coordinate form). Patients with the same number of known
+    drugs are stacked into a matrix, all their pairs are encoded at once
+    and found with one searchsorted call, so the per-pair work happens
+    in NumPy rather than in a Python loop.
+    """
+
+    def __init__(self, index: InteractionIndex, min_severity: Optional[str] = None):
+        """
+        Initialize screener
+
+        Args:
+            index: Interaction index to screen against
+            min_severity: Only report interactions at least this severe
+        """
+        self.min_severity = min_severity
+        threshold = severity_rank(min_severity) if min_severity is not None else None
+
+        pairs = []
+        for key, records in index.items():
+            if threshold is not None:
+                records = [r for r in records if severity_rank(r.get("severity")) >= threshold]
+            if records:
+                pairs.append((key, records))
+
+        self._ids: Dict[str, int] = {}
+        for (first, second), _ in pairs:
+            self._ids.setdefault(first, len(self._ids))
+            self._ids.setdefault(second, len(self._ids))
+        self.n_drugs = len(self._ids)
+
+        codes = np.array([self._code(self._ids[first], self._ids[second]) for (first, second), _ in pairs], dtype=np.int64)
+        order = np.argsort(codes)
+        self._codes = codes[order]
+        # Records carry their severity rank so results sort without re-ranking
+        self._records = [
+            [(severity_rank(record.get("severity")), record) for record in pairs[i][1]]
+            for i in order
+        ]
+        self._triu_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._name_cache: Dict[str, int] = {}
+
+        logger.info(f"Screener ready: {self.n_drugs} drugs, {len(self._codes)} interacting pairs")
+
+    def _code(self, first: int, second: int) -> int:
+        """Code of an unordered id pair"""
+        low, high = (first, second) if first < second else (second, first)
+        return low * self.n_drugs + high
+
+    def _triu(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Column indices of every pair i < j among size drugs"""
+        if size not in self._triu_cache:
+            self._triu_cache[size] = np.triu_indices(size, k=1)
+        return self._triu_cache[size]
+
+    def encode(self, medications: Iterable[str]) -> List[int]:
+        """
+        Encode a medication list
+
+        Args:
+            medications: Drug names
+
+        Returns:
+            Sorted distinct ids of the drugs that have any interaction
+            (other drugs cannot contribute a pair and are dropped)
+        """
+        cache = self._name_cache
+        encoded = set()
+        for name in medications:
+            drug_id = cache.get(name)
+            if drug_id is None:
+                if len(cache) >= NAME_CACHE_SIZE:
+                    cache.clear()
+                drug_id = cache[name] = self._ids.get(normalize_drug(name), -1)
+            if drug_id >= 0:
+                encoded.add(drug_id)
+        return sorted(encoded)
+
+    def screen_batch(self, patients: Sequence[Patient]) -> List[Dict[str, Any]]:
+        """
+        Screen a batch of patients
+
+        Args:
+            patients: (patient_id, medications) pairs
+
+        Returns:
+            One result per patient with patient_id, medications and
+            interactions (most severe first)
+        """
+        encoded = [self.encode(medications) for _, medications in patients]
+        found: List[List[Tuple[int, Dict[str, Any]]]] = [[] for _ in patients]
+
+        by_size = defaultdict(list)
+        for row, ids in enumerate(encoded):
+            if len(ids) > 1:
+                by_size[len(ids)].append(row)
+
+        if len(self._codes):
+            for size, rows in by_size.items():
+                matrix = np.array([encoded[row] for row in rows], dtype=np.int64)
+                first, second = self._triu(size)
+                codes = matrix[:, first] * self.n_drugs + matrix[:, second]
+
+                positions = np.minimum(np.searchsorted(self._codes, codes), len(self._codes) - 1)
+                hit_rows, hit_columns = np.nonzero(self._codes[positions] == codes)
+                for row, position in zip(hit_rows.tolist(), positions[hit_rows, hit_columns].tolist()):
+                    found[rows[row]].extend(self._records[position])
+
+        results = []
+        for (patient_id, medications), interactions in zip(patients, found):
+            interactions.sort(key=itemgetter(0), reverse=True)
+            results.append({
+                "patient_id": patient_id,
+                "medications": list(medications),
+                "interactions": [record for _, record in interactions]
+            })
+        return results
+
+    def screen(self, patients: Iterable[Patient], batch_size: int = 2048) -> Iterator[Dict[str, Any]]:
+        """
+        Screen patients in batches
+
+        Args:
+            patients: (patient_id, medications) pairs
+            batch_size: Patients per vectorized batch
+
+        Yields:
+            One result per patient, in input order
+        """
+        for batch in _batches(patients, batch_size):
+            yield from self.screen_batch(batch)
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _report_batch(
+    screener: InteractionScreener,
+    batch: List[Patient],
+    include_clean: bool
+) -> Tuple[List[str], Dict[str, int]]:
+    """Screen a batch into report lines and counts"""
+    lines = []
+    counts = {"patients": len(batch), "flagged": 0, "interactions": 0}
+    for result in screener.screen_batch(batch):
+        if result["interactions"]:
+            counts["flagged"] += 1
+            counts["interactions"] += len(result["interactions"])
+        if result["interactions"] or include_clean:
+            lines.append(json.dumps(result, ensure_ascii=False) + "\n")
+    return lines, counts
+
+# Screener of a worker process (built once by the pool initializer)
+_worker_screener: Optional[InteractionScreener] = None
+_worker_include_clean = False
+
+def _init_worker(interactions_path: str, min_severity: Optional[str], include_clean: bool) -> None:
+    """Build the worker's screener"""
+    global _worker_screener, _worker_include_clean
+    _worker_screener = InteractionScreener(build_interaction_index(interactions_path), min_severity)
+    _worker_include_clean = include_clean
+
+def _report_in_worker(batch: List[Patient]) -> Tuple[List[str], Dict[str, int]]:
+    """Screen a batch in a worker process (lines are cheaper to send back than dicts)"""
+    return _report_batch(_worker_screener, batch, _worker_include_clean)
+
+def screen_to_jsonl(
+    patients: Iterable[Patient],
+    output: TextIO,
+    interactions_path: Optional[str] = None,
+    min_severity: Optional[str] = None,
+    batch_size: int = 2048,
+    workers: int = 0,
+    include_clean: bool = False
+) -> Dict[str, Any]:
+    """
+    Screen patients and stream a JSONL report
+
+    Args:
+        patients: (patient_id, medications) pairs, read lazily
+        output: Text stream receiving one JSON object per line
+        interactions_path: Interaction database (default Config.INTERACTIONS_DB)
+        min_severity: Only report interactions at least this severe
+        batch_size: Patients per vectorized batch
+        workers: Worker processes (0 screens in this process); batches
+            are written in input order either way
+        include_clean: Also write patients without interactions
+
+    Returns:
+        Summary with patients screened, patients flagged and interactions found
+    """
+    interactions_path = interactions_path or Config.INTERACTIONS_DB
+    summary = {"patients": 0, "flagged": 0, "interactions": 0}
+    start = time.perf_counter()
+
+    if workers > 0:
+        pool = multiprocessing.Pool(workers, _init_worker, (interactions_path, min_severity, include_clean))
+        reports = pool.imap(_report_in_worker, _batches(patients, batch_size))
+    else:
+        pool = None
+        screener = InteractionScreener(build_interaction_index(interactions_path), min_severity)
+        reports = (_report_batch(screener, batch, include_clean) for batch in _batches(patients, batch_size))
+
+    try:
+        for lines, counts in reports:
+            output.writelines(lines)
+            for key, value in counts.items():
+                summary[key] += value
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    output.flush()
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(
+        f"Screened {summary['patients']} patients: {summary['flagged']} flagged, "
+        f"{summary['interactions']} interactions in {summary['seconds']}s"
+    )
+    return summary
+
+def iter_memory_bank_patients(path: Optional[str] = None) -> Iterator[Patient]:
+    """
+    Patients of a memory store
+
+    Args:
+        path: Memory bank JSON or SQLite database (default: the configured store)
+
+    Yields:
+        (user_id, medications) pairs
+    """
+    store = open_memory_store(path) if path else get_memory_store()
+    for user_id, memory in store.iter_users():
+        yield user_id, memory.get("medications", [])
+
+def iter_jsonl_patients(path: str) -> Iterator[Patient]:
+    """
+    Patients of a JSONL file, read line by line
+
+    Args:
+        path: File with one {"patient_id", "medications"} object per line
+
+    Yields:
+        (patient_id, medications) pairs
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                record = json.loads(line)
+                yield str(record.get("patient_id", record.get("user_id", number))), record.get("medications", [])
+
+def main():
+    """Screen a patient source and write the report"""
+    parser = argparse.ArgumentParser(description="Screen patients' medication lists for drug interactions")
+    parser.add_argument("source", nargs="?",
+                        help="memory bank JSON or database, or patients JSONL (default: the memory store)")
+    parser.add_argument("-o", "--output", default="-", help="report path (default: stdout)")
+    parser.add_argument("--interactions", default=Config.INTERACTIONS_DB, help="interaction database")
+    parser.add_argument("--min-severity", default=Config.INTERACTION_MIN_SEVERITY,
+                        help="only report interactions at least this severe")
+    parser.add_argument("--batch-size", type=int, default=2048, help="patients per vectorized batch")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: none)")
+    parser.add_argument("--include-clean", action="store_true", help="also report patients without interactions")
+    args = parser.parse_args()
+
+    patients = iter_jsonl_patients(args.source) if args.source and args.source.endswith(".jsonl") \
+        else iter_memory_bank_patients(args.source)
+    output = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8')
+
+    try:
+        summary = screen_to_jsonl(
+            patients,
+            output,
+            args.interactions,
+            args.min_severity,
+            args.batch_size,
+            args.workers,
+            args.include_clean
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(
+        f"Screened {summary['patients']} patients: {summary['flagged']} flagged, "
+        f"{summary['interactions']} interactions ({summary['seconds']}s)",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Semantic Cache for MediMind AI
+Near-duplicate cache for first-turn queries using local hashed n-gram TF-IDF
+"""
+
+import copy
+import threading
+import zlib
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Sequence
+import numpy as np
+from src.config import Config
+from src.utils.fuzzy import tokenize
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Contracted endings, expanded so "I've got" and "I have" read the same
+CONTRACTIONS = (("n't", " not"), ("'ve", " have"), ("'m", " am"), ("'re", " are"),
+                ("'ll", " will"), ("'d", " would"), ("'s", ""))
+
+# Words that do not change what is being asked; negations are kept
+STOPWORDS = frozenset("""
+    a an the i me my mine myself am is are was were be been being have has had having
+    got get gets getting do does did and or but so to of for in on at by it its this that
+    these those there here very really just quite some any bit little kind sort like
+    feel feeling felt can could would should will may might must about please together
+    also tell know want safe ok okay
+""".split())
+
+NEGATIONS = frozenset(("not", "no", "never", "without"))
+
+class CanonicalQuery(NamedTuple):
+    """A query reduced to what it asks"""
+    words: List[str]  # Content words, mentions replaced by canonical names
+    concepts: List[str]  # Symptoms and medications mentioned, sorted
+    negated: bool
+
+def canonicalize(text: str) -> CanonicalQuery:
+    """
+    Reduce a query to its content words
+
+    Contractions are expanded, filler words dropped, and symptom and
+    medication mentions (names, synonyms, brand names, misspellings)
+    replaced by their canonical names from the current knowledge
+    snapshot, so "my head hurts" and "I've got a headache" both read
+    "headache".
+
+    Args:
+        text: User query
+
+    Returns:
+        Canonical query
+    """
+    from src.utils.medication_extractor import get_medication_extractor
+    from src.utils.symptom_matcher import get_symptom_matcher
+
+    words = []
+    for word in tokenize(text):
+        for ending, expansion in CONTRACTIONS:
+            if word.endswith(ending) and word != ending:
+                word = word[:-len(ending)] + expansion
+                break
+        words.extend(part for part in word.split() if part not in STOPWORDS)
+
+    # Longest mention first wherever mentions overlap
+    spans = get_symptom_matcher().spans(words) + get_medication_extractor().spans(words)
+    spans.sort(key=lambda span: (span[0], span[0] - span[1]))
+
+    canonical = []
+    concepts = set()
+    covered = 0
+    for start, end, name in spans:
+        if start < covered:
+            continue
+        canonical.extend(words[covered:start])
+        canonical.append(name)
+        concepts.add(name)
+        covered = end
+    canonical.extend(words[covered:])
+
+    return CanonicalQuery(canonical, sorted(concepts), any(word in NEGATIONS for word in canonical))
+
+def canonical_text(text: str) -> str:
+    """Canonical words of a query in sorted order (word order is ignored)"""
+    return " ".join(sorted(canonicalize(text).words))
+
+class HashedNgramVectorizer:
+    """
+    Hashed character n-gram vectorizer
+
+    Maps text to a fixed-size term-frequency vector without a vocabulary,
+    so it works offline and needs no fitting step.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 4096,
+        ngram_range: Sequence[int] = (3, 5),
+        preprocess: Optional[Callable[[str], str]] = None
+    ):
+        """
+        Initialize vectorizer
+
+        Args:
+            n_features: Dimension of the hashed feature space
+            ngram_range: Inclusive (min, max) character n-gram lengths
+            preprocess: Text rewrite applied before hashing (e.g.
+                canonical_text)
+        """
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.preprocess = preprocess
+
+    def _features(self, text: str) -> List[int]:
+        """Hash the character n-grams of normalized text"""
+        if self.preprocess is not None:
+            text = self.preprocess(text)
+        normalized = f" {' '.join(text.casefold().split())} "
+        low, high = self.ngram_range
+        features = []
+        for n in range(low, high + 1):
+            for i in range(len(normalized) - n + 1):
+                features.append(zlib.crc32(normalized[i:i + n].encode("utf-8")) % self.n_features)
+        return features
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Vectorize texts
+
+        Args:
+            texts: Texts to vectorize
+
+        Returns:
+            (len(texts), n_features) float32 matrix of sublinear term frequencies
+        """
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if features:
+                np.add.at(matrix[row], features, 1.0)
+        np.log1p(matrix, out=matrix)
+        return matrix
+
+class SemanticCache:
+    """
+    Bounded near-duplicate response cache
+
+    Stores term-frequency vectors in a fixed-capacity matrix and scores
+    queries against every entry with a single matrix product, weighting
+    features by IDF computed from the entries currently cached. An entry
+    only matches a query with the same intent and guard (a caller-supplied
+    string capturing anything the answer depends on besides the text).
+    Least recently used entries are evicted when the cache is full.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 512,
+        thresholds: Optional[Dict[str, float]] = None,
+        default_threshold: float = 0.9,
+        vectorizer: Optional[HashedNgramVectorizer] = None
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            capacity: Maximum number of cached entries
+            thresholds: Minimum cosine similarity per intent
+            default_threshold: Threshold for intents not in `thresholds`
+            vectorizer: Text vectorizer (hashed n-grams by default)
+        """
+        self.capacity = capacity
+        self.thresholds = thresholds or {}
+        self.default_threshold = default_threshold
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+
+        self._matrix = np.zeros((capacity, self.vectorizer.n_features), dtype=np.float32)
+        self._doc_freq = np.zeros(self.vectorizer.n_features, dtype=np.float32)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._keys = np.full(capacity, None, dtype=object)
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._clock = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _entry_key(intent: str, guard: str) -> str:
+        """Combined exact-match key for an entry"""
+        return f"{intent}\x00{guard}"
+
+    def _idf_weights(self) -> np.ndarray:
+        """Squared smoothed IDF weights for the current entries"""
+        idf = np.log((1.0 + self._size) / (1.0 + self._doc_freq)) + 1.0
+        return idf * idf
+
+    def lookup(self, text: str, intent: str, guard: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Find a cached result for a near-duplicate query
+
+        Args:
+            text: User query
+            intent: Classified intent of the query
+            guard: Extra key that must match exactly
+
+        Returns:
+            Copy of the cached result, or None
+        """
+        return self.lookup_batch([text], [intent], [guard])[0]
+
+    def lookup_batch(
+        self,
+        texts: Sequence[str],
+        intents: Sequence[str],
+        guards: Optional[Sequence[str]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up many queries at once
+
+        Args:
+            texts: User queries
+            intents: Classified intent per query
+            guards: Extra exact-match key per query
+
+        Returns:
+            Copy of the best cached result per query (None if below threshold)
+        """
+        guards = guards if guards is not None else [""] * len(texts)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+
+        with self._lock:
+            if self._size == 0 or not texts:
+                return results
+
+            queries = self.vectorizer.transform(texts)
+            weights = self._idf_weights()
+
+            # cos(q, m) with IDF weighting = sum(q * m * idf^2) / (|q*idf| |m*idf|)
+            scores = (queries * weights) @ self._matrix.T
+            query_norms = np.sqrt((queries * queries) @ weights)
+            entry_norms = np.sqrt((self._matrix * self._matrix) @ weights)
+            denom = np.outer(query_norms, entry_norms)
+            scores = np.divide(scores, denom, out=np.zeros_like(scores), where=denom > 0)
+
+            # Only entries with the same intent and guard can match
+            query_keys = np.array([self._entry_key(i, g) for i, g in zip(intents, guards)], dtype=object)
+            scores[query_keys[:, None] != self._keys[None, :]] = -1.0
+
+            best_slots = np.argmax(scores, axis=1)
+            for row, best in enumerate(best_slots):
+                score = float(scores[row, best])
+                if score >= self.thresholds.get(intents[row], self.default_threshold):
+                    self._clock += 1
+                    self._last_used[best] = self._clock
+                    results[row] = copy.deepcopy(self._entries[best]["result"])
+                    logger.debug(f"Semantic cache hit ({score:.2f}) for: {texts[row][:50]}...")
+
+        return results
+
+    def add(self, text: str, intent: str, result: Dict[str, Any], guard: str = "") -> None:
+        """
+        Cache a result for a query
+
+        Args:
+            text: User query
+            intent: Classified intent of the query
+            result: Agent result to cache
+            guard: Extra key that must match exactly on lookup
+        """
+        vector = self.vectorizer.transform([text])[0]
+
+        with self._lock:
+            if self._size < self.capacity:
+                slot = self._entries.index(None)
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+                self._doc_freq -= self._matrix[slot] > 0
+                logger.debug("Semantic cache full, evicted least recently used entry")
+
+            self._matrix[slot] = vector
+            self._doc_freq += vector > 0
+            self._clock += 1
+            self._last_used[slot] = self._clock
+            self._keys[slot] = self._entry_key(intent, guard)
+            self._entries[slot] = {
+                "intent": intent,
+                "guard": guard,
+                "result": copy.deepcopy(result)
+            }
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._matrix[:] = 0
+            self._doc_freq[:] = 0
+            self._last_used[:] = 0
+            self._keys[:] = None
+            self._entries = [None] * self.capacity
+            self._size = 0
+
+# Global semantic cache instance
+semantic_cache = SemanticCache(
+    capacity=Config.SEMANTIC_CACHE_CAPACITY,
+    thresholds=Config.SEMANTIC_CACHE_THRESHOLDS,
+    vectorizer=HashedNgramVectorizer(preprocess=canonical_text)
+)
@@ -0,0 +1,185 @@
+"""
+Symptom Matcher for MediMind AI
+Inverted index from symptom names, synonyms and red-flag phrases to
+symptom entries
+"""
+
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from src.utils.fuzzy import FuzzyPhraseIndex, content_words, tokenize
+from src.utils.knowledge_service import current_snapshot, get_symptoms_db
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Score of a mention by its kind; each spelling edit costs EDIT_PENALTY
+NAME_WEIGHT = 1.0
+SYNONYM_WEIGHT = 0.9
+RED_FLAG_WEIGHT = 0.5
+EDIT_PENALTY = 0.1
+
+class SymptomMatch(NamedTuple):
+    """A symptom mentioned in text"""
+    name: str
+    score: float  # Best mention, plus RED_FLAG_WEIGHT per red flag
+    position: int  # Index of the first word of its first mention
+    phrases: List[str]  # Names and synonyms that matched
+    red_flags: List[str]  # Red-flag phrases of this symptom that matched
+    questions: List[str]
+
+class SymptomMatcher:
+    """
+    Ranked symptom lookup
+
+    Names, synonyms and red-flag phrases of every symptom are indexed
+    word by word in one FuzzyPhraseIndex (an inverted index with typo
+    tolerance), so one pass over a message finds every symptom it
+    mentions and their red flags, at a cost that depends on the
+    message length rather than the size of the catalogue.
+
+    As in the emergency screen, red flags are qualifiers: they count
+    only for symptoms the message mentions.
+    """
+
+    def __init__(self, symptoms: Iterable[Dict[str, Any]] = ()):
+        """
+        Initialize matcher
+
+        Args:
+            symptoms: Entries with name and optional synonyms, questions
+                and red_flags lists
+        """
+        self._index = FuzzyPhraseIndex(closest_only=True)
+        self._symptoms: List[Dict[str, Any]] = []
+
+        for symptom in symptoms:
+            self.add_symptom(symptom)
+
+    def add_symptom(self, symptom: Dict[str, Any]) -> None:
+        """Index a symptom entry"""
+        symptom_id = len(self._symptoms)
+        self._symptoms.append(symptom)
+
+        self._add(symptom["name"], symptom_id, NAME_WEIGHT)
+        for synonym in symptom.get("synonyms", []):
+            self._add(synonym, symptom_id, SYNONYM_WEIGHT)
+        for flag in symptom.get("red_flags", []):
+            self._add(flag, symptom_id, None)
+
+    def _add(self, phrase: str, symptom_id: int, weight: Optional[float]) -> None:
+        """Index a phrase (weight None marks a red flag)"""
+        self._index.add(" ".join(content_words(phrase)), (symptom_id, phrase, weight))
+
+    def __len__(self) -> int:
+        """Number of indexed symptoms"""
+        return len(self._symptoms)
+
+    def match(self, text: str) -> List[SymptomMatch]:
+        """
+        Find every symptom mentioned in text
+
+        Args:
+            text: User message
+
+        Returns:
+            Matches, best first (highest score, then earliest mention)
+        """
+        mentions: Dict[int, Dict[str, Any]] = {}
+        flags: Dict[int, List[str]] = {}
+
+        for match in self._index.find(content_words(text)):
+            symptom_id, phrase, weight = match.value
+            if weight is None:
+                if phrase not in flags.setdefault(symptom_id, []):
+                    flags[symptom_id].append(phrase)
+                continue
+
+            score = weight - EDIT_PENALTY * match.distance
+            found = mentions.get(symptom_id)
+            if found is None:
+                mentions[symptom_id] = {"score": score, "position": match.start, "phrases": [phrase]}
+            else:
+                found["score"] = max(found["score"], score)
+                found["position"] = min(found["position"], match.start)
+                if phrase not in found["phrases"]:
+                    found["phrases"].append(phrase)
+
+        matches = []
+        for symptom_id, found in mentions.items():
+            symptom = self._symptoms[symptom_id]
+            red_flags = flags.get(symptom_id, [])
+            matches.append(SymptomMatch(
+                symptom["name"],
+                round(found["score"] + RED_FLAG_WEIGHT * len(red_flags), 3),
+                found["position"],
+                found["phrases"],
+                red_flags,
+                symptom.get("questions", [])
+            ))
+
+        matches.sort(key=lambda match: (-match.score, match.position))
+        return matches
+
+    def spans(self, words: Sequence[str]) -> List[Tuple[int, int, str]]:
+        """
+        Name and synonym mentions in an already tokenized text
+
+        Args:
+            words: Lowercase words
+
+        Returns:
+            (start, end, symptom name) word ranges, which may overlap;
+            red flags are not included
+        """
+        return [
+            (match.start, match.end, self._symptoms[match.value[0]]["name"])
+            for match in self._index.find(words)
+            if match.value[2] is not None
+        ]
+
+def merge_questions(matches: Iterable[SymptomMatch], limit: int = 5) -> List[str]:
+    """
+    Follow-up questions for several symptoms
+
+    Args:
+        matches: Symptom matches, best first
+        limit: Most questions to return
+
+    Returns:
+        Questions taken in turn from each symptom (so a second symptom
+        is not crowded out by the first), without duplicates
+    """
+    queues = [list(match.questions) for match in matches]
+    questions = []
+    seen = set()
+    while queues and len(questions) < limit:
+        for queue in queues:
+            if not queue:
+                continue
+            question = queue.pop(0)
+            key = " ".join(tokenize(question))
+            if key not in seen:
+                seen.add(key)
+                questions.append(question)
+                if len(questions) >= limit:
+                    break
+        queues = [queue for queue in queues if queue]
+    return questions
+
+def build_symptom_matcher(symptoms_db: Optional[Dict[str, Any]] = None) -> SymptomMatcher:
+    """
+    Build a matcher from a symptoms database
+
+    Args:
+        symptoms_db: Symptoms database (default: the current knowledge snapshot's)
+
+    Returns:
+        Symptom matcher
+    """
+    symptoms_db = symptoms_db if symptoms_db is not None else get_symptoms_db()
+    matcher = SymptomMatcher(symptoms_db.get("common_symptoms", []))
+    logger.info(f"Symptom matcher built: {len(matcher)} symptoms")
+    return matcher
+
+def get_symptom_matcher() -> SymptomMatcher:
+    """Get the symptom matcher of the current knowledge snapshot"""
+    return current_snapshot().symptom_matcher
@@ -0,0 +1,21 @@
+"""
+Pytest fixtures for the MediMind AI test suite
+Lets the script-style agent tests run under pytest as well
+"""
+
+import sys
+import os
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Run hermetically on the deterministic fake backend unless told otherwise
+os.environ.setdefault("MODEL_BACKEND", "fake")
+os.environ.setdefault("FAKE_LATENCY_MEAN", "0")
+
+@pytest.fixture(scope="session")
+def orchestrator():
+    """Shared orchestrator instance for agent tests"""
+    from src.agents.orchestrator import OrchestratorAgent
+    return OrchestratorAgent()
@@ -0,0 +1,84 @@
+"""
+Test Suite for MediMind AI model backends
+Tests the fake and record/replay backends used for offline testing
+"""
+
+import sys
+import os
+import asyncio
+import random
+import tempfile
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.backends import BackendError
+from src.backends.fake import FakeBackend, LatencyModel
+from src.backends.cassette import CassetteBackend
+
+REQUEST = dict(
+    model="test-model",
+    system_instruction="You are a test agent.",
+    contents=[{"role": "user", "parts": [{"text": "I have a headache"}]}],
+    temperature=0.7,
+    top_p=0.95
+)
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+def test_fake_backend_is_deterministic():
+    """Same request gives the same text, streamed or not"""
+    backend = FakeBackend()
+    first = asyncio.run(backend.generate(**REQUEST))
+    second = asyncio.run(FakeBackend().generate(**REQUEST))
+    chunks = asyncio.run(_collect(backend.stream(**REQUEST)))
+
+    assert first == second
+    assert "".join(chunks) == first
+    assert len(chunks) > 1
+
+def test_fake_backend_error_rate():
+    """error_rate=1 always fails with a retryable error"""
+    backend = FakeBackend(error_rate=1.0, seed=1)
+    with pytest.raises(BackendError) as error:
+        asyncio.run(backend.generate(**REQUEST))
+    assert error.value.retryable
+
+def test_latency_model_matches_mean_and_tail():
+    """Sampled latencies follow the configured mean and p99"""
+    model = LatencyModel(mean=0.2, p99=1.0, rng=random.Random(7))
+    samples = sorted(model.sample() for _ in range(20000))
+
+    assert abs(sum(samples) / len(samples) - 0.2) < 0.02
+    assert abs(samples[int(0.99 * len(samples))] - 1.0) < 0.15
+
+def test_cassette_record_and_replay():
+    """Recorded responses replay without the inner backend"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cassette.jsonl")
+
+        recorder = CassetteBackend(path, mode="record", inner=FakeBackend())
+        recorded = asyncio.run(recorder.generate(**REQUEST))
+        recorded_chunks = asyncio.run(_collect(recorder.stream(**REQUEST)))
+
+        player = CassetteBackend(path, mode="replay")
+        assert asyncio.run(player.generate(**REQUEST)) == recorded
+        assert asyncio.run(_collect(player.stream(**REQUEST))) == recorded_chunks
+
+        other = dict(REQUEST, system_instruction="Another agent.")
+        with pytest.raises(BackendError):
+            asyncio.run(player.generate(**other))
+
+def test_client_pool_shares_one_client_per_key():
+    """Repeated get_client calls reuse the pooled client for their key"""
+    from src.utils.client_pool import ClientPool
+
+    pool = ClientPool()
+    client = pool.get_client("test-key")
+
+    assert pool.get_client("test-key") is client
+    assert pool.get_client("other-key") is not client
+    pool.clear()
+    assert pool.get_client("test-key") is not client
@@ -0,0 +1,270 @@
+"""
+Test Suite for MediMind AI memory
+Tests session history compaction and the rolling conversation summary
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import Config
+from src.memory.compaction import HistoryCompactor, fold_extractive
+from src.memory.history import ConversationHistory
+from src.memory.session_manager import SessionManager
+from src.utils.prompt_budget import estimate_tokens
+
+def _message(role, text):
+    return {"role": role, "parts": [{"text": text}]}
+
+def test_compaction_keeps_early_symptoms_in_summary():
+    """Messages evicted from the window are folded into the summary"""
+    manager = SessionManager()
+    manager.add_message("user", "I have had a sharp chest pain since Monday. It gets worse when I climb stairs.")
+    for i in range(Config.MAX_CONVERSATION_HISTORY):
+        manager.add_message("model" if i % 2 == 0 else "user", f"Message number {i}.")
+
+    manager.wait_for_compaction(timeout=5)
+    context = manager.get_context()
+
+    assert len(context["conversation_history"]) <= Config.MAX_CONVERSATION_HISTORY
+    assert "sharp chest pain since Monday" in context["conversation_summary"]
+    assert "climb stairs" not in context["conversation_summary"]  # First sentence only
+
+def test_inline_compaction_and_reset():
+    """Compaction can run on the request path and is cleared with the session"""
+    compactor = HistoryCompactor(mode="extractive", background=False)
+    compactor.submit([_message("user", "My ankle is swollen."), _message("model", "Rest it.")])
+
+    assert compactor.get_summary() == "- My ankle is swollen."
+    compactor.reset()
+    assert compactor.get_summary() == ""
+
+def test_extractive_summary_stays_bounded():
+    """The rolling summary never grows past its token limit and keeps both ends"""
+    summary = ""
+    for i in range(200):
+        summary = fold_extractive(summary, [_message("user", f"Symptom report {i} about my back.")], 100)
+
+    assert estimate_tokens(summary) <= 100
+    assert "report 0 " in summary
+    assert "report 199 " in summary
+
+def test_sessions_share_compaction_threads():
+    """Background folds of many sessions run on one bounded pool, in order per session"""
+    import threading
+
+    managers = [SessionManager() for _ in range(30)]
+    for manager in managers:
+        for i in range(3):
+            manager.compactor.submit([_message("user", f"Symptom report {i} about my knee.")])
+    for manager in managers:
+        manager.wait_for_compaction(timeout=5)
+        summary = manager.get_context()["conversation_summary"]
+        assert summary.index("report 0 ") < summary.index("report 1 ") < summary.index("report 2 ")
+        manager.clear_session()
+
+    workers = [thread for thread in threading.enumerate() if thread.name.startswith("medimind-compaction")]
+    assert len(workers) <= Config.COMPACTION_WORKERS
+
+def test_model_compaction_runs_in_background():
+    """Model-backed mode folds evicted messages through the backend"""
+    compactor = HistoryCompactor(mode="model", background=False)
+    assert compactor.background
+
+    compactor.submit([_message("user", "I get migraines every week.")])
+    compactor.wait(timeout=5)
+    assert compactor.get_summary()
+
+def test_history_snapshots_are_immutable_views():
+    """Snapshots do not change as the session's history grows or is trimmed"""
+    history = ConversationHistory(rebase_threshold=4)
+    for i in range(3):
+        history.append(_message("user", f"m{i}"))
+
+    snapshot = history.snapshot()
+    history.append(_message("model", "m3"))
+    evicted = history.trim(2)
+    for i in range(4, 12):
+        history.append(_message("user", f"m{i}"))
+        history.trim(2)
+
+    assert [m["parts"][0]["text"] for m in snapshot] == ["m0", "m1", "m2"]
+    assert [m["parts"][0]["text"] for m in evicted] == ["m0", "m1"]
+    assert [m["parts"][0]["text"] for m in history.snapshot()] == ["m10", "m11"]
+    assert snapshot[1:] == [_message("user", "m1"), _message("user", "m2")]
+    assert not hasattr(snapshot, "append")
+
+def test_compactor_folds_evicted_views_without_copying():
+    """Queued evictions are the trimmed views themselves, still intact when folded"""
+    history = ConversationHistory(rebase_threshold=2)
+    compactor = HistoryCompactor(background=True)
+    folded = []
+    compactor._fold = folded.append
+
+    views = []
+    for i in range(6):
+        history.append(_message("user", f"m{i}"))
+        views.append(history.trim(1))
+        compactor.submit(views[-1])
+    compactor.wait(timeout=5)
+
+    assert [id(view) for view in folded] == [id(view) for view in views if view]
+    assert [m["parts"][0]["text"] for view in folded for m in view] == ["m0", "m1", "m2", "m3", "m4"]
+
+def test_agents_do_not_modify_session_history(orchestrator):
+    """Processing a turn leaves the session's history untouched"""
+    manager = SessionManager()
+    manager.add_message("user", "I have a mild headache")
+    context = manager.get_context()
+
+    orchestrator.process("I have a mild headache", context)
+
+    assert len(manager.get_conversation_history()) == 1
+    assert len(context["conversation_history"]) == 1
+
+def test_sqlite_store_and_migration(tmp_path):
+    """Users migrate from the JSON memory bank and are saved one row at a time"""
+    import json
+    from src.memory.memory_bank import MemoryBank
+    from src.memory.storage import open_memory_store
+    from src.memory.storage.migrate import migrate
+
+    bank = {
+        f"user{n}": {
+            "medications": ["aspirin", f"drug{n}"],
+            "chronic_conditions": ["asthma"] if n % 2 else [],
+            "symptom_history": [{"symptom": "headache", "timestamp": "2024-01-01T00:00:00"}],
+            "doctor_visits": [{"timestamp": "2024-02-01T00:00:00", "doctor": "Dr. Lee"}],
+            "created_at": "2023-12-31T00:00:00"
+        }
+        for n in range(20)
+    }
+    json_path = tmp_path / "memory_bank.json"
+    json_path.write_text(json.dumps(bank))
+    store = open_memory_store(str(tmp_path / "memory.db"))
+
+    assert migrate(open_memory_store(str(json_path)), store) == {"migrated": 20, "skipped": 0}
+    assert migrate(open_memory_store(str(json_path)), store) == {"migrated": 0, "skipped": 20}
+    assert dict(store.iter_users()) == bank
+    assert store.load_user("nobody") is None
+
+    memory = MemoryBank("user3", store=store)
+    memory.save_session({"user_medications": ["drug3", "warfarin"], "symptoms_discussed": ["fever"]})
+    assert MemoryBank("user3", store=store).get_medications() == ["aspirin", "drug3", "warfarin"]
+    assert [e["symptom"] for e in store.load_user("user3")["symptom_history"]] == ["headache", "fever"]
+    assert store.load_user("user4") == bank["user4"]
+
+    new_user = MemoryBank("newcomer", store=store)
+    new_user.save_session({"user_medications": ["ibuprofen"], "symptoms_discussed": []})
+    assert store.load_user("newcomer")["created_at"] == new_user.get_user_history()["created_at"]
+
+def test_journal_store_recovers_snapshot_and_tail(tmp_path):
+    """Startup rebuilds state from the snapshot plus the journal records newer than it"""
+    from src.memory.storage.journal_store import JournalMemoryStore
+
+    path = str(tmp_path / "memory.journal")
+    store = JournalMemoryStore(path, background=False)
+    store.append("alice", {"medications": ["aspirin"], "created_at": "2024-01-01T00:00:00"})
+    store.append("bob", {"symptom_history": [{"symptom": "fever", "timestamp": "t1"}]})
+    assert store.compact() and os.path.getsize(path) == 0
+    store.append("alice", {"medications": ["aspirin", "warfarin"]})
+    store.close()
+
+    # A crash between writing the snapshot and trimming the journal leaves
+    # covered records behind; a crash mid-write leaves a torn record
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"seq": 1, "user_id": "alice", "update": {"medications": ["x"]}}\n{"seq": 4, "user_')
+
+    store = JournalMemoryStore(path, background=False)
+    assert store.load_user("alice")["medications"] == ["aspirin", "warfarin"]
+    assert store.load_user("alice")["created_at"] == "2024-01-01T00:00:00"
+    assert store.load_user("bob")["symptom_history"] == [{"symptom": "fever", "timestamp": "t1"}]
+
+    store.append("bob", {"medications": ["ibuprofen"]})  # Starts on its own line after the torn tail
+    store.close()
+    store = JournalMemoryStore(path, background=False)
+    assert store.load_user("bob")["medications"] == ["ibuprofen"]
+    assert [user_id for user_id, _ in store.iter_users()] == ["alice", "bob"]
+    store.close()
+
+def test_sharded_store_loads_lazily_and_streams(tmp_path):
+    """Only the requested user's shard is parsed; hot shards stay under the cap"""
+    from src.memory.memory_bank import MemoryBank
+    from src.memory.storage import open_memory_store
+    from src.memory.storage.migrate import migrate
+    from src.memory.storage.sharded_store import ShardedMemoryStore, shard_of
+
+    source = open_memory_store(str(tmp_path / "memory_bank.json"))
+    for n in range(200):
+        source.append(f"user{n}", {"medications": ["aspirin", f"drug{n}"], "created_at": "2024-01-01T00:00:00"})
+    directory = str(tmp_path / "memory_bank.shards")
+    assert migrate(source, ShardedMemoryStore(directory, shards=16))["migrated"] == 200
+
+    assert open_memory_store(directory).name == "sharded"
+    store = ShardedMemoryStore(directory, shards=4, cache_bytes=4096)
+    assert store.shards == 16  # Count recorded when the store was created
+    assert store.cache_info()["shards"] == 0
+
+    bank = MemoryBank("user7", store=store)
+    assert bank.get_user_history()["medications"] == ["aspirin", "drug7"]
+    assert store.cache_info()["shards"] == 1
+
+    bank.save_session({"user_medications": ["warfarin"], "symptoms_discussed": ["fever"]})
+    assert ShardedMemoryStore(directory).load_user("user7")["medications"] == ["aspirin", "drug7", "warfarin"]
+    assert len([name for name in os.listdir(directory) if name.startswith("shard-") and name.endswith(".json")]) <= 16
+
+    for n in range(200):
+        store.load_user(f"user{n}")
+    info = store.cache_info()
+    assert 1 <= info["shards"] < 16 and info["bytes"] <= info["max_bytes"]
+
+    streamed = list(ShardedMemoryStore(directory).iter_users())
+    assert sorted(user_id for user_id, _ in streamed) == sorted(f"user{n}" for n in range(200))
+    assert [shard_of(user_id, 16) for user_id, _ in streamed] == sorted(shard_of(user_id, 16) for user_id, _ in streamed)
+
+def _save_sessions(path, worker, sessions):
+    """Stress-test worker: two threads saving sessions for a shared and an own user"""
+    import threading
+    from src.memory.memory_bank import MemoryBank
+    from src.memory.storage import open_memory_store
+
+    store = open_memory_store(path)
+
+    def save(thread):
+        for n in range(sessions):
+            tag = f"w{worker}t{thread}s{n}"
+            MemoryBank("shared", store=store).save_session({"user_medications": [f"drug{worker}"], "symptoms_discussed": [tag]})
+            MemoryBank(f"user{worker}", store=store).save_session({"symptoms_discussed": [tag]})
+
+    threads = [threading.Thread(target=save, args=(thread,)) for thread in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_concurrent_processes_lose_no_updates(tmp_path):
+    """Many processes saving at once into shared stores keep every update"""
+    import multiprocessing
+    from src.memory.storage import open_memory_store
+
+    workers, sessions = 6, 10
+    context = multiprocessing.get_context("spawn")
+    for path in (str(tmp_path / "memory_bank.json"), str(tmp_path / "memory_bank.shards")):
+        processes = [context.Process(target=_save_sessions, args=(path, worker, sessions)) for worker in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=120)
+            assert process.exitcode == 0
+
+        store = open_memory_store(path)
+        expected = {f"w{worker}t{thread}s{n}" for worker in range(workers) for thread in range(2) for n in range(sessions)}
+        shared = store.load_user("shared")
+        assert sorted(entry["symptom"] for entry in shared["symptom_history"]) == sorted(expected)
+        assert sorted(shared["medications"]) == sorted(f"drug{worker}" for worker in range(workers))
+        for worker in range(workers):
+            own = {entry["symptom"] for entry in store.load_user(f"user{worker}")["symptom_history"]}
+            assert own == {tag for tag in expected if tag.startswith(f"w{worker}t")}
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
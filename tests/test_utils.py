@@ -0,0 +1,685 @@
+"""
+Test Suite for MediMind AI utilities
+Tests caching and other shared infrastructure
+"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.response_cache import LRUCache, SQLiteCache, ResponseCache, make_cache_key
+from src.utils.semantic_cache import SemanticCache
+from src.backends import BackendError
+from src.config import Config
+from src.utils.resilience import (
+    CircuitBreaker, LatencyTracker, ResilientExecutor, Deadline,
+    DeadlineExceeded, CircuitOpenError
+)
+from src.utils.prompt_budget import PromptAssembler, estimate_tokens
+
+def _message(role, text):
+    return {"role": role, "parts": [{"text": text}]}
+
+def test_cache_key_normalization():
+    """Whitespace/case differences share a key; parameters do not"""
+    history = [_message("user", "Hello"), _message("model", "Hi there!")]
+    key = make_cache_key("model", "system", 0.7, 0.95, history, "I have a headache")
+
+    assert key == make_cache_key(
+        "model", "system", 0.7, 0.95,
+        [_message("user", " hello "), _message("model", "hi  there!")],
+        "i have a   Headache "
+    )
+    assert key != make_cache_key("model", "system", 0.2, 0.95, history, "I have a headache")
+    assert key != make_cache_key("model", "other", 0.7, 0.95, history, "I have a headache")
+    assert key != make_cache_key("model", "system", 0.7, 0.95, [], "I have a headache")
+
+def test_lru_eviction_and_ttl():
+    """LRU evicts least recently used entries and expires old ones"""
+    cache = LRUCache(max_entries=2, max_bytes=1024, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+    sized = LRUCache(max_entries=10, max_bytes=10, ttl=60)
+    sized.set("a", "x" * 6)
+    sized.set("b", "y" * 6)
+    assert sized.get("a") is None and sized.get("b") == "y" * 6
+
+    expiring = LRUCache(max_entries=10, max_bytes=1024, ttl=0.01)
+    expiring.set("a", "1")
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+
+def test_sqlite_tier_is_shared():
+    """Entries written through one cache are visible to another on the same file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        writer = ResponseCache(LRUCache(), SQLiteCache(path))
+        reader = ResponseCache(LRUCache(), SQLiteCache(path))
+
+        writer.set("key", "cached response")
+
+        assert reader.get("key") == "cached response"
+        # Promoted into the reader's memory tier
+        assert reader.memory.get("key") == "cached response"
+
+def test_semantic_cache_near_duplicates():
+    """Near-duplicate queries hit; different intents, guards or topics miss"""
+    cache = SemanticCache(capacity=4, thresholds={"symptom": 0.6})
+    cache.add("I have a headache", "symptom", {"response": "headache answer"})
+    cache.add("what is a healthy diet", "general", {"response": "diet answer"})
+
+    assert cache.lookup("i have a bad  headache", "symptom") == {"response": "headache answer"}
+    assert cache.lookup("I have a headache", "medication") is None
+    assert cache.lookup("I have a headache", "symptom", guard="other") is None
+    assert cache.lookup("I twisted my ankle", "symptom") is None
+
+    results = cache.lookup_batch(
+        ["I have a headache", "what is a healthy diet?"],
+        ["symptom", "general"]
+    )
+    assert results[0] == {"response": "headache answer"}
+    assert results[1] is None  # below the 0.9 default threshold
+
+def test_semantic_cache_eviction():
+    """Least recently used entry is evicted when full"""
+    cache = SemanticCache(capacity=2, default_threshold=0.9)
+    cache.add("I have a headache", "x", {"response": "a"})
+    cache.add("what is a healthy diet", "x", {"response": "b"})
+    cache.lookup("I have a headache", "x")
+    cache.add("help me prepare for my doctor", "x", {"response": "c"})
+
+    assert len(cache) == 2
+    assert cache.lookup("what is a healthy diet", "x") is None
+    assert cache.lookup("I have a headache", "x") == {"response": "a"}
+
+def test_semantic_cache_paraphrases_at_configured_thresholds(orchestrator):
+    """Rephrased first turns hit the live cache; changed details miss"""
+    from src.utils.semantic_cache import semantic_cache
+
+    def cached(query):
+        return orchestrator.process(query, {"conversation_history": []}).get("cached", False)
+
+    cases = {
+        "I have a headache": (
+            ["I've got a headache", "my head hurts", "I have a migraine"],
+            ["I don't have a headache", "I have had a headache for three weeks",
+             "I have a severe headache", "I have a headache and a fever"]
+        ),
+        "I feel tired all the time": (["I'm exhausted all the time"], []),
+        "Can I take ibuprofen with aspirin?": (
+            ["Is it safe to take aspirin and ibuprofen together?", "can I take advil with aspirin"],
+            ["Can I take ibuprofen with warfarin?", "what are the side effects of ibuprofen"]
+        ),
+        "what is a healthy diet": (["what's a healthy diet?"], ["what is a healthy breakfast"]),
+    }
+    try:
+        for query, (paraphrases, different) in cases.items():
+            semantic_cache.clear()
+            assert not cached(query)
+            for paraphrase in paraphrases:
+                assert cached(paraphrase), paraphrase
+            for other in different:
+                assert not cached(other), other
+    finally:
+        semantic_cache.clear()
+
+def test_semantic_cache_separates_long_term_memory(orchestrator):
+    """An answer built on one patient's memory is never served to another"""
+    from src.utils.semantic_cache import semantic_cache
+
+    query = "What should I do about my headache?"
+    memory = "Medications: warfarin\nChronic conditions: HIV"
+
+    def cached(long_term_memory):
+        context = {"conversation_history": [], "long_term_memory": long_term_memory}
+        return orchestrator.process(query, context).get("cached", False)
+
+    semantic_cache.clear()
+    try:
+        assert not cached(memory)
+        assert not cached("")
+        assert not cached("Medications: aspirin")
+        assert cached(memory)
+        assert cached("")
+    finally:
+        semantic_cache.clear()
+
+def _flaky(failures, delays=None):
+    """Attempt factory failing `failures` times, optionally sleeping per call"""
+    calls = []
+
+    async def attempt():
+        calls.append(len(calls))
+        if delays:
+            await asyncio.sleep(delays[min(len(calls) - 1, len(delays) - 1)])
+        if len(calls) <= failures:
+            raise BackendError("temporary", retryable=True)
+        return f"ok after {len(calls)}"
+
+    return attempt, calls
+
+def test_executor_retries_retryable_errors(monkeypatch):
+    """Retryable failures are retried with backoff until success"""
+    monkeypatch.setattr(Config, "RETRY_BASE_DELAY", 0.001)
+    executor = ResilientExecutor(CircuitBreaker("test", failure_threshold=10), LatencyTracker())
+    attempt, calls = _flaky(2)
+
+    assert asyncio.run(executor.call(attempt, Deadline(5))) == "ok after 3"
+    assert len(calls) == 3
+
+def test_executor_enforces_deadline():
+    """A call slower than the deadline raises DeadlineExceeded"""
+    executor = ResilientExecutor(CircuitBreaker("test"), LatencyTracker())
+    attempt, _ = _flaky(0, delays=[1.0])
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(executor.call(attempt, Deadline(0.05)))
+
+def test_executor_hedges_slow_calls(monkeypatch):
+    """A slow primary is raced by a hedge, which wins"""
+    monkeypatch.setattr(Config, "HEDGING_ENABLED", True)
+    monkeypatch.setattr(Config, "HEDGE_MIN_SAMPLES", 1)
+    monkeypatch.setattr(Config, "HEDGE_MIN_DELAY", 0.01)
+    latency = LatencyTracker()
+    latency.record(0.01)
+    executor = ResilientExecutor(CircuitBreaker("test"), latency)
+    attempt, calls = _flaky(0, delays=[1.0, 0.0])
+
+    start = time.monotonic()
+    assert asyncio.run(executor.call(attempt, Deadline(5))) == "ok after 2"
+    assert time.monotonic() - start < 0.5
+    assert len(calls) == 2
+
+def test_circuit_breaker_fails_fast_and_recovers(monkeypatch):
+    """Breaker opens after consecutive failures and closes after a good trial"""
+    monkeypatch.setattr(Config, "MAX_RETRIES", 0)
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=0.05)
+    executor = ResilientExecutor(breaker, LatencyTracker())
+    failing = BackendError("down", retryable=True)
+
+    async def fail():
+        raise failing
+
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            asyncio.run(executor.call(fail, Deadline(5)))
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(executor.call(fail, Deadline(5)))
+
+    time.sleep(0.06)
+    attempt, _ = _flaky(0)
+    assert asyncio.run(executor.call(attempt, Deadline(5))) == "ok after 1"
+    assert breaker.state == "closed"
+
+def test_circuit_breaker_ignores_bad_requests_and_deadlines():
+    """Non-retryable errors and the caller's deadline never open the breaker"""
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    executor = ResilientExecutor(breaker, LatencyTracker())
+
+    async def bad_request():
+        raise BackendError("400 invalid argument", retryable=False)
+
+    for _ in range(3):
+        with pytest.raises(BackendError):
+            asyncio.run(executor.call(bad_request, Deadline(5)))
+    slow, _ = _flaky(0, delays=[1.0])
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(executor.call(slow, Deadline(0.02)))
+
+    assert breaker.state == "closed"
+
+def test_circuit_breaker_survives_cancelled_trial(monkeypatch):
+    """A cancelled half-open trial lets the next call try again"""
+    monkeypatch.setattr(Config, "MAX_RETRIES", 0)
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+    executor = ResilientExecutor(breaker, LatencyTracker())
+    down, _ = _flaky(1)
+
+    with pytest.raises(BackendError):
+        asyncio.run(executor.call(down, Deadline(5)))
+    assert breaker.state == "open"
+    time.sleep(0.02)
+
+    async def cancel_trial():
+        slow, _ = _flaky(0, delays=[1.0])
+        trial = asyncio.ensure_future(executor.call(slow, Deadline(5)))
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half_open"
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    asyncio.run(cancel_trial())
+    attempt, _ = _flaky(0)
+    assert asyncio.run(executor.call(attempt, Deadline(5))) == "ok after 1"
+    assert breaker.state == "closed"
+
+def _long_history(turns):
+    history = []
+    for i in range(turns):
+        history.append(_message("user", f"Turn {i}: I have had a headache for {i} days. " + "More detail. " * 20))
+        history.append(_message("model", "Here is some advice about headaches. " * 20))
+    return history
+
+def test_prompt_assembler_fits_budget():
+    """Long histories are trimmed to the budget, oldest first, with a summary"""
+    history = _long_history(20)
+    original = [dict(m) for m in history]
+    assembler = PromptAssembler(budget=1000)
+
+    assembled = assembler.assemble("You are a helpful agent.", history, "What now?", memory="Medications: aspirin")
+    contents = assembled["contents"]
+
+    assert assembled["tokens_used"] <= 1000
+    assert assembled["tokens_saved"] > 0
+    assert assembled["messages_dropped"] > 0
+    assert contents[-1]["parts"][0]["text"] == "What now?"
+    # Newest history survives, oldest is summarized
+    assert contents[-2] is history[-1]
+    preamble = contents[0]["parts"][0]["text"]
+    assert "Medications: aspirin" in preamble
+    assert "Turn 0:" in preamble
+    # Caller's history is left untouched
+    assert history == original
+
+def test_prompt_assembler_keeps_small_requests_whole():
+    """Requests within budget are sent unchanged"""
+    history = _long_history(1)
+    assembled = PromptAssembler(budget=4000).assemble("System", history, "Hi")
+
+    assert assembled["contents"][:-1] == history
+    assert assembled["tokens_saved"] == 0
+    assert assembled["messages_dropped"] == 0
+    assert estimate_tokens("") == 0
+
+def test_keyword_matcher_word_boundaries():
+    """Keywords match whole words (with inflections), never inside other words"""
+    from src.utils.keyword_matcher import KeywordMatcher
+
+    matcher = KeywordMatcher()
+    matcher.add_many(["take", "feel", "headache"], "routing")
+    matcher.add_many(["chest pain", "pain"], "emergency")
+    matcher.build()
+
+    assert matcher.matches("That was a mistake", "routing") == []
+    assert matcher.matches("I'm feeling awful and taking breaks", "routing") == ["feel", "take"]
+    assert matcher.matches("Headaches again", "routing") == ["headache"]
+
+    hits = matcher.find_all("Sharp CHEST pain today")
+    assert [(h.keyword, h.start, h.end) for h in hits] == [("chest pain", 6, 16), ("pain", 12, 16)]
+
+def test_default_matcher_categories():
+    """The shared matcher covers routing, emergency, symptom and drug names in one scan"""
+    from src.utils.keyword_matcher import get_keyword_matcher
+
+    matcher = get_keyword_matcher()
+    text = "I can't breathe and have a fever after my aspirin dose"
+
+    assert matcher.contains(text, "emergency")
+    assert matcher.matches(text, "symptom") == ["fever"]
+    assert matcher.matches(text, "medication") == ["aspirin"]
+    assert "dose" in matcher.matches(text, "intent:medication")
+    assert matcher.find_all(text) is matcher.find_all(text)  # Memoized
+
+def test_intent_classifier_round_trip(tmp_path):
+    """A trained classifier survives save/load and classifies in batches"""
+    from src.utils.intent_classifier import IntentClassifier, load_corpus
+
+    texts, labels = load_corpus(Config.INTENT_CORPUS_PATH)
+    classifier = IntentClassifier.train(texts, labels)
+    path = str(tmp_path / "intent.npz")
+    classifier.save(path)
+    loaded = IntentClassifier.load(path)
+
+    queries = ["I have a pounding headache", "Can I take advil with warfarin?",
+               "Help me get ready for my cardiologist visit", "What is a good breakfast?"]
+    results = loaded.classify_batch(queries)
+
+    assert [r["intent"] for r in results] == ["symptom", "medication", "doctor_prep", "general"]
+    assert all(abs(sum(r["probabilities"].values()) - 1) < 1e-5 for r in results)
+    assert loaded.classify(queries[0]) == results[0]
+    assert abs(loaded.temperature - classifier.temperature) < 1e-6
+
+def test_orchestrator_falls_back_to_keywords(orchestrator, monkeypatch):
+    """Low-confidence predictions are routed by the keyword rules"""
+    message = "I feel like I need to see my doctor"
+    assert orchestrator._classify_intent(message) == "doctor_prep"
+
+    monkeypatch.setattr(Config, "INTENT_MIN_CONFIDENCE", 1.01)
+    assert orchestrator._classify_intent(message) == orchestrator._classify_by_keywords(message)
+
+def test_orchestrator_builds_sub_agents_on_first_use():
+    """Sub-agents are created when first routed to, then reused"""
+    from src.agents.orchestrator import OrchestratorAgent
+    from src.utils.semantic_cache import semantic_cache
+
+    orchestrator = OrchestratorAgent()
+
+    def built():
+        agents = (orchestrator._symptom_agent, orchestrator._medication_agent, orchestrator._doctor_prep_agent)
+        return [agent is not None for agent in agents]
+
+    assert built() == [False, False, False]
+    semantic_cache.clear()  # A cached answer would skip the agent
+    try:
+        orchestrator.process("I have a headache", {"conversation_history": []})
+        assert built() == [True, False, False]
+        symptom_agent = orchestrator.symptom_agent
+
+        orchestrator.process("What are the side effects of ibuprofen?", {"conversation_history": []})
+        assert built() == [True, True, False]
+        assert orchestrator.symptom_agent is symptom_agent
+    finally:
+        semantic_cache.clear()
+
+def test_one_symptom_mention_fans_out(orchestrator):
+    """A named symptom next to a medication question reaches both agents"""
+    assert orchestrator._select_intents("I have a headache, can I take ibuprofen with my aspirin?") == \
+        ["medication", "symptom"]
+    assert orchestrator._select_intents("I take aspirin daily. Can I also take ibuprofen for pain?") == ["medication"]
+
+def test_emergency_screen_tolerates_typos():
+    """Misspelled emergency phrases are caught; ordinary words are not"""
+    from src.utils.safety import get_emergency_screen
+
+    screen = get_emergency_screen()
+    assert screen.check("chest pian since this morning")["phrase"] == "chest pain"
+    assert screen.check("I think it's a heart atack")["phrase"] == "heart attack"
+    assert screen.check("I cant breath")["phrase"] == "can't breathe"
+    assert screen.check("That was a mistake") is None
+    assert screen.check("I'm painting my kitchen") is None
+    assert screen.check("my prescription refill is overdue") is None
+    assert screen.check("my subconscious keeps worrying me") is None
+
+def test_emergency_screen_red_flags_need_symptom():
+    """Symptom red flags only count alongside their symptom"""
+    from src.utils.safety import get_emergency_screen
+
+    screen = get_emergency_screen()
+    assert screen.check("I have a headache with a stiff neck") == {"phrase": "with stiff neck", "symptom": "headache"}
+    assert screen.check("I woke up with a stiff neck") is None
+
+def test_non_emergency_red_flags_reach_symptom_analyzer(orchestrator):
+    """Red flags outside emergency_red_flags are warning signs in the answer"""
+    from src.utils.safety import get_emergency_screen
+
+    message = "I have had a headache with a fever since yesterday"
+    assert get_emergency_screen().check(message) is None
+
+    agent = orchestrator.symptom_agent
+    result = asyncio.run(agent.aprocess(message, {"conversation_history": []}))
+    assert not result["is_emergency"]
+    assert {"symptom": "headache", "phrase": "with fever"} in result["red_flags"]
+
+    prompt = agent._build_prompt(message, [], {}, agent._match_symptoms(message))
+    assert "Warning signs mentioned: headache with fever" in prompt
+
+def test_emergency_screen_red_flags_follow_synonyms():
+    """A red flag next to a symptom synonym escalates like one next to its name"""
+    from src.utils.safety import get_emergency_screen
+
+    screen = get_emergency_screen()
+    assert screen.check("I have a migraine with stiff neck") == {"phrase": "with stiff neck", "symptom": "headache"}
+    assert screen.check("worst migraine ever") == {"phrase": "worst migraine ever", "symptom": "headache"}
+    assert screen.check("I am exhausted with shortness of breath") == \
+        {"phrase": "shortness of breath", "symptom": "fatigue"}
+    assert screen.check("I have a migraine") is None
+    assert screen.check("I am exhausted") is None
+
+def test_orchestrator_emergency_fast_path(orchestrator, monkeypatch):
+    """Emergencies get the canned alert before routing or any model call"""
+    from src.utils.metrics import metrics_tracker
+    from src.utils.safety import EMERGENCY_RESPONSE
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("emergency was routed to an agent")
+
+    monkeypatch.setattr(orchestrator, "_route", fail)
+    monkeypatch.setattr(orchestrator, "_fan_out", fail)
+    before = metrics_tracker.metrics["emergency_detections"]
+    chunks = []
+
+    result = orchestrator.process(
+        "I think I'm having a heart atack, should I take aspirin?",
+        {"conversation_history": []},
+        chunks.append
+    )
+
+    assert result["is_emergency"] and result["response"] == EMERGENCY_RESPONSE
+    assert result["emergency_match"] == {"phrase": "heart attack"}
+    assert chunks == [EMERGENCY_RESPONSE]
+    assert metrics_tracker.metrics["emergency_detections"] == before + 1
+
+def test_interaction_index_lookup():
+    """Pairs are unordered and case-insensitive, with several records per pair"""
+    from src.utils.interactions import InteractionIndex
+
+    index = InteractionIndex([
+        {"drug1": "Aspirin", "drug2": "warfarin", "severity": "moderate", "source": "a"},
+        {"drug1": "warfarin", "drug2": "aspirin", "severity": "severe", "source": "b"},
+        {"drug1": "aspirin", "drug2": "ibuprofen", "severity": "minor", "source": "c"}
+    ])
+
+    assert len(index) == 3 and index.pair_count == 2
+    assert [r["source"] for r in index.lookup("WARFARIN", "aspirin")] == ["b", "a"]
+    assert [r["source"] for r in index.lookup("aspirin", "warfarin", "severe")] == ["b"]
+    assert index.lookup("aspirin", "acetaminophen") == []
+
+    found = index.check(["ibuprofen", "aspirin", "Warfarin", "aspirin"])
+    assert [r["source"] for r in found] == ["b", "a", "c"]
+    assert [r["source"] for r in index.check(["ibuprofen", "aspirin", "warfarin"], "moderate")] == ["b", "a"]
+
+def test_medication_extractor_brands_and_typos():
+    """Brand names, synonyms and misspellings map to generic names"""
+    from src.utils.medication_extractor import MedicationExtractor
+
+    extractor = MedicationExtractor([
+        {"name": "ibuprofen", "brand_names": ["Advil", "Motrin"]},
+        {"name": "acetaminophen", "brand_names": ["Tylenol"], "synonyms": ["paracetamol"]},
+        {"name": "aspirin", "brand_names": ["Bayer"], "synonyms": ["acetylsalicylic acid"]},
+        {"name": "warfarin", "brand_names": ["Coumadin"]}
+    ])
+
+    assert extractor.extract("Can I take Advil with Tylenol?") == ["ibuprofen", "acetaminophen"]
+    assert extractor.extract("ibuprofin or paracetamol, and more advil") == ["ibuprofen", "acetaminophen"]
+    assert extractor.find("acetylsalicylic acid")[0].matched == "acetylsalicylic acid"
+    assert extractor.extract("Motion sickness after a mistake") == []
+    assert extractor.extract("I took warfarim and bayer") == ["warfarin", "aspirin"]
+    for word in ("payer", "layer", "buyer", "warfare"):
+        assert extractor.extract(f"my {word} said so") == [], word
+    assert extractor.extract("I take warfarin, and my employer is a big payer of sick leave") == ["warfarin"]
+
+def test_interaction_state_updates_incrementally():
+    """Adding checks only new pairs; removing drops the drug's interactions"""
+    from src.utils.interactions import InteractionIndex, InteractionState
+
+    index = InteractionIndex([
+        {"drug1": "aspirin", "drug2": "warfarin", "severity": "severe"},
+        {"drug1": "aspirin", "drug2": "ibuprofen", "severity": "moderate"}
+    ])
+    lookups = []
+    original = index.lookup
+    index.lookup = lambda *args, **kwargs: lookups.append(args) or original(*args, **kwargs)
+
+    state = InteractionState(["warfarin", "metformin"], index)
+    assert state.add(["Aspirin"]) == [{"drug1": "aspirin", "drug2": "warfarin", "severity": "severe"}]
+    assert len(lookups) == 1 + 2  # (metformin, warfarin), then aspirin x both
+    assert state.add(["aspirin"]) == [] and len(lookups) == 3
+
+    state.add(["ibuprofen"])
+    assert [r["severity"] for r in state.interactions()] == ["severe", "moderate"]
+    assert [r["severity"] for r in state.interactions("severe")] == ["severe"]
+
+    assert [r["drug2"] for r in state.remove(["warfarin"])] == ["warfarin"]
+    assert "warfarin" not in state and state.medications == ["metformin", "Aspirin", "ibuprofen"]
+    assert [r["drug2"] for r in state.interactions()] == ["ibuprofen"]
+
+def test_medication_agent_handles_stopped_medications(orchestrator):
+    """Medications the user stopped taking leave the session's interaction state"""
+    from src.utils.interactions import InteractionState
+
+    agent = orchestrator.medication_agent
+    assert agent._extract_stopped_medications("I stopped taking warfarin but still take aspirin") == ["warfarin"]
+    assert agent._extract_stopped_medications("Can I take Advil with aspirin?") == []
+
+    state = InteractionState(["warfarin"])
+    context = {"conversation_history": [], "interaction_state": state}
+    result = agent.process("I stopped taking Coumadin last week, is aspirin fine now?", context)
+
+    assert result["medications_stopped"] == ["warfarin"]
+    assert result["medications_mentioned"] == ["aspirin"]
+    assert result["interactions_found"] == []
+    assert state.medications == ["aspirin"]
+
+def test_bulk_screening_matches_pair_checks(tmp_path):
+    """The vectorized screener finds what the per-pair index check finds"""
+    import io
+    import json
+    import random
+    from src.utils.interactions import InteractionIndex
+    from src.utils.screening import InteractionScreener, screen_to_jsonl
+
+    rng = random.Random(3)
+    drugs = [f"drug{n}" for n in range(60)]
+    records = [
+        {"drug1": a, "drug2": b, "severity": rng.choice(["minor", "moderate", "severe"])}
+        for a, b in (rng.sample(drugs, 2) for _ in range(300))
+    ]
+    patients = [(f"p{n}", rng.sample(drugs, rng.randint(0, 12)) + ["unknown"]) for n in range(200)]
+    index = InteractionIndex(records)
+
+    results = list(InteractionScreener(index, "moderate").screen(patients, batch_size=64))
+    assert [r["patient_id"] for r in results] == [p for p, _ in patients]
+    for result, (_, medications) in zip(results, patients):
+        expected = index.check(medications, "moderate")
+        assert sorted(map(id, result["interactions"])) == sorted(map(id, expected))
+
+    path = tmp_path / "interactions.json"
+    path.write_text(json.dumps({"drug_interactions": records}))
+    for workers in (0, 2):
+        output = io.StringIO()
+        summary = screen_to_jsonl(patients, output, str(path), "moderate", batch_size=64, workers=workers)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert summary["patients"] == 200
+        assert summary["flagged"] == len(lines) == sum(1 for r in results if r["interactions"])
+        assert [line["patient_id"] for line in lines] == [r["patient_id"] for r in results if r["interactions"]]
+
+def test_compiled_knowledge_base_matches_json(tmp_path):
+    """The memory-mapped knowledge base answers like the JSON databases"""
+    import shutil
+    from src.utils.helpers import load_json
+    from src.utils.interactions import build_interaction_index
+    from src.utils.knowledge_base import KnowledgeBase, compile_knowledge_base
+    from src.utils.medication_extractor import MedicationExtractor, build_medication_extractor
+
+    sources = {}
+    for name, path in (("symptoms", Config.SYMPTOMS_DB), ("medications", Config.MEDICATIONS_DB),
+                       ("interactions", Config.INTERACTIONS_DB)):
+        sources[name] = str(tmp_path / os.path.basename(path))
+        shutil.copy(path, sources[name])
+
+    output = str(tmp_path / "test.kb")
+    counts = compile_knowledge_base(output, sources["symptoms"], sources["medications"], sources["interactions"])
+    kb = KnowledgeBase(output)
+    assert kb.counts == counts
+    assert not kb.is_stale()
+
+    assert kb.symptoms_db() == load_json(sources["symptoms"])
+    assert list(kb.medications_db()["common_medications"]) == load_json(sources["medications"])["common_medications"]
+
+    index, expected = kb.interaction_index(), build_interaction_index(sources["interactions"])
+    assert (len(index), index.pair_count) == (len(expected), expected.pair_count)
+    assert sorted(index.items()) == sorted(expected.items())
+    assert index.lookup("Warfarin", "ASPIRIN") == expected.lookup("aspirin", "warfarin")
+    medications = ["aspirin", "ibuprofen", "warfarin", "unknown"]
+    for severity in (None, "severe"):
+        assert index.check(medications, severity) == expected.check(medications, severity)
+    with pytest.raises(TypeError):
+        index.add({"drug1": "a", "drug2": "b"})
+
+    extractor = MedicationExtractor(index=kb.medication_names())
+    json_extractor = build_medication_extractor(sources["medications"])
+    assert len(extractor) == len(json_extractor)
+    for text in ("Can I take Advil with Tylenol?", "I took ibuprofin and asprin", "acetylsalicylic acid", "on coumadin"):
+        assert extractor.find(text) == json_extractor.find(text)
+    for text in ("a big payer", "another layer", "the buyer", "warfare"):
+        assert extractor.find(text) == json_extractor.find(text) == [], text
+
+    with open(sources["interactions"], 'a') as f:
+        f.write("\n")
+    assert kb.is_stale()
+
+def test_knowledge_reload_swaps_snapshots(tmp_path, monkeypatch):
+    """A reload swaps in a new version; pinned requests keep the old one"""
+    import json
+    import shutil
+    from src.utils import knowledge_service
+    from src.utils.interactions import get_interaction_index
+    from src.utils.knowledge_service import KnowledgeService, current_snapshot, pinned_snapshot
+
+    path = tmp_path / "interactions.json"
+    shutil.copy(Config.INTERACTIONS_DB, path)
+    monkeypatch.setattr(Config, "INTERACTIONS_DB", str(path))
+    monkeypatch.setattr(Config, "KB_ENABLED", False)
+    service = KnowledgeService()
+    monkeypatch.setattr(knowledge_service, "_service", service)
+
+    old = service.snapshot
+    assert get_interaction_index().lookup("aspirin", "clopidogrel") == []
+
+    database = json.loads(path.read_text())
+    database["drug_interactions"].append({"drug1": "clopidogrel", "drug2": "aspirin", "severity": "severe"})
+    with pinned_snapshot() as pinned:
+        path.write_text(json.dumps(database))
+        assert service.changed()
+        new = service.reload()
+        assert current_snapshot() is pinned is old
+        assert get_interaction_index().lookup("aspirin", "clopidogrel") == []
+
+    assert current_snapshot() is new
+    assert (new.generation, new.version != old.version) == (2, True)
+    assert get_interaction_index().lookup("aspirin", "clopidogrel")[0]["severity"] == "severe"
+    assert service.reload() is new  # Unchanged files are not reloaded
+
+    path.write_text(json.dumps(database)[:100])  # Caught mid-write
+    assert service.reload() is new
+    assert not service.changed()  # The failed version is not retried until the file changes again
+
+def test_symptom_matcher_ranks_all_symptoms():
+    """Every mentioned symptom is found, ranked, with merged questions and red flags"""
+    from src.utils.symptom_matcher import SymptomMatcher, merge_questions
+
+    matcher = SymptomMatcher([
+        {"name": "headache", "synonyms": ["head pain"], "questions": ["How long has it lasted?", "How severe is it?"],
+         "red_flags": ["with stiff neck"]},
+        {"name": "fever", "questions": ["How long has it lasted?", "What is your temperature?"],
+         "red_flags": ["lasting more than 3 days"]},
+        {"name": "rash", "questions": ["Where is the rash?"], "red_flags": ["with fever"]},
+    ])
+
+    matches = matcher.match("I've had a fever and a bad headahce with a stiff neck")
+    assert [m.name for m in matches] == ["headache", "fever"]
+    assert matches[0].red_flags == ["with stiff neck"]  # Ranked first by its red flag
+    assert matches[1].score == 1.0 and matches[1].red_flags == []
+    assert "with fever" not in [flag for m in matches for flag in m.red_flags]  # Rash is not mentioned
+
+    assert merge_questions(matches, limit=5) == [
+        "How long has it lasted?", "How severe is it?", "What is your temperature?"
+    ]
+    assert [m.name for m in matcher.match("head pain since the fever started")] == ["fever", "headache"]
+    assert matcher.match("all good today") == []